@@ -2,6 +2,7 @@
 
 from abc import ABC
 from contextlib import suppress
+from functools import lru_cache
 from typing import Any, ClassVar
 
 import discord
@@ -14,6 +15,9 @@ from .c_autoroomset import AutoRoomSetCommands, channel_name_template
 from .pcx_lib import Perms, SettingDisplay
 from .pcx_template import Template
 
+# How many rendered text channel topics and hints to remember
+TEMPLATE_RENDER_CACHE_SIZE = 256
+
 
 class CompositeMetaClass(type(commands.Cog), type(ABC)):
     """Allows the metaclass used for proper type detection to coexist with discord.py's metaclass."""
@@ -37,7 +41,7 @@ class AutoRoom(
     """
 
     __author__ = "PhasecoreX"
-    __version__ = "3.9.0"
+    __version__ = "3.10.0"
 
     default_global_settings: ClassVar[dict[str, int]] = {"schema_version": 0}
     default_guild_settings: ClassVar[dict[str, bool | list[int]]] = {
@@ -110,6 +114,9 @@ class AutoRoom(
         )
         self.config.register_channel(**self.default_channel_settings)
         self.template = Template()
+        self._render_template_cached = lru_cache(maxsize=TEMPLATE_RENDER_CACHE_SIZE)(
+            self._render_template
+        )
         self.bucket_autoroom_create = commands.CooldownMapping.from_cooldown(
             2, 60, lambda member: member
         )
@@ -429,8 +436,9 @@ class AutoRoom(
         taken_channel_names = [
             voice_channel.name for voice_channel in dest_category.voice_channels
         ]
+        template_data = self.get_template_data(member)
         new_channel_name = self._generate_channel_name(
-            autoroom_source_config, member, taken_channel_names
+            autoroom_source_config, template_data, taken_channel_names
         )
 
         # Generate overwrites
@@ -533,9 +541,8 @@ class AutoRoom(
                 # Add all the mod/admin roles, if required
                 perms.update(role, self.perms_legacy_text_allow)
             # Create text channel
-            text_channel_topic = self.template.render(
-                autoroom_source_config["text_channel_topic"],
-                self.get_template_data(member),
+            text_channel_topic = self.render_template_memoized(
+                autoroom_source_config["text_channel_topic"], template_data
             )
             new_legacy_text_channel = await guild.create_text_channel(
                 name=new_channel_name.replace("'s ", " "),
@@ -552,9 +559,8 @@ class AutoRoom(
         # Send text chat hint if enabled
         if autoroom_source_config["text_channel_hint"]:
             with suppress(RuntimeError):
-                hint = self.template.render(
-                    autoroom_source_config["text_channel_hint"],
-                    self.get_template_data(member),
+                hint = self.render_template_memoized(
+                    autoroom_source_config["text_channel_hint"], template_data
                 )
                 if hint:
                     if new_legacy_text_channel:
@@ -607,7 +613,7 @@ class AutoRoom(
     def _generate_channel_name(
         self,
         autoroom_source_config: dict,
-        member: discord.Member,
+        data: dict[str, str],
         taken_channel_names: list,
     ) -> str:
         """Return a channel name with an incrementing number appended to it, based on a formatting string."""
@@ -620,7 +626,6 @@ class AutoRoom(
             template = autoroom_source_config["channel_name_format"]
         template = template or channel_name_template["username"]
 
-        data = self.get_template_data(member)
         new_channel_name = None
         attempt = 1
         with suppress(RuntimeError):
@@ -657,6 +662,20 @@ class AutoRoom(
                     break
         return data
 
+    def render_template_memoized(self, template: str, data: dict[str, str]) -> str:
+        """Render a template, reusing the result if it was already rendered with the same data.
+
+        Only the data that the template could refer to is compared, so templates that don't use
+        member specific data (e.g. a static hint) are only rendered once.
+        """
+        relevant_data = tuple(
+            (key, value) for key, value in sorted(data.items()) if key in template
+        )
+        return self._render_template_cached(template, relevant_data)
+
+    def _render_template(self, template: str, data: tuple[tuple[str, str], ...]) -> str:
+        return self.template.render(template, dict(data))
+
     def format_template_room_name(self, template: str, data: dict, num: int = 1) -> str:
         """Return a formatted channel name, taking into account the 100 character channel name limit."""
         nums = {"dupenum": num}
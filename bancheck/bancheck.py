@@ -1,15 +1,65 @@
 """BanCheck cog for Red-DiscordBot ported and enhanced by PhasecoreX."""
 
+import asyncio
+import logging
+import time
+from collections import deque
 from contextlib import suppress
+from datetime import UTC, datetime
 from typing import Any, ClassVar
 
+import aiohttp
 import discord
 from redbot.core import Config, checks, commands
 from redbot.core.bot import Red
-from redbot.core.utils.chat_formatting import error, info, success, warning
+from redbot.core.data_manager import cog_data_path
+from redbot.core.utils.chat_formatting import (
+    error,
+    humanize_timedelta,
+    info,
+    success,
+    warning,
+)
 
-from .pcx_lib import delete
+from .lookup_cache import LookupCache
+from .pcx_lib import SettingDisplay, delete, embed_splitter
 from .services.antiraid import Antiraid
+from .services.ban_list_mirror import BanListMirror
+from .services.base_service import BaseService, Capability, user_agent
+from .services.dto.lookup_result import LookupResult
+from .services.local_mirror import LocalMirror
+from .services.registry import ServiceRegistry
+from .services.resilience import CircuitBreaker
+
+log = logging.getLogger("red.pcxcogs.bancheck")
+
+LOOKUP_TIMEOUT_SECONDS = 10.0
+# Connection pool tuning for the shared session used by all services
+HTTP_POOL_SIZE = 100
+HTTP_POOL_SIZE_PER_HOST = 20
+HTTP_KEEPALIVE_SECONDS = 60.0
+HTTP_DNS_CACHE_SECONDS = 300
+# Raid mode: when this many members join within the window, they are checked in batches
+RAID_JOIN_THRESHOLD = 10
+RAID_WINDOW_SECONDS = 10.0
+RAID_BATCH_SECONDS = 5.0
+RAID_LOOKUP_WORKERS = 25
+RAID_BAN_WORKERS = 5
+# How long lookup results are remembered, depending on the result
+CACHE_MAX_SIZE = 50000
+# The only global services there were before config schema version 1 (newer ones are opt-in)
+SCHEMA_0_GLOBAL_SERVICES = ("antiraid",)
+MIRROR_SYNC_SECONDS = 60 * 60
+# Member scans are checked (and their progress saved) in chunks of this many members
+SCAN_CHUNK_SIZE = 1000
+SCAN_PROGRESS_SECONDS = 15.0
+# Only mention how long a member scan will take if it's at least this long
+SCAN_ESTIMATE_MIN_SECONDS = 60
+CACHE_TTL_SECONDS = {
+    "clear": 15 * 60,
+    "ban": 60 * 60,
+    "error": 30,
+}
 
 
 class BanCheck(commands.Cog):
@@ -24,27 +74,26 @@ class BanCheck(commands.Cog):
     """
 
     __author__ = "PhasecoreX"
-    __version__ = "2.6.1"
+    __version__ = "2.15.0"
 
-    default_global_settings: ClassVar[dict[str, int]] = {
+    default_global_settings: ClassVar[dict[str, int | str | None]] = {
         "schema_version": 0,
         "total_bans": 0,
+        "mirror_url": None,
     }
     default_guild_settings: ClassVar[
-        dict[str, int | dict[str, dict[str, bool | str]] | None]
+        dict[str, int | dict[str, dict[str, bool | str]] | dict[str, int] | None]
     ] = {
         "notify_channel": None,
         "total_bans": 0,
         "services": {},
+        "scan": None,
     }
-    supported_global_services: ClassVar[dict] = {
+    builtin_global_services: ClassVar[dict[str, type[BaseService]]] = {
         "antiraid": Antiraid,
+        "localmirror": LocalMirror,
     }
-    supported_guild_services: ClassVar[dict] = {}
-    all_supported_services: ClassVar[dict] = {
-        **supported_global_services,
-        **supported_guild_services,
-    }
+    builtin_guild_services: ClassVar[dict[str, type[BaseService]]] = {}
 
     def __init__(self, bot: Red) -> None:
         """Set up the cog."""
@@ -58,11 +107,42 @@ class BanCheck(commands.Cog):
         self.bucket_member_join_cache = commands.CooldownMapping.from_cooldown(
             1, 300, lambda member: member
         )
+        self.session: aiohttp.ClientSession | None = None
+        self.registry = ServiceRegistry()
+        for service_name, service_class in self.builtin_global_services.items():
+            self.registry.register(service_name, service_class, global_service=True)
+        for service_name, service_class in self.builtin_guild_services.items():
+            self.registry.register(service_name, service_class, global_service=False)
+        self.background_tasks: set[asyncio.Task] = set()
+        self.lookup_cache = LookupCache(CACHE_MAX_SIZE)
+        self.inflight_lookups: dict[tuple[str, int], asyncio.Task] = {}
+        self.coalesced_lookups = 0
+        self.lookup_workers = asyncio.Semaphore(RAID_LOOKUP_WORKERS)
+        self.recent_joins: dict[int, deque[float]] = {}
+        self.join_queues: dict[int, list[discord.Member]] = {}
+        self.join_queue_tasks: dict[int, asyncio.Task] = {}
+        self.mirror_sync_task: asyncio.Task | None = None
+        self.scan_tasks: dict[int, asyncio.Task] = {}
+        self.mirror_sync_error: str | None = None
 
     #
     # Red methods
     #
 
+    def cog_unload(self) -> None:
+        """Clean up when cog shuts down."""
+        for task in self.join_queue_tasks.values():
+            task.cancel()
+        for task in self.scan_tasks.values():
+            task.cancel()
+        if self.mirror_sync_task:
+            self.mirror_sync_task.cancel()
+        self.registry.close()
+        if self.session:
+            task = asyncio.create_task(self.session.close())
+            self.background_tasks.add(task)
+            task.add_done_callback(self.background_tasks.discard)
+
     def format_help_for_context(self, ctx: commands.Context) -> str:
         """Show version in help."""
         pre_processed = super().format_help_for_context(ctx)
@@ -79,6 +159,20 @@ class BanCheck(commands.Cog):
     async def initialize(self) -> None:
         """Perform setup actions before loading cog."""
         await self._migrate_config()
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=HTTP_POOL_SIZE,
+                limit_per_host=HTTP_POOL_SIZE_PER_HOST,
+                keepalive_timeout=HTTP_KEEPALIVE_SECONDS,
+                ttl_dns_cache=HTTP_DNS_CACHE_SECONDS,
+            ),
+            timeout=aiohttp.ClientTimeout(total=LOOKUP_TIMEOUT_SECONDS),
+        )
+        self.registry.start(self.session, cog_data_path(self))
+        self.enable_mirror_sync_loop()
+        task = asyncio.create_task(self._resume_scans())
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
 
     async def _migrate_config(self) -> None:
         """Perform some configuration migrations."""
@@ -103,7 +197,7 @@ class BanCheck(commands.Cog):
                 async with self.config.guild_from_id(
                     guild_id
                 ).services() as config_services:
-                    for service in self.supported_global_services:
+                    for service in SCHEMA_0_GLOBAL_SERVICES:
                         if service in config_services:
                             continue  # Already migrated
                         config_services[service] = {}
@@ -133,6 +227,65 @@ class BanCheck(commands.Cog):
             await self.config.clear_raw("version")
             await self.config.schema_version.set(1)
 
+    #
+    # Background loop methods
+    #
+
+    def enable_mirror_sync_loop(self) -> None:
+        """Set up the background task that keeps the local ban list mirror up to date."""
+
+        def error_handler(fut: asyncio.Future) -> None:
+            try:
+                fut.result()
+            except asyncio.CancelledError:
+                pass
+            except Exception as exc:
+                log.exception(
+                    "Unexpected exception occurred in ban list mirror sync loop of BanCheck: ",
+                    exc_info=exc,
+                )
+
+        if self.mirror_sync_task:
+            self.mirror_sync_task.cancel()
+        self.mirror_sync_task = asyncio.create_task(self.mirror_sync_loop())
+        self.mirror_sync_task.add_done_callback(error_handler)
+
+    async def mirror_sync_loop(self) -> None:
+        """Background loop that syncs the local ban list mirror."""
+        await self.bot.wait_until_ready()
+        while True:
+            if await self.config.mirror_url():
+                await self.sync_mirror()
+            await asyncio.sleep(MIRROR_SYNC_SECONDS)
+
+    async def sync_mirror(self) -> int | None:
+        """Sync the local ban list mirror from its remote export endpoint.
+
+        Returns the number of changed bans, or None if the sync failed.
+        """
+        url = await self.config.mirror_url()
+        if not url or not self.session:
+            return None
+        mirror = self.local_mirror
+        try:
+            changed = await mirror.sync(
+                self.session, url, headers={"user-agent": user_agent}
+            )
+        except (
+            aiohttp.ClientError,
+            TimeoutError,
+            TypeError,
+            ValueError,
+            KeyError,
+        ) as exc:
+            # On failure, the mirror keeps serving lookups from its last good state
+            self.mirror_sync_error = str(exc) or exc.__class__.__name__
+            log.warning("Ban list mirror sync failed: %s", self.mirror_sync_error)
+            return None
+        self.mirror_sync_error = None
+        log.debug("Ban list mirror synced, %d bans changed", changed)
+        return changed
+
     #
     # Command methods: banchecksetglobal
     #
@@ -173,10 +326,8 @@ class BanCheck(commands.Cog):
                     f"{await self.format_service_name_url(service_name)}\n"
                 )
             else:
-                with suppress(AttributeError):
-                    if service_class().HIDDEN:
-                        continue
-                    # Otherwise, this service is not hidden
+                if service_class.HIDDEN:
+                    continue
                 disabled_services += f"{await self.format_service_name_url(service_name, show_help=True)}\n"
         if enabled_services:
             embed.add_field(
@@ -224,6 +375,147 @@ class BanCheck(commands.Cog):
         response = f"API key for the {self.get_nice_service_name(service)} BanCheck service has been {action}."
         await ctx.send(success(response))
 
+    @banchecksetglobal.group(name="cache")
+    async def global_cache(self, ctx: commands.Context) -> None:
+        """Manage the bot-wide lookup result cache."""
+
+    @global_cache.command(name="stats")
+    async def global_cache_stats(self, ctx: commands.Context) -> None:
+        """Display lookup result cache statistics."""
+        cache_section = SettingDisplay("Lookup Cache")
+        cache_section.add(
+            "Entries", f"{len(self.lookup_cache)}/{self.lookup_cache.max_size}"
+        )
+        cache_section.add("Hits", self.lookup_cache.hits)
+        cache_section.add("Misses", self.lookup_cache.misses)
+        cache_section.add("Hit rate", f"{self.lookup_cache.hit_rate:.1%}")
+        cache_section.add("Expired", self.lookup_cache.expirations)
+        cache_section.add("Evicted", self.lookup_cache.evictions)
+        cache_section.add("Shared in-flight", self.coalesced_lookups)
+        cache_section.add("Currently in-flight", len(self.inflight_lookups))
+        ttl_section = SettingDisplay("Cache Durations")
+        for result, ttl in CACHE_TTL_SECONDS.items():
+            ttl_section.add(f"{result.capitalize()} results", f"{ttl} seconds")
+        await ctx.send(cache_section.display(ttl_section))
+
+    @global_cache.command(name="clear")
+    async def global_cache_clear(self, ctx: commands.Context) -> None:
+        """Clear all cached lookup results and reset statistics."""
+        count = self.lookup_cache.clear()
+        self.lookup_cache.reset_stats()
+        self.coalesced_lookups = 0
+        await ctx.send(
+            success(
+                f"Cleared {count} cached lookup {'result' if count == 1 else 'results'}."
+            )
+        )
+
+    @banchecksetglobal.group(name="mirror")
+    async def global_mirror(self, ctx: commands.Context) -> None:
+        """Manage the local ban list mirror.
+
+        The Local Mirror service keeps a copy of a ban list on disk, so that lookups are instant
+        and keep working when the remote ban list is down.
+        It can be synced periodically from an export URL, or filled from an imported file.
+        """
+
+    @global_mirror.command(name="status")
+    async def global_mirror_status(self, ctx: commands.Context) -> None:
+        """Display the status of the local ban list mirror."""
+        mirror = self.local_mirror
+        mirror_section = SettingDisplay("Local Ban List Mirror")
+        mirror_section.add("Export URL", await self.config.mirror_url() or "Not set")
+        mirror_section.add("Mirrored bans", len(mirror))
+        last_synced = mirror.last_synced
+        mirror_section.add(
+            "Last synced",
+            (
+                datetime.fromtimestamp(last_synced, UTC).strftime(
+                    "%Y-%m-%d %H:%M:%S UTC"
+                )
+                if last_synced
+                else "Never"
+            ),
+        )
+        if self.mirror_sync_error:
+            mirror_section.add("Last sync error", self.mirror_sync_error)
+        await ctx.send(str(mirror_section))
+
+    @global_mirror.command(name="url")
+    async def global_mirror_url(
+        self, ctx: commands.Context, url: str | None = None
+    ) -> None:
+        """Set (or clear) the export URL the local ban list mirror is synced from."""
+        old_url = await self.config.mirror_url()
+        await self.config.mirror_url.set(url)
+        if url != old_url:
+            # The sync cursor (and any bans synced) belong to the old export, so start over with a full export.
+            # Bans are kept if there's nothing to replace them with yet, or they may have been imported.
+            await asyncio.to_thread(
+                self.local_mirror.reset, keep_bans=not url or not old_url
+            )
+        if not url:
+            await ctx.send(
+                success(
+                    "The ban list mirror export URL has been cleared. "
+                    "The mirror will keep its current contents, but will no longer be synced."
+                )
+            )
+            return
+        async with ctx.typing():
+            changed = await self.sync_mirror()
+        if changed is None:
+            await ctx.send(
+                warning(
+                    "The ban list mirror export URL has been set, but syncing failed: "
+                    f"{self.mirror_sync_error}"
+                )
+            )
+            return
+        await ctx.send(
+            success(
+                f"The ban list mirror export URL has been set, and {changed} bans were synced."
+            )
+        )
+
+    @global_mirror.command(name="sync")
+    async def global_mirror_sync(self, ctx: commands.Context) -> None:
+        """Sync the local ban list mirror now."""
+        if not await self.config.mirror_url():
+            await ctx.send(error("The ban list mirror export URL has not been set."))
+            return
+        async with ctx.typing():
+            changed = await self.sync_mirror()
+        if changed is None:
+            await ctx.send(error(f"Syncing failed: {self.mirror_sync_error}"))
+            return
+        await ctx.send(success(f"Ban list mirror synced, {changed} bans changed."))
+
+    @global_mirror.command(name="import")
+    async def global_mirror_import(self, ctx: commands.Context) -> None:
+        """Replace the contents of the local ban list mirror with an attached file.
+
+        The file can either be a JSON export (`{"bans": [{"userid": "...", "reason": "..."}]}`),
+        or a text file with one user ID (optionally followed by a comma and a reason) per line.
+        """
+        if not ctx.message.attachments:
+            await ctx.send(error("You need to attach a ban list file to this command."))
+            return
+        try:
+            text = (await ctx.message.attachments[0].read()).decode()
+            async with ctx.typing():
+                imported = await asyncio.to_thread(self.local_mirror.import_text, text)
+        except (
+            discord.HTTPException,
+            UnicodeDecodeError,
+            TypeError,
+            ValueError,
+            KeyError,
+        ) as exc:
+            await ctx.send(error(f"Could not import that ban list file: {exc}"))
+            return
+        await ctx.send(success(f"Imported {imported} bans into the ban list mirror."))
+
     #
     # Command methods: bancheckset
     #
@@ -285,6 +577,9 @@ class BanCheck(commands.Cog):
                 enabled_services += f"**{self.get_nice_service_name(service_name)}**"
                 if config_services.get(service_name, {}).get("autoban", False):
                     enabled_services += " (AutoBan enabled)"
+                service_health = self._get_service_health(service_name)
+                if service_health:
+                    enabled_services += f"\n{warning(service_health)}"
                 enabled_services += "\n"
         if enabled_services:
             embed.add_field(
@@ -298,6 +593,23 @@ class BanCheck(commands.Cog):
             )
         await self.send_embed(ctx, embed)
 
+    def _get_service_health(self, service_name: str) -> str | None:
+        """Describe a service's circuit breaker and rate limiter state, if it isn't healthy."""
+        service = self.registry.get(service_name)
+        if not service:
+            return None
+        breaker = service.circuit_breaker
+        if breaker.state == CircuitBreaker.OPEN:
+            return (
+                f"Degraded after {breaker.failures} errors in a row, "
+                f"lookups paused for {breaker.retry_in:.0f} more seconds"
+            )
+        if breaker.state == CircuitBreaker.HALF_OPEN:
+            return "Degraded, the next lookup will check if it has recovered"
+        if service.rate_limiter and service.rate_limiter.tokens < 1:
+            return "Rate limited, lookups are being slowed down"
+        return None
+
     @staticmethod
     def _get_autocheck_status(
         embed: discord.Embed,
@@ -398,10 +710,8 @@ class BanCheck(commands.Cog):
             elif api_key:
                 disabled_services += service_name_formatted
             else:
-                with suppress(AttributeError):
-                    if service_class().HIDDEN:
-                        continue
-                    # Otherwise, this service is not hidden
+                if service_class.HIDDEN:
+                    continue
                 if service_name in self.supported_global_services:
                     disabled_services_global_api += service_name_formatted
                 else:
@@ -636,7 +946,7 @@ class BanCheck(commands.Cog):
             await self.config.guild(ctx.guild).notify_channel.set(None)
             await ctx.send(success("AutoCheck is now disabled."))
 
-    @commands.command()
+    @commands.group(invoke_without_command=True)
     @commands.guild_only()
     @checks.admin_or_permissions(ban_members=True)
     async def bancheck(
@@ -654,6 +964,238 @@ class BanCheck(commands.Cog):
         if embed:
             await self.send_embed(ctx, embed)
 
+    @bancheck.group(name="scanall", invoke_without_command=True)
+    async def bancheck_scanall(
+        self, ctx: commands.Context, autoban: bool = False  # noqa: FBT001, FBT002
+    ) -> None:
+        """Check every member of this server against the enabled ban lists.
+
+        The scan runs in the background, posting any bans found (and its progress) to this channel.
+        If the bot restarts, the scan will continue where it left off.
+
+        If `autoban` is true, members that are found on a ban list that has AutoBan enabled will be banned.
+        """
+        if not ctx.guild:
+            return
+        if ctx.guild.id in self.scan_tasks:
+            await ctx.send(
+                info(
+                    "A member scan is already running in this server. "
+                    "Check on it with `[p]bancheck scanall status`, "
+                    "or stop it with `[p]bancheck scanall cancel`."
+                )
+            )
+            return
+        lookups = await self._get_lookups(ctx.guild)
+        if not lookups:
+            await ctx.send(
+                error(
+                    "No services have been set up. Please check `[p]bancheckset` for more details."
+                )
+            )
+            return
+        await self.config.guild(ctx.guild).scan.set(
+            {
+                "channel": ctx.channel.id,
+                "autoban": autoban,
+                "cursor": 0,
+                "checked": 0,
+                "found": 0,
+                "banned": 0,
+                "errors": 0,
+            }
+        )
+        self._start_scan(ctx.guild)
+        response = "Started scanning all members of this server"
+        if autoban:
+            response += ", automatically banning anyone found on a ban list with AutoBan enabled"
+        response += ". Progress and results will be posted here."
+        estimate = self._estimate_scan_seconds(
+            lookups, sum(not member.bot for member in ctx.guild.members)
+        )
+        if estimate >= SCAN_ESTIMATE_MIN_SECONDS:
+            response += (
+                f"\nThe enabled ban lists limit how fast they can be queried, "
+                f"so this will take about {humanize_timedelta(seconds=estimate)}."
+            )
+        await ctx.send(success(response))
+
+    @bancheck_scanall.command(name="status")
+    async def bancheck_scanall_status(self, ctx: commands.Context) -> None:
+        """Show the progress of the member scan in this server."""
+        if not ctx.guild:
+            return
+        state = await self.config.guild(ctx.guild).scan()
+        if not state:
+            await ctx.send(info("There is no member scan running in this server."))
+            return
+        # Bots aren't scanned (and the total isn't known until the scan has started)
+        total = state.get("total") or sum(
+            not member.bot for member in ctx.guild.members
+        )
+        seconds_left = self._estimate_scan_seconds(
+            await self._get_lookups(ctx.guild), total - state["checked"]
+        )
+        await ctx.send(info(self._scan_progress(state, total, seconds_left)))
+
+    @bancheck_scanall.command(name="cancel")
+    async def bancheck_scanall_cancel(self, ctx: commands.Context) -> None:
+        """Stop the member scan in this server."""
+        if not ctx.guild:
+            return
+        state = await self.config.guild(ctx.guild).scan()
+        task = self.scan_tasks.pop(ctx.guild.id, None)
+        if task:
+            task.cancel()
+        if not state and not task:
+            await ctx.send(info("There is no member scan running in this server."))
+            return
+        await self.config.guild(ctx.guild).scan.clear()
+        await ctx.send(success("The member scan has been cancelled."))
+
+    #
+    # Member scan methods
+    #
+
+    async def _resume_scans(self) -> None:
+        """Resume any member scans that were running when the cog was unloaded."""
+        await self.bot.wait_until_ready()
+        for guild_id, guild_info in (await self.config.all_guilds()).items():
+            guild = self.bot.get_guild(guild_id)
+            if guild and guild_info.get("scan"):
+                log.debug("Resuming member scan in guild=%d", guild_id)
+                self._start_scan(guild)
+
+    def _start_scan(self, guild: discord.Guild) -> None:
+        """Start the background task that scans all members of a guild."""
+
+        def done_callback(fut: asyncio.Future) -> None:
+            if self.scan_tasks.get(guild.id) is fut:
+                del self.scan_tasks[guild.id]
+            try:
+                fut.result()
+            except asyncio.CancelledError:
+                pass
+            except Exception as exc:
+                log.exception(
+                    "Unexpected exception occurred while scanning members with BanCheck: ",
+                    exc_info=exc,
+                )
+
+        task = asyncio.create_task(self._scan_guild(guild))
+        self.scan_tasks[guild.id] = task
+        task.add_done_callback(done_callback)
+
+    async def _scan_guild(self, guild: discord.Guild) -> None:
+        """Check every member of a guild, saving progress so that it can be resumed."""
+        state = await self.config.guild(guild).scan()
+        if not state:
+            return
+        channel = guild.get_channel_or_thread(state["channel"])
+        lookups = await self._get_lookups(guild)
+        if not isinstance(channel, discord.abc.Messageable) or not lookups:
+            await self.config.guild(guild).scan.clear()
+            return
+        if not guild.chunked:
+            await guild.chunk()
+        # Members are scanned in ID order, so the last checked ID is all that's needed to resume
+        members = sorted(
+            (
+                member
+                for member in guild.members
+                if not member.bot and member.id > state["cursor"]
+            ),
+            key=lambda member: member.id,
+        )
+        total = state["checked"] + len(members)
+        state["total"] = total
+        await self.config.guild(guild).scan.set(state)
+        progress_message = await channel.send(
+            self._scan_progress(
+                state, total, self._estimate_scan_seconds(lookups, len(members))
+            )
+        )
+        last_progress = time.monotonic()
+        for index in range(0, len(members), SCAN_CHUNK_SIZE):
+            chunk = members[index : index + SCAN_CHUNK_SIZE]
+            found, errored = await self._check_members(
+                guild, chunk, lookups, do_ban=state["autoban"]
+            )
+            if found:
+                await self.send_embed(
+                    channel,
+                    self._batch_embed(
+                        "Member Scan Results",
+                        f"Checked members {state['checked'] + 1} to "
+                        f"{state['checked'] + len(chunk)} of {total}.",
+                        len(chunk),
+                        found,
+                        errored,
+                    ),
+                )
+            state["cursor"] = chunk[-1].id
+            state["checked"] += len(chunk)
+            state["found"] += len(found)
+            state["banned"] += sum(banned for _, _, banned in found)
+            state["errors"] += len(errored)
+            await self.config.guild(guild).scan.set(state)
+            if time.monotonic() - last_progress >= SCAN_PROGRESS_SECONDS:
+                last_progress = time.monotonic()
+                seconds_left = self._estimate_scan_seconds(
+                    lookups, total - state["checked"]
+                )
+                with suppress(discord.HTTPException):
+                    await progress_message.edit(
+                        content=self._scan_progress(state, total, seconds_left)
+                    )
+        await self.config.guild(guild).scan.clear()
+        with suppress(discord.HTTPException):
+            await progress_message.edit(
+                content=self._scan_progress(state, total, finished=True)
+            )
+
+    @staticmethod
+    def _scan_progress(
+        state: dict[str, int],
+        total: int,
+        seconds_left: float = 0.0,
+        *,
+        finished: bool = False,
+    ) -> str:
+        """Describe the progress of a member scan."""
+        percent = state["checked"] / total if total else 1
+        message = (
+            f"**Member scan {'finished' if finished else 'in progress'}:** "
+            f"{state['checked']}/{total} members checked ({percent:.0%})\n"
+            f"Bans found: {state['found']}, auto banned: {state['banned']}, "
+            f"errors: {state['errors']}"
+        )
+        if not finished:
+            if seconds_left >= SCAN_ESTIMATE_MIN_SECONDS:
+                message += (
+                    f"\nEstimated time left: {humanize_timedelta(seconds=seconds_left)}"
+                )
+            message += "\nUse `[p]bancheck scanall cancel` to stop scanning."
+        return message
+
+    @staticmethod
+    def _estimate_scan_seconds(
+        lookups: list[tuple[str, BaseService, bool | str, bool]], member_count: int
+    ) -> float:
+        """Estimate how long checking some members will take, going by the rate limits of the services.
+
+        Services are queried at the same time, so the slowest one (that can't look up members in bulk)
+        sets the pace. Services without a rate limit (like the Local Mirror) are assumed to be instant.
+        """
+        return max(
+            (
+                member_count * service.RATE_LIMIT[1] / service.RATE_LIMIT[0]
+                for _, service, _, _ in lookups
+                if service.RATE_LIMIT and not service.supports(Capability.BULK_LOOKUP)
+            ),
+            default=0.0,
+        )
+
     #
     # Listener methods
     #
@@ -671,12 +1213,304 @@ class BanCheck(commands.Cog):
                 bucket = self.bucket_member_join_cache.get_bucket(member)
                 if bucket:
                     repeatedly_joining = bucket.update_rate_limit()
-                    if not repeatedly_joining:
-                        embed = await self._user_lookup(
-                            member.guild, member, do_ban=True
-                        )
-                        if embed:
-                            await self.send_embed(channel, embed)
+                    if repeatedly_joining:
+                        return
+                    if self._is_join_burst(member.guild):
+                        # Raid mode, check everyone at once and send a summary instead
+                        self._queue_member_join(member)
+                        return
+                    embed = await self._user_lookup(member.guild, member, do_ban=True)
+                    if embed:
+                        await self.send_embed(channel, embed)
+
+    def _is_join_burst(self, guild: discord.Guild) -> bool:
+        """Record a member joining, and check if the guild is getting a burst of joins."""
+        now = time.monotonic()
+        recent_joins = self.recent_joins.setdefault(guild.id, deque())
+        recent_joins.append(now)
+        while recent_joins[0] <= now - RAID_WINDOW_SECONDS:
+            recent_joins.popleft()
+        return (
+            guild.id in self.join_queue_tasks
+            or len(recent_joins) >= RAID_JOIN_THRESHOLD
+        )
+
+    def _queue_member_join(self, member: discord.Member) -> None:
+        """Add a joining member to the guilds join queue, to be checked in a batch."""
+        guild_id = member.guild.id
+        self.join_queues.setdefault(guild_id, []).append(member)
+        existing_task = self.join_queue_tasks.get(guild_id)
+        if existing_task and not existing_task.done():
+            return
+
+        def done_callback(fut: asyncio.Future) -> None:
+            if self.join_queue_tasks.get(guild_id) is fut:
+                del self.join_queue_tasks[guild_id]
+            try:
+                fut.result()
+            except asyncio.CancelledError:
+                pass
+            except Exception as exc:
+                log.exception(
+                    "Unexpected exception occurred while processing BanCheck join queue: ",
+                    exc_info=exc,
+                )
+
+        task = asyncio.create_task(self._process_join_queue(member.guild))
+        self.join_queue_tasks[guild_id] = task
+        task.add_done_callback(done_callback)
+
+    async def _process_join_queue(self, guild: discord.Guild) -> None:
+        """Check queued members in batches until the burst of joins is over."""
+        while True:
+            await asyncio.sleep(RAID_BATCH_SECONDS)
+            members = self.join_queues.pop(guild.id, [])
+            if not members:
+                # Done callbacks run later, so unregister now. Otherwise a member queued
+                # before then would see this task and wait for a batch that never comes.
+                if self.join_queue_tasks.get(guild.id) is asyncio.current_task():
+                    del self.join_queue_tasks[guild.id]
+                return
+            await self._batch_user_lookup(guild, members)
+
+    async def _batch_user_lookup(
+        self, guild: discord.Guild, members: list[discord.Member]
+    ) -> None:
+        """Check a batch of members, auto ban them if needed, and send one summary."""
+        channel_id = await self.config.guild(guild).notify_channel()
+        channel = guild.get_channel(channel_id) if channel_id else None
+        if not isinstance(channel, discord.TextChannel):
+            return
+        lookups = await self._get_lookups(guild)
+        if not lookups:
+            return
+        log.debug(
+            "Checking a batch of %d joining members in guild=%d", len(members), guild.id
+        )
+        found, errored = await self._check_members(guild, members, lookups, do_ban=True)
+        await self.send_embed(
+            channel,
+            self._batch_embed(
+                "Join Burst Detected",
+                f"Checked **{len(members)}** members that joined in quick succession.",
+                len(members),
+                found,
+                errored,
+            ),
+        )
+
+    async def _check_members(
+        self,
+        guild: discord.Guild,
+        members: list[discord.Member],
+        lookups: list[tuple[str, BaseService, bool | str, bool]],
+        *,
+        do_ban: bool,
+    ) -> tuple[list[tuple[discord.Member, dict[str, str], bool]], list[discord.Member]]:
+        """Look up many members at once, optionally auto banning them.
+
+        Returns a (member, banned_services, auto_banned) tuple for every member a ban was found for,
+        and a list of the members that had lookup errors (but no ban found otherwise).
+        """
+        await self._bulk_prefetch(lookups, [member.id for member in members])
+
+        async def lookup_member(
+            member: discord.Member,
+        ) -> list[tuple[bool, list[LookupResult]]]:
+            async with self.lookup_workers:
+                return await self._lookup_user(lookups, member.id)
+
+        all_results = await asyncio.gather(
+            *(lookup_member(member) for member in members)
+        )
+
+        to_ban: list[tuple[discord.Member, dict[str, str]]] = []
+        not_banned: list[tuple[discord.Member, dict[str, str]]] = []
+        errored: list[discord.Member] = []
+        for member, results in zip(members, all_results, strict=True):
+            banned_services: dict[str, str] = {}
+            autoban = False
+            is_error = False
+            for service_autoban, responses in results:
+                for response in responses:
+                    if response.result == "ban":
+                        banned_services[response.service] = response.reason
+                        autoban = autoban or service_autoban
+                    elif response.result != "clear":
+                        is_error = True
+            if (
+                banned_services
+                and do_ban
+                and autoban
+                and guild.me.guild_permissions.ban_members
+            ):
+                to_ban.append((member, banned_services))
+            elif banned_services:
+                not_banned.append((member, banned_services))
+            elif is_error:
+                errored.append(member)
+
+        # Apply auto bans concurrently (discord.py will handle the rate limits)
+        ban_workers = asyncio.Semaphore(RAID_BAN_WORKERS)
+
+        async def ban_member(
+            member: discord.Member, banned_services: dict[str, str]
+        ) -> bool:
+            async with ban_workers:
+                return await self._auto_ban(guild, member, banned_services)
+
+        ban_outcomes = await asyncio.gather(
+            *(ban_member(member, banned_services) for member, banned_services in to_ban)
+        )
+        await self._increment_total_bans(guild, sum(ban_outcomes))
+        found = [
+            (member, banned_services, banned)
+            for (member, banned_services), banned in zip(
+                to_ban, ban_outcomes, strict=True
+            )
+        ]
+        found.extend(
+            (member, banned_services, False) for member, banned_services in not_banned
+        )
+        return found, errored
+
+    def _batch_embed(
+        self,
+        title: str,
+        summary: str,
+        member_count: int,
+        found: list[tuple[discord.Member, dict[str, str], bool]],
+        errored: list[discord.Member],
+    ) -> discord.Embed:
+        """Create an embed summarizing the results of checking many members."""
+        banned_count = sum(banned for _, _, banned in found)
+        description = (
+            f"{summary}\n\n"
+            f"**Ban found:** {len(found)}\n"
+            f"**Auto banned:** {banned_count}\n"
+            f"**Errors:** {len(errored)}\n"
+            f"**No ban found:** {member_count - len(found) - len(errored)}"
+        )
+        if found:
+            color = discord.Colour.red()
+        elif errored:
+            color = discord.Colour.gold()
+        else:
+            color = discord.Colour.green()
+        embed = self.embed_maker(title, color, description)
+        for member, banned_services, banned in found:
+            reasons = "\n".join(
+                f"**{name}:** {reason}" for name, reason in banned_services.items()
+            )
+            status = "Auto Banned" if banned else "Not Auto Banned"
+            embed.add_field(
+                name=f"{member} ({member.id}) - {status}", value=reasons, inline=False
+            )
+        if errored:
+            embed.add_field(
+                name="Errors (but no ban found otherwise)",
+                value=", ".join(f"{member} ({member.id})" for member in errored),
+                inline=False,
+            )
+        return embed
+
+    async def _get_lookups(
+        self, guild: discord.Guild
+    ) -> list[tuple[str, BaseService, bool | str, bool]]:
+        """Get the services enabled in a guild, as (name, service, api_key, autoban) tuples."""
+        config_services = await self.config.guild(guild).services()
+        lookup_services = self.registry.with_capability(Capability.LOOKUP)
+        lookups = []
+        for service_name, service_config in config_services.items():
+            if not service_config.get("enabled", False):
+                continue
+            service = lookup_services.get(service_name)
+            if not service:
+                continue
+            api_key = await self.get_api_key(service_name, config_services)
+            if not api_key:
+                continue
+            lookups.append(
+                (
+                    service_name,
+                    service,
+                    api_key,
+                    service_config.get("autoban", False),
+                )
+            )
+        return lookups
+
+    async def _lookup_user(
+        self,
+        lookups: list[tuple[str, BaseService, bool | str, bool]],
+        member_id: int,
+    ) -> list[tuple[bool, list[LookupResult]]]:
+        """Look up a user on all given services, returning (autoban, results) per service."""
+        # Query all services at once, so one slow service doesn't hold up the rest
+        # (asyncio.gather keeps the results in the same order as the lookups)
+        results = await asyncio.gather(
+            *(
+                self._timed_lookup(service_name, service, member_id, api_key)
+                for service_name, service, api_key, _ in lookups
+            )
+        )
+        log.debug(
+            "Lookup for user=%d took: %s",
+            member_id,
+            ", ".join(
+                f"{service_name}={elapsed * 1000:.0f}ms ({source})"
+                for (service_name, _, _, _), (_, elapsed, source) in zip(
+                    lookups, results, strict=True
+                )
+            )
+            or "no services",
+        )
+        return [
+            (autoban, responses)
+            for (_, _, _, autoban), (responses, _, _) in zip(
+                lookups, results, strict=True
+            )
+        ]
+
+    async def _bulk_prefetch(
+        self,
+        lookups: list[tuple[str, BaseService, bool | str, bool]],
+        member_ids: list[int],
+    ) -> None:
+        """Fill the lookup cache using bulk lookups, for services that support them."""
+
+        async def prefetch(
+            service_name: str, service: BaseService, api_key: bool | str
+        ) -> None:
+            missing = [
+                member_id
+                for member_id in member_ids
+                if (service_name, member_id) not in self.lookup_cache
+            ]
+            if not missing or service.circuit_breaker.state != CircuitBreaker.CLOSED:
+                return
+            try:
+                async with service.request_slot():
+                    bulk_results = await asyncio.wait_for(
+                        service.bulk_lookup(missing, api_key),
+                        timeout=LOOKUP_TIMEOUT_SECONDS,
+                    )
+            except TimeoutError:
+                service.circuit_breaker.record_failure()
+                return  # Members will be looked up individually instead
+            service.circuit_breaker.record_success()
+            for member_id, responses in bulk_results.items():
+                self.lookup_cache.set(
+                    (service_name, member_id), responses, self._cache_ttl(responses)
+                )
+
+        await asyncio.gather(
+            *(
+                prefetch(service_name, service, api_key)
+                for service_name, service, api_key, _ in lookups
+                if service.supports(Capability.BULK_LOOKUP)
+            )
+        )
 
     async def _user_lookup(
         self,
@@ -686,7 +1520,6 @@ class BanCheck(commands.Cog):
         do_ban: bool = False,
     ) -> discord.Embed | None:
         """Perform user lookup and return results embed. Optionally ban user too."""
-        config_services = await self.config.guild(guild).services()
         banned_services: dict[str, str] = {}
         auto_banned = False
         is_error = False
@@ -701,22 +1534,8 @@ class BanCheck(commands.Cog):
             member_avatar_url = None
 
         # Get results
-        for service_name, service_config in config_services.items():
-            if not service_config.get("enabled", False):
-                continue
-            autoban = service_config.get("autoban", False)
-            service_class = self.all_supported_services.get(service_name, None)
-            if not service_class:
-                continue
-            api_key = await self.get_api_key(service_name, config_services)
-            if not api_key:
-                continue
-            if not hasattr(service_class(), "lookup"):
-                continue  # This service does not support lookup
-
-            responses = await service_class().lookup(member_id, api_key)
-            if not isinstance(responses, list):
-                responses = [responses]
+        results = await self._lookup_user(await self._get_lookups(guild), member_id)
+        for autoban, responses in results:
             for response in responses:
                 checked.append(response.service)
 
@@ -757,34 +1576,10 @@ class BanCheck(commands.Cog):
                 and isinstance(member, discord.Member)
                 and guild.me.guild_permissions.ban_members
             ):
-                with suppress(discord.Forbidden, discord.NotFound):
-                    singular_or_plural = (
-                        "a global ban list"
-                        if len(banned_services) == 1
-                        else "multiple global ban lists"
-                    )
-                    list_of_banned_services = ", ".join(banned_services)
-                    await member.send(
-                        f"Hello! Since you are currently on {singular_or_plural} ({list_of_banned_services}), "
-                        f"you have automatically been banned from {member.guild}."
-                    )
-                try:
-                    reasons = [
-                        f"{name} ({reason})" for name, reason in banned_services.items()
-                    ]
-                    await guild.ban(
-                        member,
-                        reason=f"BanCheck auto ban: {', '.join(reasons)}",
-                        delete_message_days=1,
-                    )
-                    # Update guild ban totals
-                    total_bans = await self.config.guild(guild).total_bans()
-                    await self.config.guild(guild).total_bans.set(total_bans + 1)
-                    # Update global ban totals
-                    global_total_bans = await self.config.total_bans()
-                    await self.config.total_bans.set(global_total_bans + 1)
+                if await self._auto_ban(guild, member, banned_services):
+                    await self._increment_total_bans(guild, 1)
                     title += " - Auto Banned"
-                except (discord.Forbidden, discord.HTTPException):
+                else:
                     title += " - Not allowed to Auto Ban"
             return self.embed_maker(
                 title, discord.Colour.red(), description, member_avatar_url
@@ -812,10 +1607,176 @@ class BanCheck(commands.Cog):
             member_avatar_url,
         )
 
+    @staticmethod
+    async def _auto_ban(
+        guild: discord.Guild, member: discord.Member, banned_services: dict[str, str]
+    ) -> bool:
+        """Let a member know why they are being banned, then ban them.
+
+        Returns True if the member was banned, False if we weren't allowed to.
+        """
+        with suppress(discord.Forbidden, discord.NotFound):
+            singular_or_plural = (
+                "a global ban list"
+                if len(banned_services) == 1
+                else "multiple global ban lists"
+            )
+            list_of_banned_services = ", ".join(banned_services)
+            await member.send(
+                f"Hello! Since you are currently on {singular_or_plural} ({list_of_banned_services}), "
+                f"you have automatically been banned from {member.guild}."
+            )
+        try:
+            reasons = [f"{name} ({reason})" for name, reason in banned_services.items()]
+            await guild.ban(
+                member,
+                reason=f"BanCheck auto ban: {', '.join(reasons)}",
+                delete_message_days=1,
+            )
+        except (discord.Forbidden, discord.HTTPException):
+            return False
+        return True
+
+    async def _increment_total_bans(self, guild: discord.Guild, count: int) -> None:
+        """Add to the guild and global auto ban totals."""
+        if not count:
+            return
+        # Update guild ban totals
+        total_bans = await self.config.guild(guild).total_bans()
+        await self.config.guild(guild).total_bans.set(total_bans + count)
+        # Update global ban totals
+        global_total_bans = await self.config.total_bans()
+        await self.config.total_bans.set(global_total_bans + count)
+
+    async def _timed_lookup(
+        self,
+        service_name: str,
+        service: BaseService,
+        member_id: int,
+        api_key: bool | str,
+    ) -> tuple[list[LookupResult], float, str]:
+        """Perform a single service lookup.
+
+        Returns the results, how long it took, and where the results came from:
+        - "cached" if they were already in the lookup cache
+        - "shared" if an identical lookup was already in flight and was waited on
+        - "network" if this call performed the lookup itself
+        - "local" if the service doesn't need caching (its data is stored locally)
+        """
+        start = time.perf_counter()
+        cache_key = (service_name, member_id)
+        if not service.CACHE_RESULTS:
+            responses = await self._service_lookup(cache_key, service, api_key)
+            return responses, time.perf_counter() - start, "local"
+        cached = self.lookup_cache.get(cache_key)
+        if cached is not None:
+            return cached, time.perf_counter() - start, "cached"
+        # Only one request per (service, user) at a time, everyone else waits on it
+        source = "shared"
+        task = self.inflight_lookups.get(cache_key)
+        if task is None:
+            source = "network"
+            task = asyncio.create_task(
+                self._service_lookup(cache_key, service, api_key)
+            )
+            self.inflight_lookups[cache_key] = task
+
+            def done_callback(_: asyncio.Task) -> None:
+                if self.inflight_lookups.get(cache_key) is task:
+                    del self.inflight_lookups[cache_key]
+
+            task.add_done_callback(done_callback)
+        else:
+            self.coalesced_lookups += 1
+        # Shielded so that a cancelled waiter doesn't cancel the lookup for everyone else
+        responses = await asyncio.shield(task)
+        return responses, time.perf_counter() - start, source
+
+    async def _service_lookup(
+        self, cache_key: tuple[str, int], service: BaseService, api_key: bool | str
+    ) -> list[LookupResult]:
+        """Query a service for a user and cache the results (if the service allows it)."""
+        # A service that isn't ready yet (like an unsynced mirror) isn't failing, so leave the circuit breaker out of it
+        breaker = service.circuit_breaker if service.ready else None
+        if breaker and not breaker.allow():
+            # Fail fast instead of waiting on a service that is known to be down
+            return [
+                LookupResult(
+                    service.SERVICE_NAME,
+                    "error",
+                    reason="Service degraded, lookups paused for "
+                    f"{breaker.retry_in:.0f} more seconds",
+                )
+            ]
+        try:
+            async with service.request_slot():
+                responses = await asyncio.wait_for(
+                    service.lookup(cache_key[1], api_key),
+                    timeout=LOOKUP_TIMEOUT_SECONDS,
+                )
+        except TimeoutError:
+            responses = LookupResult(
+                service.SERVICE_NAME,
+                "error",
+                reason=f"Lookup timed out after {LOOKUP_TIMEOUT_SECONDS:g} seconds",
+            )
+        except BaseException:
+            # Always record an outcome, or a half open circuit would wait on this trial forever
+            if breaker:
+                breaker.record_failure()
+            raise
+        if not isinstance(responses, list):
+            responses = [responses]
+        if breaker:
+            if any(response.result not in ("ban", "clear") for response in responses):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+        if service.CACHE_RESULTS:
+            self.lookup_cache.set(cache_key, responses, self._cache_ttl(responses))
+        return responses
+
+    @staticmethod
+    def _cache_ttl(responses: list[LookupResult]) -> float:
+        """Get how long a set of lookup results should be cached for.
+
+        Errors are retried soon, bans are remembered longer than clear results.
+        """
+        results = {response.result for response in responses}
+        if results - {"ban", "clear"}:
+            return CACHE_TTL_SECONDS["error"]
+        if "ban" in results:
+            return CACHE_TTL_SECONDS["ban"]
+        return CACHE_TTL_SECONDS["clear"]
+
     #
     # Public methods
     #
 
+    @property
+    def supported_global_services(self) -> dict[str, type[BaseService]]:
+        """Get all services that have their API key set up globally by the bot owner."""
+        return self.registry.global_services
+
+    @property
+    def supported_guild_services(self) -> dict[str, type[BaseService]]:
+        """Get all services that have their API key set up per guild."""
+        return self.registry.guild_services
+
+    @property
+    def all_supported_services(self) -> dict[str, type[BaseService]]:
+        """Get all services."""
+        return self.registry.all_services
+
+    @property
+    def local_mirror(self) -> BanListMirror:
+        """Get the local ban list mirror."""
+        service = self.registry.get("localmirror")
+        if not service:
+            msg = "The Local Mirror service has not been started"
+            raise RuntimeError(msg)
+        return service.mirror
+
     async def format_service_name_url(
         self, service_name: str, *, show_help: bool = False
     ) -> str:
@@ -824,10 +1785,8 @@ class BanCheck(commands.Cog):
         if not service_class:
             return f"`{service_name}`"
         result = f" `{service_name}` - [{service_class.SERVICE_NAME}]({service_class.SERVICE_URL})"
-        if show_help:
-            with suppress(AttributeError):
-                result += f" ({service_class.SERVICE_HINT})"
-            # Otherwise, no hint for this service
+        if show_help and service_class.SERVICE_HINT:
+            result += f" ({service_class.SERVICE_HINT})"
         return result
 
     async def get_api_key(
@@ -857,7 +1816,7 @@ class BanCheck(commands.Cog):
                 return api_key
         # API not required, otherwise fail
         service_class = self.all_supported_services.get(service_name, None)
-        return service_class and not service_class().SERVICE_API_KEY_REQUIRED
+        return service_class and not service_class.SERVICE_API_KEY_REQUIRED
 
     def get_nice_service_name(self, service: str) -> str:
         """Get the nice name for a service."""
@@ -886,7 +1845,7 @@ class BanCheck(commands.Cog):
                 error("I need the `Embed links` permission to function properly")
             )
             return False
-        await destination.send(embed=embed)
+        await embed_splitter(embed, destination)
         return True
 
     @staticmethod
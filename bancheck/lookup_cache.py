@@ -0,0 +1,89 @@
+"""A bounded, expiring cache for ban list lookup results."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+__author__ = "PhasecoreX"
+
+
+class LookupCache:
+    """A bounded least-recently-used cache where each entry expires after its own TTL.
+
+    Keeps track of hits, misses, evictions and expirations so that the
+    effectiveness of the cache can be displayed to the bot owner.
+    """
+
+    def __init__(
+        self, max_size: int, *, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """Create an empty cache holding at most max_size entries."""
+        self.max_size = max_size
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:  # noqa: ANN401
+        """Get a value from the cache, or default if it is missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires, value = entry
+        if expires <= self._clock():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:  # noqa: ANN401
+        """Store a value in the cache for ttl seconds, evicting the oldest entries if full."""
+        if ttl <= 0 or self.max_size <= 0:
+            return
+        self._entries[key] = (self._clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:  # noqa: ANN401
+        """Remove a value from the cache, returning it (or default if missing)."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return default
+        return entry[1]
+
+    def clear(self) -> int:
+        """Remove all entries from the cache. Returns the number of entries removed."""
+        count = len(self._entries)
+        self._entries.clear()
+        return count
+
+    def reset_stats(self) -> None:
+        """Reset all hit/miss counters."""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Get the fraction of lookups that were served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self) -> int:
+        """Count of how many entries are in the cache (some may have expired)."""
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Check if an unexpired entry exists, without affecting stats or order."""
+        entry = self._entries.get(key)
+        return entry is not None and entry[0] > self._clock()
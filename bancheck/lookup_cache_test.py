@@ -0,0 +1,92 @@
+"""Unit tests for lookup_cache."""
+
+import unittest
+
+import lookup_cache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        """Start the clock at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Expiry(unittest.TestCase):
+    def test_hit_before_ttl(self):
+        clock = FakeClock()
+        cache = lookup_cache.LookupCache(10, clock=clock)
+        cache.set("key", "value", 30)
+        clock.now = 29.9
+        assert cache.get("key") == "value"
+        assert cache.hits == 1
+        assert cache.misses == 0
+
+    def test_miss_after_ttl(self):
+        clock = FakeClock()
+        cache = lookup_cache.LookupCache(10, clock=clock)
+        cache.set("key", "value", 30)
+        clock.now = 30
+        assert cache.get("key") is None
+        assert cache.misses == 1
+        assert cache.expirations == 1
+        assert len(cache) == 0
+
+    def test_separate_ttls(self):
+        clock = FakeClock()
+        cache = lookup_cache.LookupCache(10, clock=clock)
+        cache.set("short", 1, 5)
+        cache.set("long", 2, 60)
+        clock.now = 10
+        assert "short" not in cache
+        expected = 2
+        assert expected == cache.get("long")
+
+    def test_zero_ttl_not_stored(self):
+        cache = lookup_cache.LookupCache(10)
+        cache.set("key", "value", 0)
+        assert len(cache) == 0
+
+
+class Eviction(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = lookup_cache.LookupCache(2)
+        cache.set("a", 1, 60)
+        cache.set("b", 2, 60)
+        cache.get("a")
+        cache.set("c", 3, 60)
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert cache.evictions == 1
+
+    def test_clear(self):
+        cache = lookup_cache.LookupCache(10)
+        cache.set("a", 1, 60)
+        cache.set("b", 2, 60)
+        expected = 2
+        assert expected == cache.clear()
+        assert len(cache) == 0
+
+
+class Stats(unittest.TestCase):
+    def test_hit_rate(self):
+        cache = lookup_cache.LookupCache(10)
+        assert cache.hit_rate == 0.0
+        cache.set("a", 1, 60)
+        cache.get("a")
+        cache.get("a")
+        cache.get("a")
+        cache.get("b")
+        expected = 0.75
+        assert expected == cache.hit_rate
+        cache.reset_stats()
+        assert cache.hits == 0
+        assert cache.misses == 0
+
+
+# Run unit tests from command line
+if __name__ == "__main__":
+    unittest.main()
@@ -1,29 +1,26 @@
 """Ban lookup for Antiraid."""
 
 import aiohttp
-from redbot.core import __version__ as redbot_version
 
+from .base_service import BaseService, user_agent
 from .dto.lookup_result import LookupResult
 
-user_agent = (
-    f"Red-DiscordBot/{redbot_version} BanCheck (https://github.com/PhasecoreX/PCXCogs)"
-)
 
-
-class Antiraid:
+class Antiraid(BaseService):
     """Ban lookup for Antiraid."""
 
     SERVICE_NAME = "Antiraid"
     SERVICE_API_KEY_REQUIRED = False
     SERVICE_URL = "https://banapi.derpystown.com/"
     SERVICE_HINT = None
+    # Not documented by Antiraid, so stay on the conservative side
+    RATE_LIMIT = (10, 1.0)
     BASE_URL = "https://banapi.derpystown.com"
 
-    @staticmethod
-    async def lookup(user_id: int, _api_key: str) -> LookupResult:
+    async def lookup(self, user_id: int, _api_key: str | bool) -> LookupResult:
         """Perform user lookup on Antiraid."""
         try:
-            async with aiohttp.ClientSession() as session, session.get(
+            async with self.session.get(
                 f"{Antiraid.BASE_URL}/bans/{user_id}",
                 headers={
                     "user-agent": user_agent,
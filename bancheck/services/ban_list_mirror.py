@@ -0,0 +1,206 @@
+"""A local, on-disk mirror of a remote ban list."""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+
+__author__ = "PhasecoreX"
+
+SYNC_TIMEOUT_SECONDS = 300
+
+
+class BanListMirror:
+    """A local, on-disk mirror of a remote ban list.
+
+    Bans are stored in an SQLite table keyed by user ID, so lookups are a single
+    B-tree search and keep working even if the remote ban list is down.
+
+    The mirror is filled from an export endpoint that returns either a full export:
+        {"bans": [{"userid": "123", "reason": "...", "proof": "..."}, ...], "cursor": "abc"}
+    or, when called with ?since=<cursor>, the changes since that cursor:
+        {"added": [{"userid": "456", "reason": "..."}, ...], "removed": ["123", ...], "cursor": "def"}
+    It can also be filled from an imported file, in the full export format above
+    or as plain text with one user ID (optionally followed by a comma and a reason) per line.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        """Open (or create) the mirror at the given path."""
+        self.path = str(path)
+        self._write_lock = threading.Lock()
+        self._connection = self._connect()
+        with self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS bans ("
+                "user_id INTEGER PRIMARY KEY, reason TEXT, proof_url TEXT)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+        # Kept in memory, as it's checked on every lookup
+        last_synced = self.get_meta("last_synced")
+        self._last_synced = float(last_synced) if last_synced else None
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, check_same_thread=False)
+
+    def close(self) -> None:
+        """Close the mirror."""
+        self._connection.close()
+
+    #
+    # Reading
+    #
+
+    def lookup(self, user_id: int) -> tuple[str | None, str | None] | None:
+        """Look up a user, returning their (reason, proof_url) if banned, None otherwise."""
+        return self._connection.execute(
+            "SELECT reason, proof_url FROM bans WHERE user_id = ?", (user_id,)
+        ).fetchone()
+
+    def __len__(self) -> int:
+        """Count of how many bans are mirrored."""
+        return self._connection.execute("SELECT COUNT(*) FROM bans").fetchone()[0]
+
+    def get_meta(self, key: str) -> str | None:
+        """Get a metadata value (cursor, last_synced)."""
+        row = self._connection.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    @property
+    def cursor(self) -> str | None:
+        """Get the cursor of the last sync, used to only request changes since then."""
+        return self.get_meta("cursor")
+
+    @property
+    def last_synced(self) -> float | None:
+        """Get the UNIX timestamp of the last successful sync or import."""
+        return self._last_synced
+
+    #
+    # Writing
+    #
+
+    def apply_export(self, data: dict[str, Any]) -> int:
+        """Apply a full export or a diff to the mirror.
+
+        Returns the number of bans added, replaced or removed.
+        """
+        if not isinstance(data, dict):
+            msg = "Ban list export must be a JSON object"
+            raise TypeError(msg)
+        # Separate connection, so that this can run in a thread while lookups continue
+        connection = self._connect()
+        synced = time.time()
+        try:
+            with self._write_lock, connection:
+                if "bans" in data:
+                    connection.execute("DELETE FROM bans")
+                    changed = self._insert(connection, data["bans"])
+                else:
+                    changed = self._insert(connection, data.get("added", []))
+                    removed = [(int(user_id),) for user_id in data.get("removed", [])]
+                    connection.executemany(
+                        "DELETE FROM bans WHERE user_id = ?", removed
+                    )
+                    changed += len(removed)
+                self._set_meta(connection, "cursor", data.get("cursor"))
+                self._set_meta(connection, "last_synced", str(synced))
+            self._last_synced = synced
+        finally:
+            connection.close()
+        return changed
+
+    def reset(self, *, keep_bans: bool = False) -> None:
+        """Forget the cursor of the last sync (and the mirrored bans, unless `keep_bans`).
+
+        The next sync will then request a full export.
+        """
+        with self._write_lock, self._connection:
+            self._set_meta(self._connection, "cursor", None)
+            if not keep_bans:
+                self._connection.execute("DELETE FROM bans")
+                self._set_meta(self._connection, "last_synced", None)
+                self._last_synced = None
+
+    def import_text(self, text: str) -> int:
+        """Replace the mirror with the contents of an imported file.
+
+        Returns the number of bans imported.
+        """
+        stripped = text.strip()
+        if stripped.startswith("{"):
+            data = json.loads(stripped)
+            if "bans" not in data:
+                msg = "Imported JSON must be a full export containing a bans list"
+                raise ValueError(msg)
+        else:
+            bans = []
+            for line in stripped.splitlines():
+                user_id, _, reason = line.partition(",")
+                if user_id.strip():
+                    bans.append(
+                        {"userid": user_id.strip(), "reason": reason.strip() or None}
+                    )
+            data = {"bans": bans}
+        # An import has no cursor, so the next sync will request a full export
+        data["cursor"] = None
+        return self.apply_export(data)
+
+    @staticmethod
+    def _insert(connection: sqlite3.Connection, bans: Iterable[dict]) -> int:
+        rows = [
+            (int(ban["userid"]), ban.get("reason"), ban.get("proof")) for ban in bans
+        ]
+        connection.executemany(
+            "INSERT OR REPLACE INTO bans (user_id, reason, proof_url) VALUES (?, ?, ?)",
+            rows,
+        )
+        return len(rows)
+
+    @staticmethod
+    def _set_meta(connection: sqlite3.Connection, key: str, value: str | None) -> None:
+        if value is None:
+            connection.execute("DELETE FROM meta WHERE key = ?", (key,))
+        else:
+            connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+            )
+
+    #
+    # Syncing
+    #
+
+    async def sync(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        headers: dict[str, str] | None = None,
+    ) -> int:
+        """Sync the mirror from a remote export endpoint.
+
+        Only changes since the last sync are requested if a cursor is known.
+        Returns the number of bans added, replaced or removed.
+        """
+        params = {}
+        cursor = self.cursor
+        if cursor:
+            params["since"] = cursor
+        async with session.get(
+            url,
+            params=params,
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=SYNC_TIMEOUT_SECONDS),
+            raise_for_status=True,
+        ) as resp:
+            data = await resp.json(content_type=None)
+        return await asyncio.to_thread(self.apply_export, data)
@@ -0,0 +1,174 @@
+"""Unit tests for ban_list_mirror."""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import aiohttp
+import ban_list_mirror
+from aiohttp import web
+
+
+class Storage(unittest.TestCase):
+    def setUp(self) -> None:
+        """Create an empty mirror in a temporary folder."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.mirror = ban_list_mirror.BanListMirror(
+            Path(self.temp_dir.name) / "mirror.sqlite3"
+        )
+
+    def tearDown(self) -> None:
+        """Clean up the mirror."""
+        self.mirror.close()
+        self.temp_dir.cleanup()
+
+    def test_empty(self):
+        assert self.mirror.lookup(123) is None
+        assert self.mirror.last_synced is None
+        assert len(self.mirror) == 0
+
+    def test_full_export(self):
+        self.mirror.apply_export(
+            {
+                "bans": [
+                    {"userid": "123", "reason": "Raiding", "proof": "https://a"},
+                    {"userid": "456", "reason": "Spamming"},
+                ],
+                "cursor": "one",
+            }
+        )
+        expected = ("Raiding", "https://a")
+        assert expected == self.mirror.lookup(123)
+        expected = ("Spamming", None)
+        assert expected == self.mirror.lookup(456)
+        assert self.mirror.lookup(789) is None
+        assert self.mirror.cursor == "one"
+        assert self.mirror.last_synced is not None
+
+    def test_full_export_replaces(self):
+        self.mirror.apply_export({"bans": [{"userid": "123", "reason": "Raiding"}]})
+        self.mirror.apply_export({"bans": [{"userid": "456", "reason": "Spamming"}]})
+        assert self.mirror.lookup(123) is None
+        assert self.mirror.lookup(456) is not None
+
+    def test_diff(self):
+        self.mirror.apply_export(
+            {"bans": [{"userid": "123", "reason": "Raiding"}], "cursor": "one"}
+        )
+        changed = self.mirror.apply_export(
+            {
+                "added": [{"userid": "456", "reason": "Spamming"}],
+                "removed": ["123"],
+                "cursor": "two",
+            }
+        )
+        expected = 2
+        assert expected == changed
+        assert self.mirror.lookup(123) is None
+        assert self.mirror.lookup(456) is not None
+        assert self.mirror.cursor == "two"
+
+    def test_import_text(self):
+        imported = self.mirror.import_text("123,Raiding\n456\n\n")
+        expected = 2
+        assert expected == imported
+        expected = ("Raiding", None)
+        assert expected == self.mirror.lookup(123)
+        expected = (None, None)
+        assert expected == self.mirror.lookup(456)
+        assert self.mirror.cursor is None
+
+    def test_import_json(self):
+        self.mirror.import_text('{"bans": [{"userid": "123", "reason": "Raiding"}]}')
+        assert self.mirror.lookup(123) is not None
+
+    def test_persisted(self):
+        self.mirror.apply_export({"bans": [{"userid": "123", "reason": "Raiding"}]})
+        reopened = ban_list_mirror.BanListMirror(self.mirror.path)
+        try:
+            assert reopened.lookup(123) is not None
+            assert reopened.last_synced == self.mirror.last_synced
+        finally:
+            reopened.close()
+
+    def test_reset(self):
+        self.mirror.apply_export(
+            {"bans": [{"userid": "123", "reason": "Raiding"}], "cursor": "one"}
+        )
+        self.mirror.reset(keep_bans=True)
+        assert self.mirror.cursor is None
+        assert self.mirror.lookup(123) is not None
+        self.mirror.reset()
+        assert self.mirror.lookup(123) is None
+        assert self.mirror.last_synced is None
+
+
+class Sync(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        """Start a local stand-in for a ban list export endpoint."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.mirror = ban_list_mirror.BanListMirror(
+            Path(self.temp_dir.name) / "mirror.sqlite3"
+        )
+        self.requests: list[dict[str, str]] = []
+        self.upstream_down = False
+
+        async def export(request: web.Request) -> web.Response:
+            self.requests.append(dict(request.query))
+            if self.upstream_down:
+                return web.Response(status=503)
+            if request.query.get("since") == "one":
+                return web.json_response(
+                    {"added": [{"userid": "456"}], "removed": [], "cursor": "two"}
+                )
+            return web.json_response(
+                {"bans": [{"userid": "123", "reason": "Raiding"}], "cursor": "one"}
+            )
+
+        app = web.Application()
+        app.router.add_get("/export", export)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # noqa: SLF001
+        self.url = f"http://127.0.0.1:{port}/export"
+        self.session = aiohttp.ClientSession()
+
+    async def asyncTearDown(self) -> None:
+        """Stop the stand-in and clean up the mirror."""
+        await self.session.close()
+        await self.runner.cleanup()
+        self.mirror.close()
+        self.temp_dir.cleanup()
+
+    async def test_full_then_diff(self):
+        await self.mirror.sync(self.session, self.url)
+        assert self.mirror.lookup(123) is not None
+        await self.mirror.sync(self.session, self.url)
+        assert self.mirror.lookup(456) is not None
+        expected = [{}, {"since": "one"}]
+        assert expected == self.requests
+
+    async def test_full_export_after_reset(self):
+        await self.mirror.sync(self.session, self.url)
+        self.mirror.reset()
+        await self.mirror.sync(self.session, self.url)
+        expected = [{}, {}]
+        assert expected == self.requests
+
+    async def test_upstream_down_keeps_mirror(self):
+        await self.mirror.sync(self.session, self.url)
+        self.upstream_down = True
+        failed = False
+        try:
+            await self.mirror.sync(self.session, self.url)
+        except aiohttp.ClientResponseError:
+            failed = True
+        assert failed
+        assert self.mirror.lookup(123) is not None
+
+
+# Run unit tests from command line
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""Common interface for all BanCheck services."""
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from enum import Flag, auto
+from pathlib import Path
+
+import aiohttp
+from redbot.core import __version__ as redbot_version
+
+from .dto.lookup_result import LookupResult
+from .resilience import CircuitBreaker, TokenBucket
+
+user_agent = (
+    f"Red-DiscordBot/{redbot_version} BanCheck (https://github.com/PhasecoreX/PCXCogs)"
+)
+
+
+class Capability(Flag):
+    """What a BanCheck service is able to do."""
+
+    LOOKUP = auto()
+    BULK_LOOKUP = auto()
+    REPORT = auto()
+
+
+class BaseService:
+    """Common interface for all BanCheck services.
+
+    Services are handed the HTTP session owned by the BanCheck cog,
+    so that every lookup reuses the same pool of warm connections.
+
+    Subclasses declare what they can do in CAPABILITIES, and implement the matching methods.
+    RATE_LIMIT is the (requests, per_seconds) the remote API allows, or None if unknown,
+    and MAX_CONCURRENCY is the most requests that will be made to the service at once.
+    After CIRCUIT_BREAKER_THRESHOLD consecutive errors, the service is considered degraded
+    and is skipped for CIRCUIT_BREAKER_COOLDOWN seconds.
+    """
+
+    SERVICE_NAME = "Unknown"
+    SERVICE_API_KEY_REQUIRED = False
+    SERVICE_URL = ""
+    SERVICE_HINT = None
+    HIDDEN = False
+    CAPABILITIES = Capability.LOOKUP
+    RATE_LIMIT: tuple[int, float] | None = None
+    MAX_CONCURRENCY = 10
+    CIRCUIT_BREAKER_THRESHOLD = 5
+    CIRCUIT_BREAKER_COOLDOWN = 60.0
+    CACHE_RESULTS = True
+
+    def __init__(self, session: aiohttp.ClientSession, data_path: Path) -> None:
+        """Set up the service with a shared HTTP session and the cogs data folder."""
+        self.session = session
+        self.data_path = data_path
+        self.concurrency = asyncio.Semaphore(self.MAX_CONCURRENCY)
+        self.rate_limiter = TokenBucket(*self.RATE_LIMIT) if self.RATE_LIMIT else None
+        self.circuit_breaker = CircuitBreaker(
+            self.CIRCUIT_BREAKER_THRESHOLD, self.CIRCUIT_BREAKER_COOLDOWN
+        )
+
+    @property
+    def ready(self) -> bool:
+        """Check if this service is able to answer lookups yet.
+
+        Errors from lookups made before then don't count towards the circuit breaker.
+        """
+        return True
+
+    def supports(self, capability: Capability) -> bool:
+        """Check if this service has a capability."""
+        return capability in self.CAPABILITIES
+
+    def close(self) -> None:
+        """Release any resources held by this service."""
+
+    @asynccontextmanager
+    async def request_slot(self) -> AsyncIterator[None]:
+        """Wait until a request can be made without going over the concurrency or rate limit."""
+        async with self.concurrency:
+            if self.rate_limiter:
+                await self.rate_limiter.acquire()
+            yield
+
+    async def lookup(self, user_id: int, api_key: str | bool) -> LookupResult:
+        """Perform user lookup on this service."""
+        raise NotImplementedError
+
+    async def bulk_lookup(
+        self, user_ids: list[int], api_key: str | bool
+    ) -> dict[int, list[LookupResult]]:
+        """Perform user lookup for many users at once on this service.
+
+        Only used if the service has the BULK_LOOKUP capability.
+        """
+        raise NotImplementedError
+
+    async def report(self, user_id: int, reason: str, api_key: str | bool) -> bool:
+        """Report a user to this service. Returns True if the report was accepted.
+
+        Only used if the service has the REPORT capability.
+        """
+        raise NotImplementedError
@@ -0,0 +1,77 @@
+"""Fake ban lookup, for tests and benchmarks."""
+
+import asyncio
+from pathlib import Path
+
+import aiohttp
+
+from .base_service import BaseService, Capability
+from .dto.lookup_result import LookupResult
+
+
+class FakeService(BaseService):
+    """Fake ban lookup, for tests and benchmarks.
+
+    Never touches the network. Users in `banned` are reported as banned, users in `errors`
+    return an error, and everyone else is clear. Every request waits `latency` seconds,
+    so that the concurrency, caching and rate limiting of BanCheck can be exercised.
+    `max_in_flight` is the most requests that were ever being handled at once.
+    """
+
+    SERVICE_NAME = "Fake"
+    SERVICE_URL = "https://github.com/PhasecoreX/PCXCogs/tree/master/bancheck/README.md"
+    HIDDEN = True
+    CAPABILITIES = Capability.LOOKUP | Capability.BULK_LOOKUP | Capability.REPORT
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        data_path: Path,
+        *,
+        latency: float = 0.0,
+        banned: dict[int, str] | None = None,
+        errors: set[int] | None = None,
+    ) -> None:
+        """Set up the fake ban list."""
+        super().__init__(session, data_path)
+        self.latency = latency
+        self.banned = banned if banned is not None else {}
+        self.errors = errors if errors is not None else set()
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def lookup(self, user_id: int, _api_key: str | bool) -> LookupResult:
+        """Perform user lookup on the fake ban list."""
+        await self._request()
+        return self._result(user_id)
+
+    async def bulk_lookup(
+        self, user_ids: list[int], _api_key: str | bool
+    ) -> dict[int, list[LookupResult]]:
+        """Perform user lookup for many users at once on the fake ban list."""
+        await self._request()
+        return {user_id: [self._result(user_id)] for user_id in user_ids}
+
+    async def report(self, user_id: int, reason: str, _api_key: str | bool) -> bool:
+        """Add a user to the fake ban list."""
+        await self._request()
+        self.banned[user_id] = reason
+        return True
+
+    async def _request(self) -> None:
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+
+    def _result(self, user_id: int) -> LookupResult:
+        if user_id in self.errors:
+            return LookupResult(self.SERVICE_NAME, "error", reason="Fake error")
+        if user_id in self.banned:
+            return LookupResult(self.SERVICE_NAME, "ban", reason=self.banned[user_id])
+        return LookupResult(self.SERVICE_NAME, "clear")
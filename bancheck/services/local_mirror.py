@@ -0,0 +1,57 @@
+"""Ban lookup for a local mirror of a ban list."""
+
+import asyncio
+from pathlib import Path
+
+import aiohttp
+
+from .ban_list_mirror import BanListMirror
+from .base_service import BaseService
+from .dto.lookup_result import LookupResult
+
+
+class LocalMirror(BaseService):
+    """Ban lookup for a local mirror of a ban list.
+
+    The mirror is synced in the background by the BanCheck cog (or filled from an imported file),
+    so lookups never leave the bot and keep working when the remote ban list is down.
+    """
+
+    SERVICE_NAME = "Local Mirror"
+    SERVICE_API_KEY_REQUIRED = False
+    SERVICE_URL = "https://github.com/PhasecoreX/PCXCogs/tree/master/bancheck/README.md"
+    SERVICE_HINT = "Set up by the bot owner with `[p]banchecksetglobal mirror`"
+    CACHE_RESULTS = False
+
+    def __init__(self, session: aiohttp.ClientSession, data_path: Path) -> None:
+        """Open the local mirror."""
+        super().__init__(session, data_path)
+        self.mirror = BanListMirror(data_path / "ban_list_mirror.sqlite3")
+
+    @property
+    def ready(self) -> bool:
+        """Check if the local mirror has been synced (or imported) yet."""
+        return self.mirror.last_synced is not None
+
+    def close(self) -> None:
+        """Close the local mirror."""
+        self.mirror.close()
+
+    async def lookup(self, user_id: int, _api_key: str | bool) -> LookupResult:
+        """Perform user lookup on the local mirror."""
+        ban = await asyncio.to_thread(self.mirror.lookup, user_id)
+        if ban:
+            reason, proof_url = ban
+            return LookupResult(
+                self.SERVICE_NAME,
+                "ban",
+                reason=reason or "No reason given",
+                proof_url=proof_url,
+            )
+        if self.mirror.last_synced is None:
+            return LookupResult(
+                self.SERVICE_NAME,
+                "error",
+                reason="Ban list mirror has not been synced yet",
+            )
+        return LookupResult(self.SERVICE_NAME, "clear")
@@ -0,0 +1,114 @@
+"""Registry of all BanCheck services."""
+
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+
+from .base_service import BaseService, Capability
+
+
+class ServiceRegistry:
+    """Registry of all BanCheck services.
+
+    Services are registered by class, and each one is instantiated exactly once
+    (when the registry is started) so that every lookup reuses the same instance.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty registry."""
+        self._classes: dict[str, type[BaseService]] = {}
+        self._global: set[str] = set()
+        self._kwargs: dict[str, dict[str, Any]] = {}
+        self._instances: dict[str, BaseService] = {}
+        self._session: aiohttp.ClientSession | None = None
+        self._data_path: Path | None = None
+
+    def register(
+        self,
+        service_name: str,
+        service_class: type[BaseService],
+        *,
+        global_service: bool,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> None:
+        """Register a service.
+
+        Global services have their API key set by the bot owner for the entire bot,
+        while guild services have their API key set per guild.
+        Any extra keyword arguments are passed to the service when it is instantiated.
+        """
+        if service_name in self._classes:
+            msg = f"A BanCheck service named {service_name} is already registered"
+            raise ValueError(msg)
+        self._classes[service_name] = service_class
+        self._kwargs[service_name] = kwargs
+        if global_service:
+            self._global.add(service_name)
+        if self._session and self._data_path:
+            self._instantiate(service_name)
+
+    def unregister(self, service_name: str) -> None:
+        """Unregister a service, closing it if it was started."""
+        self._classes.pop(service_name, None)
+        self._kwargs.pop(service_name, None)
+        self._global.discard(service_name)
+        service = self._instances.pop(service_name, None)
+        if service:
+            service.close()
+
+    def start(self, session: aiohttp.ClientSession, data_path: Path) -> None:
+        """Instantiate all registered services."""
+        self._session = session
+        self._data_path = data_path
+        for service_name in self._classes:
+            if service_name not in self._instances:
+                self._instantiate(service_name)
+
+    def close(self) -> None:
+        """Close all instantiated services."""
+        for service in self._instances.values():
+            service.close()
+        self._instances.clear()
+        self._session = None
+        self._data_path = None
+
+    def _instantiate(self, service_name: str) -> None:
+        self._instances[service_name] = self._classes[service_name](
+            self._session, self._data_path, **self._kwargs[service_name]
+        )
+
+    def get(self, service_name: str) -> BaseService | None:
+        """Get the single instance of a service, or None if it isn't registered or started."""
+        return self._instances.get(service_name)
+
+    def with_capability(self, capability: Capability) -> dict[str, BaseService]:
+        """Get the instance of every started service that has a capability."""
+        return {
+            service_name: service
+            for service_name, service in self._instances.items()
+            if service.supports(capability)
+        }
+
+    @property
+    def global_services(self) -> dict[str, type[BaseService]]:
+        """Get all global service classes."""
+        return {
+            service_name: service_class
+            for service_name, service_class in self._classes.items()
+            if service_name in self._global
+        }
+
+    @property
+    def guild_services(self) -> dict[str, type[BaseService]]:
+        """Get all guild service classes."""
+        return {
+            service_name: service_class
+            for service_name, service_class in self._classes.items()
+            if service_name not in self._global
+        }
+
+    @property
+    def all_services(self) -> dict[str, type[BaseService]]:
+        """Get all service classes."""
+        return dict(self._classes)
@@ -0,0 +1,151 @@
+"""Unit tests for registry."""
+
+import asyncio
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import aiohttp
+
+# Services import each other relative to their package, so they are imported through it
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from services import base_service, fake, registry
+
+API_KEY = "fake api key"
+
+
+class CountingFakeService(fake.FakeService):
+    instances = 0
+
+    def __init__(
+        self, session: aiohttp.ClientSession, data_path: Path, **kwargs: float
+    ) -> None:
+        """Count every instance created."""
+        super().__init__(session, data_path, **kwargs)
+        CountingFakeService.instances += 1
+
+
+class LookupOnlyFakeService(fake.FakeService):
+    CAPABILITIES = base_service.Capability.LOOKUP
+
+
+class LimitedFakeService(fake.FakeService):
+    MAX_CONCURRENCY = 3
+
+
+class RegistryTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        """Create an empty registry, with a session and data folder to start it with."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_path = Path(self.temp_dir.name)
+        self.session = aiohttp.ClientSession()
+        self.registry = registry.ServiceRegistry()
+        CountingFakeService.instances = 0
+
+    async def asyncTearDown(self) -> None:
+        """Close everything."""
+        self.registry.close()
+        await self.session.close()
+        self.temp_dir.cleanup()
+
+
+class Instances(RegistryTestCase):
+    async def test_created_once(self):
+        self.registry.register("fake", CountingFakeService, global_service=True)
+        assert CountingFakeService.instances == 0
+        self.registry.start(self.session, self.data_path)
+        self.registry.start(self.session, self.data_path)
+        service = self.registry.get("fake")
+        assert service is self.registry.get("fake")
+        assert (
+            service
+            is self.registry.with_capability(base_service.Capability.LOOKUP)["fake"]
+        )
+        expected = 1
+        assert expected == CountingFakeService.instances
+
+    async def test_registered_after_start(self):
+        self.registry.start(self.session, self.data_path)
+        self.registry.register(
+            "fake", CountingFakeService, global_service=False, latency=0.5
+        )
+        service = self.registry.get("fake")
+        expected = 0.5
+        assert expected == service.latency
+        expected = 1
+        assert expected == CountingFakeService.instances
+        assert "fake" in self.registry.guild_services
+
+    async def test_unregister(self):
+        self.registry.register("fake", fake.FakeService, global_service=True)
+        self.registry.start(self.session, self.data_path)
+        self.registry.unregister("fake")
+        assert self.registry.get("fake") is None
+        assert self.registry.all_services == {}
+
+    async def test_duplicate_name(self):
+        self.registry.register("fake", fake.FakeService, global_service=True)
+        failed = False
+        try:
+            self.registry.register("fake", fake.FakeService, global_service=False)
+        except ValueError:
+            failed = True
+        assert failed
+
+
+class Capabilities(RegistryTestCase):
+    async def test_only_capable_services(self):
+        self.registry.register("full", fake.FakeService, global_service=True)
+        self.registry.register("lookup", LookupOnlyFakeService, global_service=True)
+        self.registry.start(self.session, self.data_path)
+        expected = {"full", "lookup"}
+        assert expected == set(
+            self.registry.with_capability(base_service.Capability.LOOKUP)
+        )
+        expected = {"full"}
+        assert expected == set(
+            self.registry.with_capability(base_service.Capability.REPORT)
+        )
+        assert expected == set(
+            self.registry.with_capability(base_service.Capability.BULK_LOOKUP)
+        )
+
+    async def test_reports_only_sent_to_capable_services(self):
+        self.registry.register("full", fake.FakeService, global_service=True)
+        self.registry.register("lookup", LookupOnlyFakeService, global_service=True)
+        self.registry.start(self.session, self.data_path)
+        for service in self.registry.with_capability(
+            base_service.Capability.REPORT
+        ).values():
+            assert await service.report(1, "Spam", API_KEY)
+        assert self.registry.get("full").banned == {1: "Spam"}
+        assert self.registry.get("lookup").requests == 0
+        result = await self.registry.get("full").lookup(1, API_KEY)
+        expected = "ban"
+        assert expected == result.result
+
+
+class Concurrency(RegistryTestCase):
+    async def test_limit_respected(self):
+        self.registry.register(
+            "fake", LimitedFakeService, global_service=True, latency=0.01
+        )
+        self.registry.start(self.session, self.data_path)
+        service = self.registry.get("fake")
+
+        async def lookup(user_id: int) -> None:
+            """Look up a user the same way BanCheck does."""
+            async with service.request_slot():
+                await service.lookup(user_id, API_KEY)
+
+        await asyncio.gather(*(lookup(user_id) for user_id in range(20)))
+        expected = 20
+        assert expected == service.requests
+        expected = LimitedFakeService.MAX_CONCURRENCY
+        assert expected == service.max_in_flight
+
+
+# Run unit tests from command line
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""Rate limiting and circuit breaking for BanCheck services."""
+
+import asyncio
+import time
+from collections.abc import Callable
+
+__author__ = "PhasecoreX"
+
+
+class TokenBucket:
+    """A token bucket rate limiter.
+
+    Allows bursts of up to `rate` requests, refilling at `rate` tokens every `per` seconds.
+    """
+
+    def __init__(
+        self,
+        rate: int,
+        per: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create a full bucket."""
+        self.rate = rate
+        self.per = per
+        self._clock = clock
+        self._tokens = float(rate)
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+        self.throttled = 0
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            float(self.rate),
+            self._tokens + (now - self._updated) * self.rate / self.per,
+        )
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        """Get how many requests can currently be made without waiting."""
+        self._refill()
+        return self._tokens
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available. Returns False (without waiting) otherwise."""
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    async def acquire(self) -> None:
+        """Take a token, waiting for one to become available if needed."""
+        # The lock makes waiters take tokens in the order they arrived
+        async with self._lock:
+            waited = False
+            while not self.try_acquire():
+                waited = True
+                await asyncio.sleep((1 - self._tokens) * self.per / self.rate)
+            if waited:
+                self.throttled += 1
+
+
+class CircuitBreaker:
+    """A circuit breaker that stops requests to a failing service for a while.
+
+    After `threshold` consecutive failures the circuit opens, and all requests are
+    rejected for `cooldown` seconds. After that a single trial request is allowed
+    through (half open): if it succeeds the circuit closes, otherwise it opens again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half open"
+
+    def __init__(
+        self,
+        threshold: int,
+        cooldown: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create a closed circuit breaker."""
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self.failures = 0
+        self.trips = 0
+        self._opened_at: float | None = None
+        self._trial_in_progress = False
+
+    @property
+    def state(self) -> str:
+        """Get the current state of the circuit."""
+        if self._opened_at is None:
+            return self.CLOSED
+        if self._clock() - self._opened_at < self.cooldown:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    @property
+    def retry_in(self) -> float:
+        """Get how many seconds until requests will be attempted again."""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self.cooldown - self._clock())
+
+    def allow(self) -> bool:
+        """Check if a request should be attempted right now."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._trial_in_progress:
+            self._trial_in_progress = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Record a successful request, closing the circuit."""
+        self.failures = 0
+        self._opened_at = None
+        self._trial_in_progress = False
+
+    def record_failure(self) -> None:
+        """Record a failed request, opening the circuit if there have been too many."""
+        self.failures += 1
+        if self._trial_in_progress or (
+            self._opened_at is None and self.failures >= self.threshold
+        ):
+            self._opened_at = self._clock()
+            self.trips += 1
+        self._trial_in_progress = False
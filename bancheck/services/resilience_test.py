@@ -0,0 +1,99 @@
+"""Unit tests for resilience."""
+
+import unittest
+
+import resilience
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        """Start the clock at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Get the current fake time."""
+        return self.now
+
+
+class TokenBucketTests(unittest.IsolatedAsyncioTestCase):
+    def test_burst_then_empty(self):
+        clock = FakeClock()
+        bucket = resilience.TokenBucket(3, 1.0, clock=clock)
+        assert bucket.try_acquire()
+        assert bucket.try_acquire()
+        assert bucket.try_acquire()
+        assert not bucket.try_acquire()
+
+    def test_refill(self):
+        clock = FakeClock()
+        bucket = resilience.TokenBucket(2, 1.0, clock=clock)
+        bucket.try_acquire()
+        bucket.try_acquire()
+        clock.now = 0.5
+        assert bucket.try_acquire()
+        assert not bucket.try_acquire()
+        clock.now = 10
+        expected = 2.0
+        assert expected == bucket.tokens
+
+    async def test_acquire_waits(self):
+        bucket = resilience.TokenBucket(1, 0.05)
+        await bucket.acquire()
+        await bucket.acquire()
+        expected = 1
+        assert expected == bucket.throttled
+
+
+class CircuitBreakerTests(unittest.TestCase):
+    def test_trips_after_threshold(self):
+        clock = FakeClock()
+        breaker = resilience.CircuitBreaker(3, 60, clock=clock)
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == breaker.OPEN
+        assert not breaker.allow()
+        expected = 60
+        assert expected == breaker.retry_in
+
+    def test_success_resets_failures(self):
+        breaker = resilience.CircuitBreaker(2, 60)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == breaker.CLOSED
+
+    def test_half_open_single_trial(self):
+        clock = FakeClock()
+        breaker = resilience.CircuitBreaker(1, 60, clock=clock)
+        breaker.record_failure()
+        clock.now = 60
+        assert breaker.state == breaker.HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()
+
+    def test_half_open_success_closes(self):
+        clock = FakeClock()
+        breaker = resilience.CircuitBreaker(1, 60, clock=clock)
+        breaker.record_failure()
+        clock.now = 60
+        breaker.allow()
+        breaker.record_success()
+        assert breaker.state == breaker.CLOSED
+
+    def test_half_open_failure_reopens(self):
+        clock = FakeClock()
+        breaker = resilience.CircuitBreaker(1, 60, clock=clock)
+        breaker.record_failure()
+        clock.now = 60
+        breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == breaker.OPEN
+        expected = 2
+        assert expected == breaker.trips
+
+
+# Run unit tests from command line
+if __name__ == "__main__":
+    unittest.main()
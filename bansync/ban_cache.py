@@ -0,0 +1,71 @@
+"""A bounded, expiring record of recent bans and unbans, used for loop prevention."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+__author__ = "PhasecoreX"
+
+
+class BanCache:
+    """A bounded, expiring record of recent bans and unbans, used for loop prevention.
+
+    Remembers whether each (guild, user) was last banned or unbanned, for at most `ttl` seconds.
+    Once `max_size` entries are stored, the least recently recorded entry is evicted.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create an empty cache."""
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[tuple[int, int], tuple[float, bool]] = OrderedDict()
+        self.loops_prevented = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def record(self, guild_id: int, user_id: int, *, ban: bool) -> None:
+        """Record that a user was banned (or unbanned) in a guild."""
+        key = (guild_id, user_id)
+        self._entries[key] = (self._clock() + self.ttl, ban)
+        self._entries.move_to_end(key)
+        self._evict()
+
+    def matches(self, guild_id: int, user_id: int, *, ban: bool) -> bool:
+        """Check if a user was recently banned (or unbanned) in a guild.
+
+        If so, (un)banning them there again would just cause a loop.
+        """
+        key = (guild_id, user_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            return False
+        expires, cached_ban = entry
+        if expires <= self._clock():
+            del self._entries[key]
+            self.expirations += 1
+            return False
+        if cached_ban != ban:
+            return False
+        self.loops_prevented += 1
+        return True
+
+    def resize(self, max_size: int) -> None:
+        """Change the maximum number of entries, evicting entries if needed."""
+        self.max_size = max_size
+        self._evict()
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        """Count of how many entries are stored (some may have expired)."""
+        return len(self._entries)
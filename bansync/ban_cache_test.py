@@ -0,0 +1,69 @@
+"""Unit tests for ban_cache."""
+
+import unittest
+
+import ban_cache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        """Start the clock at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Get the current fake time."""
+        return self.now
+
+
+class LoopPrevention(unittest.TestCase):
+    def test_matches_same_action(self):
+        cache = ban_cache.BanCache(10, 60)
+        cache.record(1, 100, ban=True)
+        assert cache.matches(1, 100, ban=True)
+        assert not cache.matches(1, 100, ban=False)
+        assert not cache.matches(2, 100, ban=True)
+        expected = 1
+        assert expected == cache.loops_prevented
+
+    def test_unban_replaces_ban(self):
+        cache = ban_cache.BanCache(10, 60)
+        cache.record(1, 100, ban=True)
+        cache.record(1, 100, ban=False)
+        assert cache.matches(1, 100, ban=False)
+        assert not cache.matches(1, 100, ban=True)
+
+
+class Bounds(unittest.TestCase):
+    def test_expires(self):
+        clock = FakeClock()
+        cache = ban_cache.BanCache(10, 60, clock=clock)
+        cache.record(1, 100, ban=True)
+        clock.now = 60
+        assert not cache.matches(1, 100, ban=True)
+        expected = 1
+        assert expected == cache.expirations
+        assert len(cache) == 0
+
+    def test_evicts_oldest(self):
+        cache = ban_cache.BanCache(2, 60)
+        cache.record(1, 100, ban=True)
+        cache.record(1, 200, ban=True)
+        cache.record(1, 300, ban=True)
+        assert not cache.matches(1, 100, ban=True)
+        assert cache.matches(1, 300, ban=True)
+        expected = 1
+        assert expected == cache.evictions
+
+    def test_resize(self):
+        cache = ban_cache.BanCache(10, 60)
+        for user_id in range(10):
+            cache.record(1, user_id, ban=True)
+        cache.resize(3)
+        expected = 3
+        assert expected == len(cache)
+        assert cache.matches(1, 9, ban=True)
+
+
+# Run unit tests from command line
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,249 @@
+"""An on-disk journal of bans and unbans, tracking their delivery to each destination."""
+
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from pathlib import Path
+
+__author__ = "PhasecoreX"
+
+
+class BanJournal:
+    """An on-disk journal of bans and unbans, tracking their delivery to each destination.
+
+    Every (un)ban in a source guild is appended as an event with an increasing sequence number.
+    Each destination guild pulling from a source has a cursor: the sequence number of the last
+    event delivered to it. Anything after the cursor still needs to be delivered (or retried).
+
+    The journal also remembers each source guild's ban list as of the last event or reconciliation,
+    so that (un)bans that happened while the bot was offline can be found and added as events.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        """Open (or create) the journal at the given path."""
+        self.path = str(path)
+        self._write_lock = threading.Lock()
+        self._connection = self._connect()
+        with self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS events ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, source_id INTEGER NOT NULL, "
+                "user_id INTEGER NOT NULL, ban INTEGER NOT NULL, created REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS events_source_user "
+                "ON events (source_id, user_id)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS cursors (source_id INTEGER, dest_id INTEGER, "
+                "seq INTEGER NOT NULL, PRIMARY KEY (source_id, dest_id))"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS known_bans (source_id INTEGER, user_id INTEGER, "
+                "PRIMARY KEY (source_id, user_id)) WITHOUT ROWID"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots "
+                "(source_id INTEGER PRIMARY KEY, taken REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, check_same_thread=False)
+
+    def close(self) -> None:
+        """Close the journal."""
+        self._connection.close()
+
+    def __len__(self) -> int:
+        """Count of how many events are in the journal."""
+        return self._connection.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    @property
+    def head(self) -> int:
+        """Get the sequence number of the latest event."""
+        return self._connection.execute(
+            "SELECT COALESCE(MAX(seq), 0) FROM events"
+        ).fetchone()[0]
+
+    #
+    # Events
+    #
+
+    def append(self, source_id: int, user_id: int, *, ban: bool) -> int:
+        """Add a ban (or unban) in a source guild to the journal, returning its sequence number."""
+        with self._write_lock, self._connection:
+            return self._append(self._connection, source_id, user_id, ban=ban)
+
+    @staticmethod
+    def _append(
+        connection: sqlite3.Connection, source_id: int, user_id: int, *, ban: bool
+    ) -> int:
+        cursor = connection.execute(
+            "INSERT INTO events (source_id, user_id, ban, created) VALUES (?, ?, ?, ?)",
+            (source_id, user_id, int(ban), time.time()),
+        )
+        if ban:
+            connection.execute(
+                "INSERT OR IGNORE INTO known_bans (source_id, user_id) VALUES (?, ?)",
+                (source_id, user_id),
+            )
+        else:
+            connection.execute(
+                "DELETE FROM known_bans WHERE source_id = ? AND user_id = ?",
+                (source_id, user_id),
+            )
+        return cursor.lastrowid
+
+    def forget_user(self, user_id: int) -> None:
+        """Remove every event and known ban of a user."""
+        with self._write_lock, self._connection:
+            for table in ("events", "known_bans"):
+                self._connection.execute(
+                    f"DELETE FROM {table} WHERE user_id = ?",  # noqa: S608
+                    (user_id,),
+                )
+
+    #
+    # Delivery
+    #
+
+    def subscribe(self, source_id: int, dest_id: int) -> None:
+        """Start delivering events from a source guild to a destination guild.
+
+        Only events added after this are delivered. Does nothing if already subscribed.
+        """
+        with self._write_lock, self._connection:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO cursors (source_id, dest_id, seq) "
+                "SELECT ?, ?, COALESCE(MAX(seq), 0) FROM events",
+                (source_id, dest_id),
+            )
+
+    def unsubscribe(self, source_id: int, dest_id: int) -> None:
+        """Stop delivering events from a source guild to a destination guild."""
+        with self._write_lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM cursors WHERE source_id = ? AND dest_id = ?",
+                (source_id, dest_id),
+            )
+
+    def pending(
+        self, source_id: int, dest_id: int, limit: int = 100
+    ) -> list[tuple[int, int, bool]]:
+        """Get the (seq, user_id, ban) of events not yet delivered to a destination, oldest first."""
+        return [
+            (seq, user_id, bool(ban))
+            for seq, user_id, ban in self._connection.execute(
+                "SELECT events.seq, events.user_id, events.ban FROM events "
+                "JOIN cursors ON cursors.source_id = events.source_id "
+                "WHERE cursors.source_id = ? AND cursors.dest_id = ? "
+                "AND events.seq > cursors.seq ORDER BY events.seq LIMIT ?",
+                (source_id, dest_id, limit),
+            )
+        ]
+
+    def pending_deliveries(self) -> list[tuple[int, int]]:
+        """Get the (source_id, dest_id) of every destination with undelivered events."""
+        return self._connection.execute(
+            "SELECT source_id, dest_id FROM cursors WHERE EXISTS ("
+            "SELECT 1 FROM events WHERE events.source_id = cursors.source_id "
+            "AND events.seq > cursors.seq)"
+        ).fetchall()
+
+    def advance(self, source_id: int, dest_id: int, seq: int) -> None:
+        """Mark all events from a source up to and including seq as delivered to a destination."""
+        with self._write_lock, self._connection:
+            self._connection.execute(
+                "UPDATE cursors SET seq = MAX(seq, ?) WHERE source_id = ? AND dest_id = ?",
+                (seq, source_id, dest_id),
+            )
+
+    #
+    # Reconciliation
+    #
+
+    def reconcile(
+        self, source_id: int, banned_ids: Iterable[int], since_seq: int
+    ) -> list[tuple[int, bool]]:
+        """Compare a source guild's current ban list to the one last known, adding events for any differences.
+
+        `since_seq` should be the head of the journal from before the ban list was fetched,
+        so that users with newer events (which the fetched ban list may not reflect) are left alone.
+        The first reconciliation of a source only records its ban list, adding no events.
+        Returns the (user_id, ban) of the events added.
+        """
+        banned = set(banned_ids)
+        # Separate connection, so that this can run in a thread while deliveries continue
+        connection = self._connect()
+        try:
+            with self._write_lock, connection:
+                has_snapshot = connection.execute(
+                    "SELECT 1 FROM snapshots WHERE source_id = ?", (source_id,)
+                ).fetchone()
+                known = {
+                    user_id
+                    for (user_id,) in connection.execute(
+                        "SELECT user_id FROM known_bans WHERE source_id = ?",
+                        (source_id,),
+                    )
+                }
+                recent = {
+                    user_id
+                    for (user_id,) in connection.execute(
+                        "SELECT user_id FROM events WHERE source_id = ? AND seq > ?",
+                        (source_id, since_seq),
+                    )
+                }
+                changes = [
+                    (user_id, True) for user_id in sorted(banned - known - recent)
+                ] + [(user_id, False) for user_id in sorted(known - banned - recent)]
+                if has_snapshot:
+                    for user_id, ban in changes:
+                        self._append(connection, source_id, user_id, ban=ban)
+                else:
+                    connection.executemany(
+                        "INSERT OR IGNORE INTO known_bans (source_id, user_id) VALUES (?, ?)",
+                        [(source_id, user_id) for user_id, ban in changes if ban],
+                    )
+                    connection.executemany(
+                        "DELETE FROM known_bans WHERE source_id = ? AND user_id = ?",
+                        [(source_id, user_id) for user_id, ban in changes if not ban],
+                    )
+                    changes = []
+                connection.execute(
+                    "INSERT OR REPLACE INTO snapshots (source_id, taken) VALUES (?, ?)",
+                    (source_id, time.time()),
+                )
+        finally:
+            connection.close()
+        return changes
+
+    #
+    # Compaction
+    #
+
+    def compact(self, max_age: float) -> int:
+        """Remove events that are no longer needed, returning how many were removed.
+
+        This is any event that has been delivered to every destination, has been superseded by
+        a newer event for the same user, or is older than `max_age` seconds.
+        Ban lists of sources that no destination is pulling from anymore are also forgotten.
+        """
+        with self._write_lock, self._connection:
+            removed = self._connection.execute(
+                "DELETE FROM events WHERE seq <= COALESCE("
+                "(SELECT MIN(cursors.seq) FROM cursors "
+                "WHERE cursors.source_id = events.source_id), seq) "
+                "OR created < ? OR EXISTS (SELECT 1 FROM events AS later "
+                "WHERE later.source_id = events.source_id "
+                "AND later.user_id = events.user_id AND later.seq > events.seq)",
+                (time.time() - max_age,),
+            ).rowcount
+            for table in ("known_bans", "snapshots"):
+                self._connection.execute(
+                    f"DELETE FROM {table} WHERE source_id NOT IN "  # noqa: S608
+                    "(SELECT source_id FROM cursors)"
+                )
+        return removed
@@ -0,0 +1,149 @@
+"""Unit tests for ban_journal."""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import ban_journal
+
+
+class JournalTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        """Create an empty journal in a temporary folder."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.journal = ban_journal.BanJournal(
+            Path(self.temp_dir.name) / "journal.sqlite3"
+        )
+
+    def tearDown(self) -> None:
+        """Clean up the journal."""
+        self.journal.close()
+        self.temp_dir.cleanup()
+
+
+class Delivery(JournalTestCase):
+    def test_only_new_events_pending(self):
+        self.journal.append(1, 100, ban=True)
+        self.journal.subscribe(1, 2)
+        seq = self.journal.append(1, 200, ban=True)
+        expected = [(seq, 200, True)]
+        assert expected == self.journal.pending(1, 2)
+        expected = [(1, 2)]
+        assert expected == self.journal.pending_deliveries()
+
+    def test_advance(self):
+        self.journal.subscribe(1, 2)
+        first = self.journal.append(1, 100, ban=True)
+        second = self.journal.append(1, 100, ban=False)
+        self.journal.advance(1, 2, first)
+        expected = [(second, 100, False)]
+        assert expected == self.journal.pending(1, 2)
+        self.journal.advance(1, 2, second)
+        assert self.journal.pending(1, 2) == []
+        assert self.journal.pending_deliveries() == []
+
+    def test_other_sources_not_pending(self):
+        self.journal.subscribe(1, 2)
+        self.journal.append(3, 100, ban=True)
+        assert self.journal.pending(1, 2) == []
+
+    def test_unsubscribe(self):
+        self.journal.subscribe(1, 2)
+        self.journal.append(1, 100, ban=True)
+        self.journal.unsubscribe(1, 2)
+        assert self.journal.pending_deliveries() == []
+
+    def test_persisted(self):
+        self.journal.subscribe(1, 2)
+        self.journal.append(1, 100, ban=True)
+        reopened = ban_journal.BanJournal(self.journal.path)
+        try:
+            expected = 1
+            assert expected == len(reopened.pending(1, 2))
+        finally:
+            reopened.close()
+
+    def test_forget_user(self):
+        self.journal.subscribe(1, 2)
+        self.journal.reconcile(1, [], self.journal.head)
+        self.journal.append(1, 100, ban=True)
+        seq = self.journal.append(1, 200, ban=True)
+        self.journal.forget_user(100)
+        expected = [(seq, 200, True)]
+        assert expected == self.journal.pending(1, 2)
+        # Their ban is forgotten too, so it isn't seen as a missed ban (or unban)
+        assert self.journal.reconcile(1, [200], self.journal.head) == []
+
+
+class Reconciliation(JournalTestCase):
+    def test_first_reconcile_adds_no_events(self):
+        self.journal.subscribe(1, 2)
+        changes = self.journal.reconcile(1, [100, 200], self.journal.head)
+        assert changes == []
+        assert len(self.journal) == 0
+
+    def test_finds_missed_bans_and_unbans(self):
+        self.journal.subscribe(1, 2)
+        self.journal.reconcile(1, [100, 200], self.journal.head)
+        changes = self.journal.reconcile(1, [200, 300], self.journal.head)
+        expected = [(300, True), (100, False)]
+        assert expected == changes
+        expected = [(300, True), (100, False)]
+        assert expected == [
+            (user_id, ban) for _, user_id, ban in self.journal.pending(1, 2)
+        ]
+
+    def test_tracks_live_events(self):
+        self.journal.subscribe(1, 2)
+        self.journal.reconcile(1, [], self.journal.head)
+        self.journal.append(1, 100, ban=True)
+        assert self.journal.reconcile(1, [100], self.journal.head) == []
+
+    def test_ignores_events_newer_than_fetch(self):
+        self.journal.subscribe(1, 2)
+        self.journal.reconcile(1, [], self.journal.head)
+        head = self.journal.head
+        # Banned while the ban list was being fetched, so it isn't in the fetched list
+        self.journal.append(1, 100, ban=True)
+        assert self.journal.reconcile(1, [], head) == []
+
+
+class Compaction(JournalTestCase):
+    def test_removes_delivered(self):
+        self.journal.subscribe(1, 2)
+        self.journal.subscribe(1, 3)
+        seq = self.journal.append(1, 100, ban=True)
+        self.journal.advance(1, 2, seq)
+        assert self.journal.compact(3600) == 0
+        self.journal.advance(1, 3, seq)
+        expected = 1
+        assert expected == self.journal.compact(3600)
+        assert len(self.journal) == 0
+
+    def test_removes_superseded(self):
+        self.journal.subscribe(1, 2)
+        self.journal.append(1, 100, ban=True)
+        seq = self.journal.append(1, 100, ban=False)
+        expected = 1
+        assert expected == self.journal.compact(3600)
+        expected = [(seq, 100, False)]
+        assert expected == self.journal.pending(1, 2)
+
+    def test_removes_old(self):
+        self.journal.subscribe(1, 2)
+        self.journal.append(1, 100, ban=True)
+        expected = 1
+        assert expected == self.journal.compact(-1)
+
+    def test_removes_unsubscribed_sources(self):
+        self.journal.append(1, 100, ban=True)
+        self.journal.reconcile(1, [100], self.journal.head)
+        self.journal.compact(3600)
+        assert len(self.journal) == 0
+        # No snapshot anymore, so this just records the ban list again
+        assert self.journal.reconcile(1, [], self.journal.head) == []
+
+
+# Run unit tests from command line
+if __name__ == "__main__":
+    unittest.main()
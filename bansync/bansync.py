@@ -1,12 +1,16 @@
 """BanSync cog for Red-DiscordBot by PhasecoreX."""
 
 import asyncio
+import logging
+import time
 from contextlib import suppress
 from typing import ClassVar
 
+import aiohttp
 import discord
 from redbot.core import Config, checks, commands
 from redbot.core.bot import Red
+from redbot.core.data_manager import cog_data_path
 from redbot.core.utils.chat_formatting import (
     bold,
     error,
@@ -17,8 +21,37 @@ from redbot.core.utils.chat_formatting import (
 )
 from redbot.core.utils.predicates import MessagePredicate
 
+from .ban_cache import BanCache
+from .ban_journal import BanJournal
 from .pcx_lib import SettingDisplay
 
+log = logging.getLogger("red.pcxcogs.bansync")
+
+# Bans are propagated to at most this many destination servers at once...
+PROPAGATION_WORKERS = 25
+# ...and at most this many requests at once per destination server
+PROPAGATION_WORKERS_PER_GUILD = 2
+# Ban counts are written to Config in batches, at most this often
+BAN_COUNT_FLUSH_SECONDS = 10.0
+# Recent (un)bans are remembered for this long to prevent ban loops...
+BAN_CACHE_TTL_SECONDS = 3600
+# ...up to this many (un)bans by default
+BAN_CACHE_DEFAULT_SIZE = 100000
+# Ban imports read (and save their progress) in chunks of this many bans
+IMPORT_CHUNK_SIZE = 1000
+# Discord's bulk ban endpoint accepts at most this many users per request
+IMPORT_BULK_BAN_SIZE = 200
+# Ban imports wait this long between each ban request
+IMPORT_REQUEST_INTERVAL_SECONDS = 1.0
+# Ban import progress messages are updated at most this often
+IMPORT_PROGRESS_SECONDS = 15.0
+# Undelivered (un)bans are retried (and the journal compacted) this often
+JOURNAL_RETRY_SECONDS = 60
+# (Un)bans that still can't be delivered after this long are given up on
+JOURNAL_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+# (Un)bans are read from the journal for delivery in batches of this many
+JOURNAL_BATCH_SIZE = 100
+
 
 class BanSync(commands.Cog):
     """Automatically sync bans across servers.
@@ -28,12 +61,18 @@ class BanSync(commands.Cog):
     """
 
     __author__ = "PhasecoreX"
-    __version__ = "1.0.0"
+    __version__ = "1.5.0"
 
-    default_guild_settings: ClassVar[dict[str, str | list[int] | dict[str, int]]] = {
+    default_global_settings: ClassVar[dict[str, int]] = {
+        "ban_cache_size": BAN_CACHE_DEFAULT_SIZE,
+    }
+    default_guild_settings: ClassVar[
+        dict[str, str | list[int] | dict[str, int] | None]
+    ] = {
         "cached_guild_name": "Unknown Server Name",
         "ban_sources": [],
         "ban_count": {},
+        "ban_import": None,
     }
 
     def __init__(self, bot: Red) -> None:
@@ -43,21 +82,57 @@ class BanSync(commands.Cog):
         self.config = Config.get_conf(
             self, identifier=1224364860, force_registration=True
         )
+        self.config.register_global(**self.default_global_settings)
         self.config.register_guild(**self.default_guild_settings)
-        self.ban_cache = {}
+        # Recent (un)bans in each guild, so that we don't propagate them back and forth
+        self.ban_cache = BanCache(BAN_CACHE_DEFAULT_SIZE, BAN_CACHE_TTL_SECONDS)
+        # Reverse of each guilds ban_sources: source guild ID -> destination guild IDs
+        self.subscribers: dict[int, set[int]] = {}
+        self.propagation_workers = asyncio.Semaphore(PROPAGATION_WORKERS)
+        self.guild_workers: dict[int, asyncio.Semaphore] = {}
+        # Ban counts not yet written to Config: destination guild ID -> source guild ID -> count
+        self.pending_ban_counts: dict[int, dict[int, int]] = {}
+        self.ban_count_flush_task: asyncio.Task | None = None
+        self.background_tasks: set[asyncio.Task] = set()
+        self.import_tasks: dict[int, asyncio.Task] = {}
+        self.journal: BanJournal | None = None
+        self.journal_task: asyncio.Task | None = None
+        # Journal writes happen in a thread, one at a time so that (un)bans stay in order
+        self.journal_write_lock = asyncio.Lock()
+        # Only one delivery at a time per (source guild ID, destination guild ID), to keep (un)bans in order
+        self.delivery_locks: dict[tuple[int, int], asyncio.Lock] = {}
+        # Last known names of guilds taking part in ban syncing, mirrored to Config
+        self.guild_names: dict[int, str] = {}
 
     #
     # Red methods
     #
 
+    def cog_unload(self) -> None:
+        """Clean up when cog shuts down."""
+        if self.ban_count_flush_task:
+            self.ban_count_flush_task.cancel()
+        for task in self.import_tasks.values():
+            task.cancel()
+        if self.journal_task:
+            self.journal_task.cancel()
+        if self.journal is not None:
+            self.journal.close()
+        if self.pending_ban_counts:
+            task = asyncio.create_task(self._flush_ban_counts())
+            self.background_tasks.add(task)
+            task.add_done_callback(self.background_tasks.discard)
+
     def format_help_for_context(self, ctx: commands.Context) -> str:
         """Show version in help."""
         pre_processed = super().format_help_for_context(ctx)
         return f"{pre_processed}\n\nCog Version: {self.__version__}"
 
-    async def red_delete_data_for_user(self, *, _requester: str, _user_id: int) -> None:
-        """Nothing to delete."""
-        return
+    async def red_delete_data_for_user(self, *, _requester: str, user_id: int) -> None:
+        """Forget any of the user's (un)bans in the ban journal."""
+        if self.journal is not None:
+            async with self.journal_write_lock:
+                await asyncio.to_thread(self.journal.forget_user, user_id)
 
     #
     # Initialization methods
@@ -66,11 +141,90 @@ class BanSync(commands.Cog):
     async def initialize(self) -> None:
         """Perform setup actions before loading cog."""
         await self._migrate_config()
+        self.ban_cache.resize(await self.config.ban_cache_size())
+        self.journal = await asyncio.to_thread(
+            BanJournal, cog_data_path(self) / "ban_journal.sqlite3"
+        )
+        await self._build_subscriber_index()
+        await self._load_guild_names()
+        self.journal_task = asyncio.create_task(self._journal_loop())
+        self.journal_task.add_done_callback(self._error_handler)
+        task = asyncio.create_task(self._resume_imports())
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
 
     async def _migrate_config(self) -> None:
         """Perform some configuration migrations."""
         # schema_version = await self.config.schema_version()
 
+    async def _build_subscriber_index(self) -> None:
+        """Build the index of which guilds are pulling bans from each guild."""
+        self.subscribers = {}
+        all_guild_dict = await self.config.all_guilds()
+        for dest_guild_id, dest_guild_settings in all_guild_dict.items():
+            for source_guild_id in dest_guild_settings.get("ban_sources", []):
+                self.subscribers.setdefault(source_guild_id, set()).add(dest_guild_id)
+                if self.journal is not None:
+                    await asyncio.to_thread(
+                        self.journal.subscribe, source_guild_id, dest_guild_id
+                    )
+
+    async def _load_guild_names(self) -> None:
+        """Load the last known names of guilds taking part in ban syncing."""
+        default_name = self.default_guild_settings["cached_guild_name"]
+        self.guild_names = {
+            guild_id: guild_settings.get("cached_guild_name", default_name)
+            for guild_id, guild_settings in (await self.config.all_guilds()).items()
+        }
+
+    def _error_handler(self, fut: asyncio.Future) -> None:
+        """Log any unexpected exceptions from the journal task."""
+        try:
+            fut.result()
+        except asyncio.CancelledError:
+            pass
+        except Exception as exc:
+            log.exception(
+                "Unexpected exception occurred in BanSync journal task: ",
+                exc_info=exc,
+            )
+
+    #
+    # Command methods: bansyncglobal
+    #
+
+    @commands.group()
+    @checks.is_owner()
+    async def bansyncglobal(self, ctx: commands.Context) -> None:
+        """Configure BanSync for the whole bot."""
+
+    @bansyncglobal.group(name="cache")
+    async def global_cache(self, ctx: commands.Context) -> None:
+        """Manage the loop prevention cache."""
+
+    @global_cache.command(name="stats")
+    async def global_cache_stats(self, ctx: commands.Context) -> None:
+        """Display loop prevention cache statistics."""
+        cache_section = SettingDisplay("Loop Prevention Cache")
+        cache_section.add("Entries", f"{len(self.ban_cache)}/{self.ban_cache.max_size}")
+        cache_section.add("Remembered for", f"{BAN_CACHE_TTL_SECONDS} seconds")
+        cache_section.add("Loops prevented", self.ban_cache.loops_prevented)
+        cache_section.add("Expired", self.ban_cache.expirations)
+        cache_section.add("Evicted", self.ban_cache.evictions)
+        await ctx.send(cache_section.display())
+
+    @global_cache.command(name="size")
+    async def global_cache_size(self, ctx: commands.Context, size: int) -> None:
+        """Set how many recent (un)bans are remembered to prevent ban loops."""
+        if size < 1:
+            await ctx.send(error("The cache size must be at least 1."))
+            return
+        await self.config.ban_cache_size.set(size)
+        self.ban_cache.resize(size)
+        await ctx.send(
+            success(f"The loop prevention cache will now hold {size} (un)bans.")
+        )
+
     #
     # Command methods: bansync
     #
@@ -86,6 +240,7 @@ class BanSync(commands.Cog):
         """Display current settings."""
         if not ctx.guild:
             return
+        await self._flush_ban_counts()
         info_text = ""
 
         if not ctx.guild.me.guild_permissions.ban_members:
@@ -105,10 +260,6 @@ class BanSync(commands.Cog):
 
             guild_ban_source = self.bot.get_guild(source_guild_id)
             if guild_ban_source:
-                # Update their cached guild name
-                await self.config.guild_from_id(source_guild_id).cached_guild_name.set(
-                    guild_ban_source.name
-                )
                 # Check if they are pulling from us (sync) or not (pull)
                 if (
                     ctx.guild.id
@@ -119,7 +270,7 @@ class BanSync(commands.Cog):
                     pull_servers.add(guild_ban_source.name, ban_count_info)
             else:
                 unknown_servers.append(
-                    f'`{source_guild_id}` - Last known as "{await self.config.guild_from_id(source_guild_id).cached_guild_name()}", {ban_count_info}'
+                    f'`{source_guild_id}` - Last known as "{self._get_guild_name(source_guild_id)}", {ban_count_info}'
                 )
 
         if not sync_servers and not pull_servers:
@@ -198,11 +349,6 @@ class BanSync(commands.Cog):
             return
         ban_sources = await self.config.guild(ctx.guild).ban_sources()
         if server.id in ban_sources:
-            # Update our and their cached guild name
-            await self.config.guild(ctx.guild).cached_guild_name.set(ctx.guild.name)
-            await self.config.guild_from_id(server.id).cached_guild_name.set(
-                server.name
-            )
             await ctx.send(
                 success(
                     f"We are already pulling bans from {server.name} into this server."
@@ -226,12 +372,15 @@ class BanSync(commands.Cog):
             await ctx.send(info("Cancelled adding server as a ban source."))
             return
 
-        # Update our and their cached guild name
-        await self.config.guild(ctx.guild).cached_guild_name.set(ctx.guild.name)
-        await self.config.guild_from_id(server.id).cached_guild_name.set(server.name)
+        # Start keeping track of our and their guild name
+        await self._update_guild_name(ctx.guild, track=True)
+        await self._update_guild_name(server, track=True)
         # Add their server to our pull list and save
         ban_sources.append(server.id)
         await self.config.guild(ctx.guild).ban_sources.set(ban_sources)
+        self.subscribers.setdefault(server.id, set()).add(ctx.guild.id)
+        if self.journal is not None:
+            await asyncio.to_thread(self.journal.subscribe, server.id, ctx.guild.id)
         await ctx.send(
             success(
                 f'New bans from "{server.name}" will now be pulled into this server.'
@@ -254,10 +403,9 @@ class BanSync(commands.Cog):
         elif server not in ban_sources:
             # Given arg was the name of a guild (str), or an ID not in the ban source list (int)
             # (could be a guild with a name of just numbers?)
-            all_guild_dict = await self.config.all_guilds()
-            for dest_guild_id, dest_guild_settings in all_guild_dict.items():
-                if dest_guild_settings.get("cached_guild_name") == str(server):
-                    server_id = int(dest_guild_id)
+            for guild_id, guild_name in self.guild_names.items():
+                if guild_name == str(server):
+                    server_id = guild_id
                     break
         elif isinstance(server, int):
             # If not a guild or a string above, it should be an int
@@ -268,6 +416,11 @@ class BanSync(commands.Cog):
         elif server_id in ban_sources:
             ban_sources.remove(server_id)
             await self.config.guild(ctx.guild).ban_sources.set(ban_sources)
+            self.subscribers.get(server_id, set()).discard(ctx.guild.id)
+            if self.journal is not None:
+                await asyncio.to_thread(
+                    self.journal.unsubscribe, server_id, ctx.guild.id
+                )
             await ctx.send(success("Bans will no longer be pulled from that server."))
         else:
             await ctx.send(
@@ -276,6 +429,257 @@ class BanSync(commands.Cog):
                 )
             )
 
+    @bansync.group(name="import", invoke_without_command=True)
+    async def bansync_import(
+        self, ctx: commands.Context, *, server: discord.Guild | str
+    ) -> None:
+        """Import all existing bans from a server that we are pulling bans from.
+
+        Enabling a server only pulls in new bans. This will also ban everyone that was already banned there.
+        The import runs in the background, posting its progress to this channel.
+        If the bot restarts, the import will continue where it left off.
+        """
+        if not ctx.guild:
+            return
+        if ctx.guild.id in self.import_tasks:
+            await ctx.send(
+                info(
+                    "A ban import is already running in this server. "
+                    "Check on it with `[p]bansync import status`, "
+                    "or stop it with `[p]bansync import cancel`."
+                )
+            )
+            return
+        if not ctx.guild.me.guild_permissions.ban_members:
+            await ctx.send(
+                error(
+                    "I do not have the Ban Members permission in this server! Importing bans from other servers into this one will not work!"
+                )
+            )
+            return
+        if isinstance(server, str):
+            await ctx.send(
+                error(
+                    "I could not find that server. I can only import bans from other servers that I am in."
+                )
+            )
+            return
+        if server.id not in await self.config.guild(ctx.guild).ban_sources():
+            await ctx.send(
+                error(
+                    f'We are not pulling bans from "{server.name}". Use `[p]bansync enable` to start pulling bans from it first.'
+                )
+            )
+            return
+        if not server.me.guild_permissions.ban_members:
+            await ctx.send(
+                error(
+                    f'I do not have the Ban Members permission in "{server.name}", so I cannot see their bans.'
+                )
+            )
+            return
+
+        # You really want to do this?
+        pred = MessagePredicate.yes_or_no(ctx)
+        await ctx.send(
+            question(
+                f'Are you **sure** you want to ban everyone that is banned in the server "{server.name}" from this server? (yes/no)'
+            )
+        )
+        with suppress(asyncio.TimeoutError):
+            await ctx.bot.wait_for("message", check=pred, timeout=30)
+        if not pred.result:
+            await ctx.send(info("Cancelled importing bans."))
+            return
+
+        await self.config.guild(ctx.guild).ban_import.set(
+            {
+                "source": server.id,
+                "channel": ctx.channel.id,
+                "cursor": 0,
+                "checked": 0,
+                "imported": 0,
+                "skipped": 0,
+                "failed": 0,
+            }
+        )
+        self._start_import(ctx.guild)
+        await ctx.send(
+            success(
+                f'Started importing bans from "{server.name}". Progress will be posted here.'
+            )
+        )
+
+    @bansync_import.command(name="status")
+    async def bansync_import_status(self, ctx: commands.Context) -> None:
+        """Show the progress of the ban import in this server."""
+        if not ctx.guild:
+            return
+        state = await self.config.guild(ctx.guild).ban_import()
+        if not state:
+            await ctx.send(info("There is no ban import running in this server."))
+            return
+        await ctx.send(info(self._import_progress(state)))
+
+    @bansync_import.command(name="cancel")
+    async def bansync_import_cancel(self, ctx: commands.Context) -> None:
+        """Stop the ban import in this server."""
+        if not ctx.guild:
+            return
+        state = await self.config.guild(ctx.guild).ban_import()
+        task = self.import_tasks.pop(ctx.guild.id, None)
+        if task:
+            task.cancel()
+        if not state and not task:
+            await ctx.send(info("There is no ban import running in this server."))
+            return
+        await self.config.guild(ctx.guild).ban_import.clear()
+        await ctx.send(success("The ban import has been cancelled."))
+
+    #
+    # Ban import methods
+    #
+
+    async def _resume_imports(self) -> None:
+        """Resume any ban imports that were running when the cog was unloaded."""
+        await self.bot.wait_until_ready()
+        for guild_id, guild_info in (await self.config.all_guilds()).items():
+            guild = self.bot.get_guild(guild_id)
+            if guild and guild_info.get("ban_import"):
+                log.debug("Resuming ban import in guild=%d", guild_id)
+                self._start_import(guild)
+
+    def _start_import(self, dest_guild: discord.Guild) -> None:
+        """Start the background task that imports bans into a guild."""
+
+        def done_callback(fut: asyncio.Future) -> None:
+            if self.import_tasks.get(dest_guild.id) is fut:
+                del self.import_tasks[dest_guild.id]
+            try:
+                fut.result()
+            except asyncio.CancelledError:
+                pass
+            except Exception as exc:
+                log.exception(
+                    "Unexpected exception occurred while importing bans with BanSync: ",
+                    exc_info=exc,
+                )
+
+        task = asyncio.create_task(self._import_bans(dest_guild))
+        self.import_tasks[dest_guild.id] = task
+        task.add_done_callback(done_callback)
+
+    async def _import_bans(self, dest_guild: discord.Guild) -> None:
+        """Ban everyone banned in a source guild, saving progress so that it can be resumed."""
+        state = await self.config.guild(dest_guild).ban_import()
+        if not state:
+            return
+        source_guild = self.bot.get_guild(state["source"])
+        channel = dest_guild.get_channel_or_thread(state["channel"])
+        if (
+            not source_guild
+            or not source_guild.me.guild_permissions.ban_members
+            or not dest_guild.me.guild_permissions.ban_members
+            or not isinstance(channel, discord.abc.Messageable)
+        ):
+            await self.config.guild(dest_guild).ban_import.clear()
+            return
+
+        # Only ban users that aren't already banned here
+        already_banned = {entry.user.id async for entry in dest_guild.bans(limit=None)}
+        progress_message = await channel.send(self._import_progress(state))
+        last_progress = time.monotonic()
+        # Bans are listed in user ID order, so the last checked ID is all that's needed to resume
+        chunk = []
+        async for entry in source_guild.bans(
+            limit=None, after=discord.Object(id=state["cursor"])
+        ):
+            chunk.append(entry.user)
+            if len(chunk) < IMPORT_CHUNK_SIZE:
+                continue
+            await self._import_ban_chunk(
+                source_guild, dest_guild, chunk, already_banned, state
+            )
+            chunk = []
+            if time.monotonic() - last_progress >= IMPORT_PROGRESS_SECONDS:
+                last_progress = time.monotonic()
+                with suppress(discord.HTTPException):
+                    await progress_message.edit(content=self._import_progress(state))
+        if chunk:
+            await self._import_ban_chunk(
+                source_guild, dest_guild, chunk, already_banned, state
+            )
+        await self.config.guild(dest_guild).ban_import.clear()
+        with suppress(discord.HTTPException):
+            await progress_message.edit(
+                content=self._import_progress(state, finished=True)
+            )
+
+    async def _import_ban_chunk(
+        self,
+        source_guild: discord.Guild,
+        dest_guild: discord.Guild,
+        users: list[discord.User],
+        already_banned: set[int],
+        state: dict,
+    ) -> None:
+        """Ban a chunk of users that are banned in the source guild, then save progress."""
+        missing = [user for user in users if user.id not in already_banned]
+        for user in missing:
+            # They're already banned in the source, don't propagate the ban back to it
+            self.ban_cache.record(source_guild.id, user.id, ban=True)
+        reason = f'BanSync import from server "{source_guild.name}"'
+        # Bulk banning needs Manage Server as well
+        use_bulk_ban = (
+            hasattr(dest_guild, "bulk_ban")
+            and dest_guild.me.guild_permissions.manage_guild
+        )
+        batch_size = IMPORT_BULK_BAN_SIZE if use_bulk_ban else 1
+        for index in range(0, len(missing), batch_size):
+            batch = missing[index : index + batch_size]
+            banned_ids = []
+            try:
+                if use_bulk_ban:
+                    result = await dest_guild.bulk_ban(
+                        batch, reason=reason, delete_message_seconds=0
+                    )
+                    banned_ids = [user.id for user in result.banned]
+                else:
+                    await dest_guild.ban(
+                        batch[0], reason=reason, delete_message_seconds=0
+                    )
+                    banned_ids = [batch[0].id]
+            except discord.HTTPException as exc:
+                log.debug(
+                    "Failed to import %d bans into guild=%d: %s",
+                    len(batch),
+                    dest_guild.id,
+                    exc,
+                )
+            for user_id in banned_ids:
+                already_banned.add(user_id)
+                self._count_ban(dest_guild.id, source_guild.id)
+            state["imported"] += len(banned_ids)
+            state["failed"] += len(batch) - len(banned_ids)
+            await asyncio.sleep(IMPORT_REQUEST_INTERVAL_SECONDS)
+        state["cursor"] = users[-1].id
+        state["checked"] += len(users)
+        state["skipped"] += len(users) - len(missing)
+        await self.config.guild(dest_guild).ban_import.set(state)
+
+    @staticmethod
+    def _import_progress(state: dict[str, int], *, finished: bool = False) -> str:
+        """Describe the progress of a ban import."""
+        message = (
+            f"**Ban import {'finished' if finished else 'in progress'}:** "
+            f"{state['checked']} bans checked\n"
+            f"Imported: {state['imported']}, already banned: {state['skipped']}, "
+            f"failed: {state['failed']}"
+        )
+        if not finished:
+            message += "\nUse `[p]bansync import cancel` to stop importing."
+        return message
+
     #
     # Listener methods
     #
@@ -294,10 +698,50 @@ class BanSync(commands.Cog):
         """When a user is unbanned, propogate that ban to other servers that are subscribed."""
         await self._handle_ban_unban(source_guild, user, ban=False)
 
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild) -> None:
+        """Update the cached name of a guild we (re)joined."""
+        await self._update_guild_name(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_available(self, guild: discord.Guild) -> None:
+        """Update the cached name of a guild, in case it was renamed while we were offline."""
+        await self._update_guild_name(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_update(
+        self, _before: discord.Guild, after: discord.Guild
+    ) -> None:
+        """Update the cached name of a renamed guild."""
+        await self._update_guild_name(after)
+
     #
     # Private methods
     #
 
+    def _get_guild_name(self, guild_id: int) -> str:
+        """Get the current name of a guild, or the last known name if we aren't in it anymore."""
+        guild = self.bot.get_guild(guild_id)
+        if guild:
+            return guild.name
+        return self.guild_names.get(
+            guild_id, self.default_guild_settings["cached_guild_name"]
+        )
+
+    async def _update_guild_name(
+        self, guild: discord.Guild, *, track: bool = False
+    ) -> None:
+        """Update the cached name of a guild, only writing to Config if it changed.
+
+        Only guilds taking part in ban syncing are tracked, unless `track` is True.
+        """
+        if guild.id not in self.guild_names and not track:
+            return
+        if self.guild_names.get(guild.id) == guild.name:
+            return
+        self.guild_names[guild.id] = guild.name
+        await self.config.guild(guild).cached_guild_name.set(guild.name)
+
     async def _handle_ban_unban(
         self,
         source_guild: discord.Guild,
@@ -305,45 +749,191 @@ class BanSync(commands.Cog):
         *,
         ban: bool,
     ) -> None:
-        if source_guild.id not in self.ban_cache:
-            self.ban_cache[source_guild.id] = {}
-        self.ban_cache[source_guild.id][user.id] = ban
+        self.ban_cache.record(source_guild.id, user.id, ban=ban)
 
-        # Update our cached guild name
-        await self.config.guild(source_guild).cached_guild_name.set(source_guild.name)
+        dest_guild_ids = self.subscribers.get(source_guild.id, set()) - {
+            source_guild.id  # Skip self
+        }
+        if self.journal is None or not dest_guild_ids:
+            return
+        async with self.journal_write_lock:
+            await asyncio.to_thread(
+                self.journal.append, source_guild.id, user.id, ban=ban
+            )
+        # Deliver to all subscribed guilds at once
+        await asyncio.gather(
+            *(
+                self._deliver(source_guild.id, dest_guild_id)
+                for dest_guild_id in dest_guild_ids
+            )
+        )
 
-        all_guild_dict = await self.config.all_guilds()
-        for dest_guild_id, dest_guild_settings in all_guild_dict.items():
-            if dest_guild_id == source_guild.id:
-                continue  # Skip self
-            if source_guild.id in dest_guild_settings.get("ban_sources", []):
-                dest_guild = self.bot.get_guild(dest_guild_id)
-                if not dest_guild or dest_guild.unavailable:
-                    continue
-                if not dest_guild.me.guild_permissions.ban_members:
-                    continue
-                if (
-                    dest_guild.id in self.ban_cache
-                    and user.id in self.ban_cache[dest_guild.id]
-                    and self.ban_cache[dest_guild.id][user.id] == ban
-                ):
-                    continue  # We already (un)banned them, prevent loop
-                with suppress(
-                    discord.NotFound,
-                    discord.Forbidden,
-                    discord.HTTPException,
-                ):
-                    reason = f'BanSync from server "{source_guild.name}"'
-                    if ban:
-                        await dest_guild.ban(user, reason=reason)
-                        async with self.config.guild(
-                            dest_guild
-                        ).ban_count() as ban_count:
-                            if source_guild.id not in ban_count:
-                                ban_count[source_guild.id] = 0
-                            ban_count[source_guild.id] += 1
-                    else:
-                        await dest_guild.unban(user, reason=reason)
+    async def _deliver(self, source_guild_id: int, dest_guild_id: int) -> None:
+        """Deliver all pending (un)bans from a source guild to a destination guild, in order.
+
+        Stops at the first (un)ban that fails in a way that might work later, to be retried by the journal task.
+        """
+        if self.journal is None:
+            return
+        lock = self.delivery_locks.setdefault(
+            (source_guild_id, dest_guild_id), asyncio.Lock()
+        )
+        async with lock:
+            source_name = self._get_guild_name(source_guild_id)
+            while pending := self.journal.pending(
+                source_guild_id, dest_guild_id, JOURNAL_BATCH_SIZE
+            ):
+                delivered_seq = None
+                for seq, user_id, ban in pending:
+                    if not await self._propagate_ban_unban(
+                        source_guild_id, source_name, dest_guild_id, user_id, ban=ban
+                    ):
+                        break
+                    delivered_seq = seq
+                if delivered_seq is not None:
+                    await asyncio.to_thread(
+                        self.journal.advance,
+                        source_guild_id,
+                        dest_guild_id,
+                        delivered_seq,
+                    )
+                if delivered_seq != pending[-1][0]:
+                    return
+
+    async def _propagate_ban_unban(
+        self,
+        source_guild_id: int,
+        source_name: str,
+        dest_guild_id: int,
+        user_id: int,
+        *,
+        ban: bool,
+    ) -> bool:
+        """(Un)ban a user in a single destination guild.
+
+        Returns False if this should be retried later.
+        """
+        dest_guild = self.bot.get_guild(dest_guild_id)
+        if not dest_guild or dest_guild.unavailable:
+            return False
+        if not dest_guild.me.guild_permissions.ban_members:
+            return False
+        if self.ban_cache.matches(dest_guild.id, user_id, ban=ban):
+            return True  # We already (un)banned them, prevent loop
+        guild_workers = self.guild_workers.setdefault(
+            dest_guild.id, asyncio.Semaphore(PROPAGATION_WORKERS_PER_GUILD)
+        )
+        async with guild_workers, self.propagation_workers:
+            reason = f'BanSync from server "{source_name}"'
+            user = discord.Object(id=user_id)
+            try:
+                if ban:
+                    await dest_guild.ban(user, reason=reason)
+                    self._count_ban(dest_guild.id, source_guild_id)
+                else:
+                    await dest_guild.unban(user, reason=reason)
+            except (discord.NotFound, discord.Forbidden):
+                # Retrying won't help (unknown user, or they outrank us)
+                return True
+            except (discord.HTTPException, aiohttp.ClientError, TimeoutError) as exc:
+                log.debug(
+                    "Failed to %s user=%d in guild=%d, will retry: %s",
+                    "ban" if ban else "unban",
+                    user_id,
+                    dest_guild.id,
+                    exc,
+                )
+                return False
+        return True
+
+    #
+    # Journal methods
+    #
+
+    async def _journal_loop(self) -> None:
+        """Catch up on (un)bans missed while offline, then keep retrying failed deliveries."""
+        await self.bot.wait_until_ready()
+        await self._reconcile_sources()
+        while True:
+            await self._retry_deliveries()
+            removed = await asyncio.to_thread(
+                self.journal.compact, JOURNAL_MAX_AGE_SECONDS
+            )
+            if removed:
+                log.debug("Compacted %d events from the ban journal", removed)
+            await asyncio.sleep(JOURNAL_RETRY_SECONDS)
+
+    async def _reconcile_sources(self) -> None:
+        """Compare each source guild's ban list to the journal, adding any (un)bans that were missed."""
+        for source_guild_id in list(self.subscribers):
+            source_guild = self.bot.get_guild(source_guild_id)
+            if (
+                self.journal is None
+                or not self.subscribers.get(source_guild_id)
+                or not source_guild
+                or not source_guild.me.guild_permissions.ban_members
+            ):
+                continue
+            since_seq = self.journal.head
+            try:
+                banned_ids = [
+                    entry.user.id async for entry in source_guild.bans(limit=None)
+                ]
+            except discord.HTTPException as exc:
+                log.debug(
+                    "Could not fetch bans of guild=%d for reconciliation: %s",
+                    source_guild_id,
+                    exc,
+                )
+                continue
+            changes = await asyncio.to_thread(
+                self.journal.reconcile, source_guild_id, banned_ids, since_seq
+            )
+            if changes:
+                log.debug(
+                    "Found %d missed (un)bans in guild=%d",
+                    len(changes),
+                    source_guild_id,
+                )
+            for user_id, ban in changes:
+                self.ban_cache.record(source_guild_id, user_id, ban=ban)
+
+    async def _retry_deliveries(self) -> None:
+        """Deliver every pending (un)ban in the journal."""
+        if self.journal is None:
+            return
+        await asyncio.gather(
+            *(
+                self._deliver(source_guild_id, dest_guild_id)
+                for source_guild_id, dest_guild_id in self.journal.pending_deliveries()
+            )
+        )
+
+    def _count_ban(self, dest_guild_id: int, source_guild_id: int) -> None:
+        """Count a ban pulled into a guild, to be written to Config in a batch later."""
+        dest_counts = self.pending_ban_counts.setdefault(dest_guild_id, {})
+        dest_counts[source_guild_id] = dest_counts.get(source_guild_id, 0) + 1
+        if not self.ban_count_flush_task or self.ban_count_flush_task.done():
+            self.ban_count_flush_task = asyncio.create_task(
+                self._delayed_flush_ban_counts()
+            )
+
+    async def _delayed_flush_ban_counts(self) -> None:
+        await asyncio.sleep(BAN_COUNT_FLUSH_SECONDS)
+        await self._flush_ban_counts()
+
+    async def _flush_ban_counts(self) -> None:
+        """Write all pending ban counts to Config."""
+        pending_ban_counts = self.pending_ban_counts
+        self.pending_ban_counts = {}
+        for dest_guild_id, dest_counts in pending_ban_counts.items():
+            async with self.config.guild_from_id(
+                dest_guild_id
+            ).ban_count() as ban_count:
+                for source_guild_id, count in dest_counts.items():
+                    # Config stores the keys as strings
+                    key = str(source_guild_id)
+                    ban_count[key] = ban_count.get(key, 0) + count
 
     #
     # Public methods
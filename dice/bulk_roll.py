@@ -0,0 +1,213 @@
+"""Fast rolling of simple dice formulas with lots of dice, using NumPy."""
+
+import operator
+import re
+from collections.abc import Callable
+
+import numpy as np
+
+__author__ = "PhasecoreX"
+
+# NdS, optionally followed by one keep, drop, explode or count modifier
+BULK_FORMULA_RE = re.compile(
+    r"^\s*(\d*)d(\d+)(?:(kh|kl|dh|dl|!(?:[<>]=?)?|c(?:[<>]=?)?)(\d*))?\s*$"
+)
+# Largest die that NumPy can roll (anything bigger is left to pyhedrals)
+MAX_BULK_SIDES = np.iinfo(np.int64).max
+
+
+class BulkRoll:
+    """The result of rolling a simple dice formula in bulk.
+
+    Instead of every die rolled, only how many dice rolled each face is kept.
+    """
+
+    def __init__(
+        self,
+        count: int,
+        sides: int,
+        faces: np.ndarray,
+        rolled: np.ndarray,
+        kept: np.ndarray,
+        *,
+        exploded: np.ndarray | None = None,
+        counting: bool = False,
+    ) -> None:
+        """Store the face counts of a bulk roll."""
+        self.count = count
+        self.sides = sides
+        self.faces = faces
+        self.rolled = rolled
+        self.kept = kept
+        self.exploded = exploded
+        self.counting = counting
+
+    @property
+    def result(self) -> int:
+        """Get the total of the roll (or the number of successes, if counting)."""
+        if self.counting:
+            return int(self.kept.sum())
+        # Python ints, so that huge dice can't overflow
+        return sum(
+            int(face) * int(kept)
+            for face, kept in zip(self.faces, self.kept, strict=True)
+            if kept
+        )
+
+    def summary(self) -> str:
+        """Summarize the roll as how many of each face was rolled.
+
+        Uses the same notation as pyhedrals roll logs: dropped faces are `-N-`,
+        and exploded faces are `*N*`.
+        """
+        parts = []
+        for index, face in enumerate(self.faces):
+            exploded = self.exploded is not None and self.exploded[index]
+            label = f"*{face}*" if exploded else str(face)
+            kept = int(self.kept[index])
+            dropped = int(self.rolled[index]) - kept
+            if kept:
+                parts.append(f"{label}\N{MULTIPLICATION SIGN}{kept}")
+            if dropped:
+                parts.append(f"-{label}-\N{MULTIPLICATION SIGN}{dropped}")
+        return f"{self.count}d{self.sides}: {','.join(parts)} ({self.result})"
+
+
+def _comparison(
+    name: str, op: str, threshold: int, sides: int
+) -> Callable[[np.ndarray, int], np.ndarray]:
+    """Get the comparison of a modifier, validating it the same way pyhedrals does."""
+    if op.endswith("<="):
+        if threshold >= sides:
+            msg = f"{name} threshold '<={threshold}' is invalid with {sides} sided dice"
+            raise ValueError(msg)
+        return operator.le
+    if op.endswith(">="):
+        if threshold <= 1:
+            msg = f"{name} threshold '>={threshold}' is invalid"
+            raise ValueError(msg)
+        return operator.ge
+    if op.endswith("<"):
+        if threshold > sides:
+            msg = f"{name} threshold '<{threshold}' is invalid with {sides} sided dice"
+            raise ValueError(msg)
+        return operator.lt
+    if op.endswith(">"):
+        if threshold < 1:
+            msg = f"{name} threshold '>{threshold}' is invalid"
+            raise ValueError(msg)
+        return operator.gt
+    if not 1 <= threshold <= sides:
+        msg = f"{name} threshold '{threshold}' is invalid with {sides} sided dice"
+        raise ValueError(msg)
+    return operator.eq
+
+
+def _roll_faces(
+    rng: np.random.Generator, count: int, sides: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Roll some dice at once, returning each face rolled and how many times it was rolled."""
+    return np.unique(
+        rng.integers(1, sides, size=count, endpoint=True), return_counts=True
+    )
+
+
+def _merge_faces(
+    faces: np.ndarray,
+    counts: np.ndarray,
+    more_faces: np.ndarray,
+    more_counts: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Add the face counts of two rolls together."""
+    all_faces, inverse = np.unique(
+        np.concatenate((faces, more_faces)), return_inverse=True
+    )
+    all_counts = np.zeros(len(all_faces), dtype=np.int64)
+    np.add.at(all_counts, inverse, np.concatenate((counts, more_counts)))
+    return all_faces, all_counts
+
+
+def roll_bulk(
+    formula: str,
+    *,
+    max_dice: int,
+    max_sides: int,
+    min_dice: int = 0,
+    rng: np.random.Generator | None = None,
+) -> BulkRoll | None:
+    """Roll a simple dice formula (NdS with one keep, drop, explode or count modifier) in bulk.
+
+    Returns None if the formula isn't simple enough (or has fewer than `min_dice` dice),
+    in which case it should be rolled normally.
+    """
+    match = BULK_FORMULA_RE.match(formula)
+    if not match:
+        return None
+    count = int(match.group(1) or 1)
+    sides = int(match.group(2))
+    modifier = match.group(3) or ""
+    amount = int(match.group(4)) if match.group(4) else None
+    if count < min_dice or sides > MAX_BULK_SIDES:
+        return None
+    if count > max_dice:
+        msg = f"attempted to roll more than {max_dice} dice in a single d expression"
+        raise ValueError(msg)
+    if sides > max_sides:
+        msg = f"attempted to roll a die with more than {max_sides} sides"
+        raise ValueError(msg)
+    if sides < 1:
+        msg = "attempted to roll a die with zero sides"
+        raise ValueError(msg)
+    if rng is None:
+        rng = np.random.default_rng()
+
+    faces, rolled = _roll_faces(rng, count, sides)
+
+    if modifier in ("kh", "kl", "dh", "dl"):
+        amount = amount or 1
+        if modifier[0] == "k":
+            if amount > count:
+                msg = f"attempted to keep {amount} dice when only {count} were rolled"
+                raise ValueError(msg)
+            keep = amount
+        else:
+            # Like pyhedrals, dropping more dice than were rolled drops all of them
+            keep = max(count - amount, 0)
+        # Keep dice starting from the highest (or lowest) face, until `keep` dice are kept
+        ordered = rolled[::-1] if modifier in ("kh", "dl") else rolled
+        kept = np.diff(np.minimum(np.cumsum(ordered), keep), prepend=0)
+        if modifier in ("kh", "dl"):
+            kept = kept[::-1]
+        return BulkRoll(count, sides, faces, rolled, kept)
+
+    if modifier.startswith("c"):
+        threshold = amount or sides
+        compare = _comparison("count", modifier, threshold, sides)
+        kept = np.where(compare(faces, threshold), rolled, 0)
+        return BulkRoll(count, sides, faces, rolled, kept, counting=True)
+
+    if modifier.startswith("!"):
+        threshold = amount or sides
+        compare = _comparison("explode", modifier, threshold, sides)
+        if sides == 1 and compare(1, threshold):
+            msg = "exploding every roll of a one sided die would never end"
+            raise ValueError(msg)
+        # Every die that explodes rolls another die, which can explode too
+        exploding = int(rolled[compare(faces, threshold)].sum())
+        while exploding:
+            if rolled.sum() + exploding > max_dice:
+                msg = f"attempted to roll more than {max_dice} dice in a single d expression"
+                raise ValueError(msg)
+            more_faces, more_rolled = _roll_faces(rng, exploding, sides)
+            faces, rolled = _merge_faces(faces, rolled, more_faces, more_rolled)
+            exploding = int(more_rolled[compare(more_faces, threshold)].sum())
+        return BulkRoll(
+            count,
+            sides,
+            faces,
+            rolled,
+            rolled,
+            exploded=compare(faces, threshold),
+        )
+
+    return BulkRoll(count, sides, faces, rolled, rolled)
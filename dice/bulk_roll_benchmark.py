@@ -0,0 +1,51 @@
+"""Benchmark bulk rolling against pyhedrals, for simple formulas with lots of dice.
+
+Run from the command line: python bulk_roll_benchmark.py
+"""
+
+import timeit
+
+import bulk_roll
+import numpy as np
+import pyhedrals
+
+FORMULAS = ("{}d6", "{}d20kh10", "{}d6!", "{}d10c>=8")
+DICE_COUNTS = (100, 1000, 10000)
+MAX_DICE = 1000000
+MAX_SIDES = 10000
+
+
+def benchmark(formula: str) -> tuple[float, float]:
+    """Time one roll of a formula with pyhedrals and in bulk, in seconds (best of a few)."""
+    roller = pyhedrals.DiceRoller(maxDice=MAX_DICE, maxSides=MAX_SIDES)
+    rng = np.random.default_rng()
+    pyhedrals_time = min(
+        timeit.repeat(lambda: list(roller.parse(formula).strings()), number=1, repeat=3)
+    )
+    bulk_time = min(
+        timeit.repeat(
+            lambda: bulk_roll.roll_bulk(
+                formula, max_dice=MAX_DICE, max_sides=MAX_SIDES, rng=rng
+            ).summary(),
+            number=1,
+            repeat=3,
+        )
+    )
+    return pyhedrals_time, bulk_time
+
+
+def main() -> None:
+    """Print how long each formula takes to roll."""
+    print(f"{'Formula':<16}{'pyhedrals':>12}{'bulk':>12}{'speedup':>10}")
+    for formula_template in FORMULAS:
+        for count in DICE_COUNTS:
+            formula = formula_template.format(count)
+            pyhedrals_time, bulk_time = benchmark(formula)
+            print(
+                f"{formula:<16}{pyhedrals_time * 1000:>10.2f}ms{bulk_time * 1000:>10.2f}ms"
+                f"{pyhedrals_time / bulk_time:>9.0f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
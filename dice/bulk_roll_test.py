@@ -0,0 +1,152 @@
+"""Unit tests for bulk_roll."""
+
+import unittest
+
+import bulk_roll
+import numpy as np
+import pyhedrals
+
+MAX_DICE = 100000
+MAX_SIDES = 10000
+
+
+def roll(formula: str, seed: int = 0) -> bulk_roll.BulkRoll | None:
+    """Roll a formula in bulk with generous limits and a seeded generator."""
+    return bulk_roll.roll_bulk(
+        formula, max_dice=MAX_DICE, max_sides=MAX_SIDES, rng=np.random.default_rng(seed)
+    )
+
+
+def pyhedrals_error(formula: str) -> Exception | None:
+    """Roll a formula with pyhedrals, returning the exception it raised (if any)."""
+    try:
+        pyhedrals.DiceRoller(maxDice=MAX_DICE, maxSides=MAX_SIDES).parse(formula)
+    except Exception as exception:  # noqa: BLE001
+        return exception
+    return None
+
+
+class Parsing(unittest.TestCase):
+    def test_complex_formulas_not_rolled(self):
+        for formula in ("2d6+1", "4d6kh3dl", "(10d6)", "10d6r1", "d"):
+            assert roll(formula) is None, formula
+
+    def test_too_few_dice_not_rolled(self):
+        result = bulk_roll.roll_bulk("10d6", max_dice=100, max_sides=100, min_dice=100)
+        assert result is None
+
+    def test_limits(self):
+        for formula in ("101d6", "1d101", "4d6kh5", "3d6c7"):
+            raised = False
+            try:
+                bulk_roll.roll_bulk(formula, max_dice=100, max_sides=100)
+            except ValueError:
+                raised = True
+            assert raised, formula
+
+
+class SameAsPyhedrals(unittest.TestCase):
+    def test_edge_formulas(self):
+        for formula in (
+            "200d6kh0",
+            "200d6kl0",
+            "200d6dl0",
+            "200d6dh0",
+            "200d6kh201",
+            "200d6kl201",
+            "200d6dl200",
+            "200d6dl201",
+            "200d6dh201",
+            "200d6c>0",
+            "200d6c>6",
+            "200d6c<1",
+            "200d6c<7",
+            "200d6c>=1",
+            "200d6c<=6",
+            "200d6c0",
+            "200d6c7",
+            "200d6!>0",
+            "200d6!>6",
+            "200d6!<2",
+            "200d6!>=1",
+            "200d6!>=2",
+            "200d6!<=6",
+            "200d6!0",
+            "200d6!7",
+        ):
+            expected = pyhedrals_error(formula) is not None
+            raised = False
+            try:
+                roll(formula)
+            except ValueError:
+                raised = True
+            assert expected == raised, formula
+
+    def test_drop_more_than_rolled(self):
+        for formula in ("200d6dl201", "200d6dh1000"):
+            result = roll(formula)
+            expected = 0
+            assert expected == result.result, formula
+            expected = 200
+            assert expected == result.rolled.sum(), formula
+
+
+class Rolling(unittest.TestCase):
+    def test_plain(self):
+        result = roll("10000d6")
+        expected = 10000
+        assert expected == result.rolled.sum()
+        assert expected == result.kept.sum()
+        assert set(result.faces) <= set(range(1, 7))
+        expected = int((result.faces * result.rolled).sum())
+        assert expected == result.result
+
+    def test_same_seed_same_roll(self):
+        assert roll("1000d20", seed=42).summary() == roll("1000d20", seed=42).summary()
+
+    def test_keep_highest(self):
+        result = roll("1000d6kh10")
+        # With 1000 dice, the 10 highest are all going to be sixes
+        expected = 60
+        assert expected == result.result
+        expected = 10
+        assert expected == result.kept.sum()
+
+    def test_drop_lowest(self):
+        result = roll("1000d6dl990")
+        expected = 60
+        assert expected == result.result
+
+    def test_keep_lowest(self):
+        result = roll("1000d6kl10")
+        expected = 10
+        assert expected == result.result
+
+    def test_count(self):
+        result = roll("1000d6c>4")
+        expected = int(result.rolled[result.faces > 4].sum())  # noqa: PLR2004
+        assert expected == result.result
+
+    def test_explode(self):
+        result = roll("1000d6!")
+        sixes = int(result.rolled[result.faces == 6].sum())  # noqa: PLR2004
+        # Every six rolled another die
+        expected = 1000 + sixes
+        assert expected == result.rolled.sum()
+        assert result.exploded[result.faces == 6].all()  # noqa: PLR2004
+
+    def test_summary(self):
+        result = bulk_roll.BulkRoll(
+            4,
+            6,
+            np.array([3, 5]),
+            np.array([1, 3]),
+            np.array([0, 3]),
+        )
+        expected = "4d6: -3-\N{MULTIPLICATION SIGN}1,5\N{MULTIPLICATION SIGN}3 (15)"
+        assert expected == result.summary()
+
+
+# Run unit tests from command line
+if __name__ == "__main__":
+    unittest.main()
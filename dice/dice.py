@@ -1,27 +1,42 @@
 """Dice cog for Red-DiscordBot by PhasecoreX."""
 
 import asyncio
+import functools
 import re
 from contextlib import suppress
 from typing import ClassVar
 
+import numpy as np
 import pyhedrals
 from redbot.core import Config, checks, commands
 from redbot.core.bot import Red
 from redbot.core.utils.chat_formatting import error, question, success
 from redbot.core.utils.predicates import MessagePredicate
 
+from . import bulk_roll, dice_stats
 from .pcx_lib import SettingDisplay
 
 MAX_ROLLS_NOTIFY = 1000000
 MAX_MESSAGE_LENGTH = 2000
+STATS_PERCENTILES = (5, 25, 50, 75, 95)
+# Simple formulas with at least this many dice are rolled in bulk, with a summarized roll log
+BULK_ROLL_MIN_DICE = 100
+
+
+@functools.lru_cache(maxsize=4)
+def get_dice_roller(max_dice: int, max_sides: int) -> pyhedrals.DiceRoller:
+    """Get a (shared) dice roller for the given limits.
+
+    Rolls are parsed synchronously, so one roller can safely be used for every roll.
+    """
+    return pyhedrals.DiceRoller(maxDice=max_dice, maxSides=max_sides)
 
 
 class Dice(commands.Cog):
     """Perform complex dice rolling."""
 
     __author__ = "PhasecoreX"
-    __version__ = "2.1.0"
+    __version__ = "2.3.0"
 
     default_global_settings: ClassVar[dict[str, int]] = {
         "max_dice_rolls": 10000,
@@ -39,6 +54,10 @@ class Dice(commands.Cog):
             self, identifier=1224364860, force_registration=True
         )
         self.config.register_global(**self.default_global_settings)
+        # Cached copies of the settings, so rolling doesn't need to read Config
+        self.max_dice_rolls: int = self.default_global_settings["max_dice_rolls"]
+        self.max_die_sides: int = self.default_global_settings["max_die_sides"]
+        self.rng = np.random.default_rng()
 
     #
     # Red methods
@@ -53,6 +72,15 @@ class Dice(commands.Cog):
         """Nothing to delete."""
         return
 
+    #
+    # Initialization methods
+    #
+
+    async def initialize(self) -> None:
+        """Perform setup actions before loading cog."""
+        self.max_dice_rolls = await self.config.max_dice_rolls()
+        self.max_die_sides = await self.config.max_die_sides()
+
     #
     # Command methods: diceset
     #
@@ -100,6 +128,7 @@ class Dice(commands.Cog):
                 await ctx.bot.wait_for("message", check=pred, timeout=30)
             if pred.result:
                 await self.config.max_dice_rolls.set(maximum)
+                self.max_dice_rolls = maximum
                 action = "is now set to"
             else:
                 await ctx.send(
@@ -110,6 +139,7 @@ class Dice(commands.Cog):
                 return
         else:
             await self.config.max_dice_rolls.set(maximum)
+            self.max_dice_rolls = maximum
             action = "is now set to"
 
         await ctx.send(
@@ -127,6 +157,7 @@ class Dice(commands.Cog):
         But be honest, do you really need to roll multiple five trillion sided dice at once?
         """
         await self.config.max_die_sides.set(maximum)
+        self.max_die_sides = maximum
         await ctx.send(
             success(
                 f"Maximum die sides is now set to {await self.config.max_die_sides()}"
@@ -137,7 +168,7 @@ class Dice(commands.Cog):
     # Command methods
     #
 
-    @commands.command()
+    @commands.group(invoke_without_command=True)
     async def dice(self, ctx: commands.Context, *, roll: str) -> None:
         """Perform die roll based on a dice formula.
 
@@ -151,16 +182,28 @@ class Dice(commands.Cog):
         `10d10r<=2kh6` - Roll 10d10, reroll all dice less than or equal to 2, then keep the highest 6 dice
 
         Modifier order does matter, and usually they allow for specifying a specific number or number ranges after them.
+
+        Use `[p]dice stats <formula>` to see the odds of a formula instead of rolling it.
         """
         try:
-            dice_roller = pyhedrals.DiceRoller(
-                maxDice=await self.config.max_dice_rolls(),
-                maxSides=await self.config.max_die_sides(),
+            bulk_result = bulk_roll.roll_bulk(
+                roll,
+                max_dice=self.max_dice_rolls,
+                max_sides=self.max_die_sides,
+                min_dice=BULK_ROLL_MIN_DICE,
+                rng=self.rng,
             )
-            result = dice_roller.parse(roll)
-            roll_message = f"\N{GAME DIE} {ctx.message.author.mention} rolled {roll} and got **{result.result}**"
+            if bulk_result is not None:
+                total = bulk_result.result
+                roll_strings = [bulk_result.summary()]
+            else:
+                dice_roller = get_dice_roller(self.max_dice_rolls, self.max_die_sides)
+                result = dice_roller.parse(roll)
+                total = result.result
+                roll_strings = result.strings()
+            roll_message = f"\N{GAME DIE} {ctx.message.author.mention} rolled {roll} and got **{total}**"
             if len(roll_message) > MAX_MESSAGE_LENGTH:
-                roll_message = f"\N{GAME DIE} {ctx.message.author.mention} rolled that and got **{result.result}**"
+                roll_message = f"\N{GAME DIE} {ctx.message.author.mention} rolled that and got **{total}**"
             if len(roll_message) > MAX_MESSAGE_LENGTH:
                 await ctx.send(
                     error(
@@ -168,7 +211,7 @@ class Dice(commands.Cog):
                     )
                 )
                 return
-            roll_log = "\n".join(result.strings())
+            roll_log = "\n".join(roll_strings)
             roll_log = self.DROPPED_EXPLODED_RE.sub(r"~~**\1!**~~", roll_log)
             roll_log = self.EXPLODED_RE.sub(r"**\1!**", roll_log)
             roll_log = self.DROPPED_RE.sub(r"~~\1~~", roll_log)
@@ -188,3 +231,44 @@ class Dice(commands.Cog):
                     f"{ctx.message.author.mention}, I couldn't parse your dice formula:\n`{exception!s}`"
                 )
             )
+
+    @dice.command()
+    async def stats(self, ctx: commands.Context, *, formula: str) -> None:
+        """Calculate the exact odds of a dice formula, without rolling it.
+
+        Supports dice with one keep, drop or count modifier, constants, `+`, `-`,
+        multiplying by constants, and parentheses. For example:
+
+        `4d6kh3` - The odds of rolling 4d6 and keeping the highest 3 dice
+        `2d20kl+5` - The odds of rolling 2d20 with disadvantage, adding 5
+        `8d6c>=5` - The odds of how many of 8d6 roll 5 or higher
+        """
+        try:
+            async with ctx.typing():
+                distribution = await asyncio.to_thread(
+                    dice_stats.analyze,
+                    formula,
+                    max_dice=self.max_dice_rolls,
+                    max_sides=self.max_die_sides,
+                )
+        except ValueError as exception:
+            await ctx.send(
+                error(
+                    f"{ctx.message.author.mention}, I couldn't calculate the odds of that dice formula:\n`{exception!s}`"
+                )
+            )
+            return
+        summary_section = SettingDisplay("Outcomes")
+        summary_section.add("Minimum", distribution.minimum)
+        summary_section.add("Maximum", distribution.maximum)
+        summary_section.add("Most likely", distribution.mode)
+        summary_section.add("Mean", f"{distribution.mean:,.4f}")
+        summary_section.add("Variance", f"{distribution.variance:,.4f}")
+        summary_section.add("Standard deviation", f"{distribution.variance**0.5:,.4f}")
+        percentile_section = SettingDisplay("Percentiles")
+        for percent in STATS_PERCENTILES:
+            percentile_section.add(f"{percent}th", distribution.percentile(percent))
+        header = f"\N{GAME DIE} Odds of {formula}:"
+        if len(header) > MAX_MESSAGE_LENGTH // 2:
+            header = "\N{GAME DIE} Odds of that formula:"
+        await ctx.send(f"{header}\n{summary_section.display(percentile_section)}")
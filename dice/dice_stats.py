@@ -0,0 +1,438 @@
+"""Exact outcome distributions of dice formulas, calculated without rolling any dice."""
+
+import math
+import operator
+import re
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import wraps
+
+import numpy as np
+
+__author__ = "PhasecoreX"
+
+# Most distinct totals a distribution may have
+MAX_TOTALS = 1_000_000
+# Rough number of operations keeping/dropping dice may take
+MAX_KEEP_WORK = 50_000_000
+# Convolve with FFTs once the direct method would take more operations than this
+FFT_CONVOLVE_WORK = 250_000
+# Only results with at most this many values are memoized, so that memory use stays small
+MAX_CACHED_VALUES = 4096
+
+TOKEN_RE = re.compile(r"\s*(?:(\d+)|(kh|kl|dh|dl)|(c(?:[<>]=?)?)|(d)|([-+*()]))")
+COMPARISONS: dict[str, Callable[[int, int], bool]] = {
+    "c": operator.eq,
+    "c<": operator.lt,
+    "c>": operator.gt,
+    "c<=": operator.le,
+    "c>=": operator.ge,
+}
+
+
+class Distribution:
+    """The probability of each possible total of a dice formula.
+
+    `probabilities[i]` is the chance of getting a total of `offset + i`.
+    Distributions are immutable, as they are shared between memoized calculations.
+    """
+
+    def __init__(
+        self,
+        offset: int,
+        probabilities: np.ndarray,
+        bounds: tuple[int, int] | None = None,
+    ) -> None:
+        """Create a distribution, trimming off impossible totals at either end.
+
+        If the lowest and highest possible totals are known, pass them as `bounds`.
+        Otherwise they are where the first and last nonzero probabilities are, which is
+        wrong if a probability was too small to represent (or lost to FFT rounding).
+        """
+        if len(probabilities) > MAX_TOTALS:
+            msg = f"Formula has more than {MAX_TOTALS} possible totals"
+            raise ValueError(msg)
+        if bounds is None:
+            nonzero = np.flatnonzero(probabilities)
+            if len(nonzero) == 0:
+                msg = "A distribution needs at least one possible total"
+                raise ValueError(msg)
+            bounds = (offset + int(nonzero[0]), offset + int(nonzero[-1]))
+        self.offset = bounds[0]
+        self.probabilities = probabilities[bounds[0] - offset : bounds[1] - offset + 1]
+        self.probabilities.flags.writeable = False
+
+    @classmethod
+    def constant(cls, value: int) -> "Distribution":
+        """Create a distribution that is always the same total."""
+        return cls(value, np.ones(1))
+
+    @property
+    def is_constant(self) -> bool:
+        """Check if this distribution only has one possible total."""
+        return len(self.probabilities) == 1
+
+    @property
+    def minimum(self) -> int:
+        """Get the lowest possible total."""
+        return self.offset
+
+    @property
+    def maximum(self) -> int:
+        """Get the highest possible total."""
+        return self.offset + len(self.probabilities) - 1
+
+    @property
+    def totals(self) -> np.ndarray:
+        """Get every total, lined up with their probabilities."""
+        return np.arange(self.minimum, self.maximum + 1, dtype=np.float64)
+
+    @property
+    def mean(self) -> float:
+        """Get the expected total."""
+        return float(np.dot(self.totals, self.probabilities))
+
+    @property
+    def variance(self) -> float:
+        """Get the variance of the total."""
+        return float(np.dot((self.totals - self.mean) ** 2, self.probabilities))
+
+    @property
+    def mode(self) -> int:
+        """Get the most likely total."""
+        return self.offset + int(np.argmax(self.probabilities))
+
+    def percentile(self, percent: float) -> int:
+        """Get the lowest total that at least `percent` percent of rolls are at or below."""
+        cumulative = np.cumsum(self.probabilities)
+        # Allow for floating point error, so that e.g. the 50th percentile of 1d2 is 1
+        index = int(np.searchsorted(cumulative, percent / 100 - 1e-9))
+        return self.offset + min(index, len(cumulative) - 1)
+
+    def __add__(self, other: "Distribution") -> "Distribution":
+        """Get the distribution of the sum of two independent totals."""
+        return Distribution(
+            self.offset + other.offset,
+            _convolve(self.probabilities, other.probabilities),
+            (self.minimum + other.minimum, self.maximum + other.maximum),
+        )
+
+    def __neg__(self) -> "Distribution":
+        """Get the distribution of the negated total."""
+        return Distribution(
+            -self.maximum,
+            self.probabilities[::-1].copy(),
+            (-self.maximum, -self.minimum),
+        )
+
+    def __sub__(self, other: "Distribution") -> "Distribution":
+        """Get the distribution of the difference of two independent totals."""
+        return self + -other
+
+    def scale(self, factor: int) -> "Distribution":
+        """Get the distribution of the total multiplied by a constant."""
+        if factor == 0:
+            return Distribution.constant(0)
+        if factor < 0:
+            return -self.scale(-factor)
+        if (len(self.probabilities) - 1) * factor + 1 > MAX_TOTALS:
+            msg = f"Formula has more than {MAX_TOTALS} possible totals"
+            raise ValueError(msg)
+        probabilities = np.zeros((len(self.probabilities) - 1) * factor + 1)
+        probabilities[::factor] = self.probabilities
+        return Distribution(
+            self.offset * factor,
+            probabilities,
+            (self.minimum * factor, self.maximum * factor),
+        )
+
+
+def _memoize_small(maxsize: int) -> Callable[[Callable], Callable]:
+    """Like lru_cache, but only remember results with at most MAX_CACHED_VALUES values.
+
+    Large results can be megabytes each, and anyone can ask for them.
+    """
+
+    def decorator(function: Callable) -> Callable:
+        cache: OrderedDict = OrderedDict()
+
+        @wraps(function)
+        def wrapper(*args: int) -> Distribution | np.ndarray:
+            if args in cache:
+                cache.move_to_end(args)
+                return cache[args]
+            result = function(*args)
+            values = (
+                result.probabilities if isinstance(result, Distribution) else result
+            )
+            if len(values) <= MAX_CACHED_VALUES:
+                cache[args] = result
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return result
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def _convolve(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """Convolve two probability arrays, using FFTs for large ones."""
+    size = len(first) + len(second) - 1
+    if size > MAX_TOTALS:
+        msg = f"Formula has more than {MAX_TOTALS} possible totals"
+        raise ValueError(msg)
+    if len(first) * len(second) <= FFT_CONVOLVE_WORK:
+        return np.convolve(first, second)
+    fft_size = 1 << (size - 1).bit_length()
+    result = np.fft.irfft(
+        np.fft.rfft(first, fft_size) * np.fft.rfft(second, fft_size), fft_size
+    )[:size]
+    # Floating point noise can make tiny probabilities slightly negative
+    return np.clip(result, 0.0, None)
+
+
+def _binomial(trials: int, chance: float) -> np.ndarray:
+    """Get the probability of each number of successes out of some independent trials."""
+    if chance >= 1:
+        probabilities = np.zeros(trials + 1)
+        probabilities[trials] = 1.0
+        return probabilities
+    if chance <= 0:
+        probabilities = np.zeros(trials + 1)
+        probabilities[0] = 1.0
+        return probabilities
+    successes = np.arange(trials + 1)
+    log_factorial = _log_factorials(trials)
+    return np.exp(
+        log_factorial[trials]
+        - log_factorial[successes]
+        - log_factorial[trials - successes]
+        + successes * math.log(chance)
+        + (trials - successes) * math.log1p(-chance)
+    )
+
+
+@_memoize_small(maxsize=16)
+def _log_factorials(count: int) -> np.ndarray:
+    """Get log(n!) for every n from 0 to count."""
+    log_factorial = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, count + 1)))))
+    log_factorial.flags.writeable = False
+    return log_factorial
+
+
+#
+# Dice
+#
+
+
+@_memoize_small(maxsize=256)
+def sum_of_dice(count: int, sides: int) -> Distribution:
+    """Get the distribution of the sum of some dice."""
+    if count == 0:
+        return Distribution.constant(0)
+    if count == 1:
+        return Distribution(1, np.full(sides, 1 / sides))
+    # Both halves are the same (give or take a die), so this only does about 2 * log2(count) convolutions
+    half = sum_of_dice(count // 2, sides)
+    result = half + half
+    if count % 2:
+        result += sum_of_dice(1, sides)
+    return result
+
+
+@_memoize_small(maxsize=256)
+def keep_highest(count: int, sides: int, keep: int) -> Distribution:
+    """Get the distribution of the sum of the highest `keep` dice out of `count` dice."""
+    if keep >= count:
+        return sum_of_dice(count, sides)
+    if keep <= 0:
+        return Distribution.constant(0)
+    if sides * count * count * keep * sides // 2 > MAX_KEEP_WORK:
+        msg = f"Keeping {keep} of {count}d{sides} is too complex to analyze"
+        raise ValueError(msg)
+    # Go through each face from highest to lowest, deciding how many dice rolled it.
+    # states[assigned] is the distribution of the kept total, when `assigned` dice rolled
+    # higher than the current face (and so the rest rolled the current face or lower).
+    length = keep * sides + 1
+    states = [np.zeros(length) for _ in range(count + 1)]
+    states[0][0] = 1.0
+    for face in range(sides, 0, -1):
+        next_states = [np.zeros(length) for _ in range(count + 1)]
+        for assigned, state in enumerate(states):
+            if not state.any():
+                continue
+            kept = min(assigned, keep)
+            # Each remaining die (rolling the current face or lower) rolls the current face 1/face of the time
+            for rolled, chance in enumerate(_binomial(count - assigned, 1 / face)):
+                if chance == 0:
+                    continue
+                shift = (min(assigned + rolled, keep) - kept) * face
+                next_states[assigned + rolled][shift:] += (
+                    chance * state[: length - shift]
+                )
+        states = next_states
+    return Distribution(0, states[count], (keep, keep * sides))
+
+
+def keep_lowest(count: int, sides: int, keep: int) -> Distribution:
+    """Get the distribution of the sum of the lowest `keep` dice out of `count` dice."""
+    # Flipping every die (1 <-> sides) turns the lowest dice into the highest ones
+    flipped = keep_highest(count, sides, keep)
+    return Distribution.constant(min(keep, count) * (sides + 1)) - flipped
+
+
+def count_successes(
+    count: int, sides: int, comparison: str, target: int
+) -> Distribution:
+    """Get the distribution of how many dice roll a face that compares to the target."""
+    compare = COMPARISONS[comparison]
+    faces = sum(1 for face in range(1, sides + 1) if compare(face, target))
+    return Distribution(
+        0,
+        _binomial(count, faces / sides),
+        (count if faces == sides else 0, count if faces else 0),
+    )
+
+
+#
+# Parsing
+#
+
+
+class _FormulaParser:
+    """Parse a dice formula into the distribution of its total."""
+
+    def __init__(self, formula: str, max_dice: int, max_sides: int) -> None:
+        self.max_dice = max_dice
+        self.max_sides = max_sides
+        self.tokens = self._tokenize(formula.split("#", 1)[0])
+        self.position = 0
+
+    @staticmethod
+    def _tokenize(formula: str) -> list[str]:
+        tokens = []
+        position = 0
+        formula = formula.rstrip()
+        while position < len(formula):
+            match = TOKEN_RE.match(formula, position)
+            if not match:
+                character = formula[position:].lstrip()[0]
+                msg = f"'{character}' isn't supported when calculating statistics"
+                raise ValueError(msg)
+            tokens.append(match.group().strip())
+            position = match.end()
+        return tokens
+
+    def _peek(self) -> str | None:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _take(self) -> str:
+        token = self._peek()
+        if token is None:
+            msg = "Unexpected end of formula"
+            raise ValueError(msg)
+        self.position += 1
+        return token
+
+    def _number(self) -> int | None:
+        token = self._peek()
+        if token is None or not token.isdigit():
+            return None
+        self.position += 1
+        return int(token)
+
+    def parse(self) -> Distribution:
+        if not self.tokens:
+            msg = "Empty formula"
+            raise ValueError(msg)
+        result = self._sum()
+        if self._peek() is not None:
+            msg = f"Unexpected '{self._peek()}'"
+            raise ValueError(msg)
+        return result
+
+    def _sum(self) -> Distribution:
+        result = self._product()
+        while self._peek() in ("+", "-"):
+            if self._take() == "+":
+                result += self._product()
+            else:
+                result -= self._product()
+        return result
+
+    def _product(self) -> Distribution:
+        result = self._unary()
+        while self._peek() == "*":
+            self._take()
+            other = self._unary()
+            if other.is_constant:
+                result = result.scale(other.offset)
+            elif result.is_constant:
+                result = other.scale(result.offset)
+            else:
+                msg = "Multiplying dice by dice isn't supported when calculating statistics"
+                raise ValueError(msg)
+        return result
+
+    def _unary(self) -> Distribution:
+        if self._peek() == "-":
+            self._take()
+            return -self._unary()
+        if self._peek() == "(":
+            self._take()
+            result = self._sum()
+            if self._take() != ")":
+                msg = "Missing ')'"
+                raise ValueError(msg)
+            return result
+        count = self._number()
+        if self._peek() != "d":
+            if count is None:
+                msg = f"Unexpected '{self._peek() or 'end of formula'}'"
+                raise ValueError(msg)
+            return Distribution.constant(count)
+        self._take()
+        return self._dice(1 if count is None else count)
+
+    def _dice(self, count: int) -> Distribution:
+        sides = self._number()
+        if sides is None or sides < 1:
+            msg = "Dice need a number of sides"
+            raise ValueError(msg)
+        if count > self.max_dice:
+            msg = f"{count} dice is more than the maximum of {self.max_dice}"
+            raise ValueError(msg)
+        if sides > self.max_sides:
+            msg = f"{sides} sides is more than the maximum of {self.max_sides}"
+            raise ValueError(msg)
+        modifier = self._peek()
+        if modifier in ("kh", "kl", "dh", "dl"):
+            self._take()
+            amount = self._number() or 1
+            if modifier[0] == "k":
+                if amount > count:
+                    msg = f"Can't keep {amount} dice when only {count} were rolled"
+                    raise ValueError(msg)
+                keep = amount
+            else:
+                # Dropping more dice than were rolled drops all of them (like rolling does)
+                keep = max(count - amount, 0)
+            if modifier in ("kh", "dl"):
+                return keep_highest(count, sides, keep)
+            return keep_lowest(count, sides, keep)
+        if modifier in COMPARISONS:
+            self._take()
+            target = self._number() or sides
+            return count_successes(count, sides, modifier, target)
+        return sum_of_dice(count, sides)
+
+
+def analyze(formula: str, *, max_dice: int, max_sides: int) -> Distribution:
+    """Calculate the exact distribution of the total of a dice formula.
+
+    Supports dice (with one keep, drop or count modifier), constants, addition, subtraction,
+    multiplication by constants and parentheses. Raises ValueError for anything else.
+    """
+    return _FormulaParser(formula, max_dice, max_sides).parse()
@@ -0,0 +1,162 @@
+"""Unit tests for dice_stats."""
+
+import itertools
+import math
+import unittest
+from collections import Counter
+
+import dice_stats
+
+
+def analyze(formula: str) -> dice_stats.Distribution:
+    """Analyze a formula with generous limits."""
+    return dice_stats.analyze(formula, max_dice=10000, max_sides=10000)
+
+
+def brute_force_keep(count: int, sides: int, keep: int, *, highest: bool) -> dict:
+    """Calculate the chance of each total by going through every possible roll."""
+    totals = Counter()
+    for roll in itertools.product(range(1, sides + 1), repeat=count):
+        totals[sum(sorted(roll, reverse=highest)[:keep])] += 1
+    return {total: ways / sides**count for total, ways in totals.items()}
+
+
+def as_dict(distribution: dice_stats.Distribution) -> dict:
+    """Get the nonzero chance of each total of a distribution."""
+    return {
+        distribution.offset + index: probability
+        for index, probability in enumerate(distribution.probabilities)
+        if probability
+    }
+
+
+def assert_close(expected: dict, result: dict) -> None:
+    """Check that two distributions are the same, allowing for floating point error."""
+    assert expected.keys() == result.keys()
+    for total, probability in expected.items():
+        assert math.isclose(probability, result[total], abs_tol=1e-12)
+
+
+class Dice(unittest.TestCase):
+    def test_single_die(self):
+        result = analyze("1d6")
+        assert_close({face: 1 / 6 for face in range(1, 7)}, as_dict(result))
+        expected = 3.5
+        assert math.isclose(expected, result.mean)
+
+    def test_sum(self):
+        result = analyze("2d6")
+        expected = 7
+        assert expected == result.mode
+        assert math.isclose(6 / 36, result.probabilities[7 - result.offset])
+        assert math.isclose(70 / 12, result.variance)
+
+    def test_keep_highest(self):
+        assert_close(
+            brute_force_keep(4, 6, 3, highest=True), as_dict(analyze("4d6kh3"))
+        )
+
+    def test_keep_lowest(self):
+        assert_close(
+            brute_force_keep(5, 4, 2, highest=False), as_dict(analyze("5d4kl2"))
+        )
+
+    def test_drop(self):
+        assert_close(as_dict(analyze("4d6kh3")), as_dict(analyze("4d6dl")))
+        assert_close(as_dict(analyze("6d3kl2")), as_dict(analyze("6d3dh4")))
+
+    def test_drop_more_than_rolled(self):
+        for formula in ("3d6dl5", "3d6dh3", "3d6dl5 + 2"):
+            result = analyze(formula)
+            assert result.is_constant, formula
+        expected = 2
+        assert expected == analyze("3d6dh5 + 2").offset
+        failed = False
+        try:
+            analyze("3d6kh5")
+        except ValueError:
+            failed = True
+        assert failed
+
+    def test_count_successes(self):
+        result = analyze("6d6c>4")
+        expected = 2.0
+        assert math.isclose(expected, result.mean)
+        expected = 6
+        assert expected == result.maximum
+
+    def test_large_sum(self):
+        result = analyze("1000d1000")
+        expected = 500500.0
+        assert math.isclose(expected, result.mean)
+        assert math.isclose(1, result.probabilities.sum())
+
+    def test_large_bounds(self):
+        # Large enough to convolve with FFTs, and for the extreme totals to underflow to zero
+        for formula, minimum, maximum in (
+            ("300d6", 300, 1800),
+            ("1000d6", 1000, 6000),
+            ("50d100", 50, 5000),
+            ("1000d6 - 50d100 * 2", 1000 - 10000, 6000 - 100),
+            ("10000d6c>=5", 0, 10000),
+        ):
+            result = analyze(formula)
+            assert minimum == result.minimum, formula
+            assert maximum == result.maximum, formula
+            assert (result.probabilities >= 0).all(), formula
+
+    def test_large_results_not_cached(self):
+        analyze("100d10000")
+        analyze("3d2200kh2")
+        for function in (dice_stats.sum_of_dice, dice_stats.keep_highest):
+            for distribution in function.cache.values():
+                assert len(distribution.probabilities) <= dice_stats.MAX_CACHED_VALUES
+        # Small ones still are
+        assert analyze("3d6") is analyze("3d6")
+
+
+class Arithmetic(unittest.TestCase):
+    def test_constants(self):
+        result = analyze("2d6+3")
+        expected = 10.0
+        assert math.isclose(expected, result.mean)
+        expected = 5
+        assert expected == result.minimum
+
+    def test_multiply_and_negate(self):
+        result = analyze("-(1d4-1)*2")
+        expected = {0: 0.25, -2: 0.25, -4: 0.25, -6: 0.25}
+        assert_close(expected, as_dict(result))
+
+    def test_percentiles(self):
+        result = analyze("1d20")
+        expected = 10
+        assert expected == result.percentile(50)
+        expected = 19
+        assert expected == result.percentile(95)
+        expected = 20
+        assert expected == result.percentile(100)
+
+
+class Errors(unittest.TestCase):
+    def test_unsupported(self):
+        for formula in ("1d6!", "2d6*1d6", "4d6kh5", "(1d6", "", "d"):
+            raised = False
+            try:
+                analyze(formula)
+            except ValueError:
+                raised = True
+            assert raised, formula
+
+    def test_limits(self):
+        raised = False
+        try:
+            dice_stats.analyze("11d6", max_dice=10, max_sides=6)
+        except ValueError:
+            raised = True
+        assert raised
+
+
+# Run unit tests from command line
+if __name__ == "__main__":
+    unittest.main()
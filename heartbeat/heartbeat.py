@@ -3,10 +3,16 @@
 import asyncio
 import datetime
 import logging
+import math
+import time
+from collections import deque
+from collections.abc import Iterable
 from datetime import timedelta
 from typing import ClassVar
+from urllib.parse import urlsplit
 
 import aiohttp
+import psutil
 from redbot.core import Config, checks, commands
 from redbot.core import __version__ as redbot_version
 from redbot.core.bot import Red
@@ -20,23 +26,52 @@ user_agent = (
 log = logging.getLogger("red.pcxcogs.heartbeat")
 
 MIN_HEARTBEAT_SECONDS = 60.0
+# Each ping attempt is given up on after this long...
+HEARTBEAT_TIMEOUT_SECONDS = 10.0
+# ...and tried this many times, waiting longer between each attempt
+HEARTBEAT_ATTEMPTS = 3
+HEARTBEAT_RETRY_BACKOFF_SECONDS = 1.0
+# Heartbeats sent this much later than scheduled are counted as late
+LATE_HEARTBEAT_SECONDS = 1.0
+# At most this many heartbeats can be in progress at once, further ones are skipped
+MAX_OVERLAPPING_HEARTBEATS = 2
+# How health metrics can be attached to heartbeat pings
+PAYLOAD_FORMATS = {
+    "none": "Plain GET request, no health metrics",
+    "query": "GET request with health metrics as query parameters",
+    "json": "POST request with health metrics as a JSON body",
+}
+# Latency percentiles are calculated from this many of the most recent pings per URL
+LATENCY_SAMPLES = 100
+
+
+def percentile(samples: Iterable[float], percent: float) -> float | None:
+    """Get the nearest-rank percentile of some samples, or None if there are none."""
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
 
 
 class Heartbeat(commands.Cog):
     """Monitor the uptime of your bot.
 
-    The bot owner can specify a URL that the bot will ping (send a GET request)
+    The bot owner can specify URLs that the bot will ping (send a GET request)
     at a configurable frequency. Using this with an uptime tracking service can
     warn you when your bot isn't connected to the internet (and thus usually
     not connected to Discord).
     """
 
     __author__ = "PhasecoreX"
-    __version__ = "1.4.0"
+    __version__ = "1.7.0"
 
-    default_global_settings: ClassVar[dict[str, int | str]] = {
+    default_global_settings: ClassVar[dict[str, int | str | list[str]]] = {
+        "schema_version": 0,
         "url": "",
+        "urls": [],
         "frequency": 60,
+        "payload_format": "none",
     }
 
     def __init__(self, bot: Red) -> None:
@@ -48,10 +83,19 @@ class Heartbeat(commands.Cog):
         )
         self.config.register_global(**self.default_global_settings)
         self.session = aiohttp.ClientSession()
-        self.current_error = None
+        # URL -> error message of its last ping, if it failed
+        self.current_errors: dict[str, str] = {}
+        # URL -> latencies (in seconds) of its most recent successful pings
+        self.latencies: dict[str, deque[float]] = {}
         self.next_heartbeat = datetime.datetime.now(datetime.UTC)
         self.bg_loop_task = None
         self.background_tasks = set()
+        self.heartbeat_tasks: set[asyncio.Task] = set()
+        self.late_heartbeats = 0
+        # How late (in seconds) the event loop woke us up for the last heartbeat
+        self.loop_lag = 0.0
+        self.process = psutil.Process()
+        self.skipped_heartbeats = 0
 
     #
     # Red methods
@@ -61,6 +105,8 @@ class Heartbeat(commands.Cog):
         """Clean up when cog shuts down."""
         if self.bg_loop_task:
             self.bg_loop_task.cancel()
+        for heartbeat_task in self.heartbeat_tasks:
+            heartbeat_task.cancel()
         task = asyncio.create_task(self.session.close())
         self.background_tasks.add(task)
         task.add_done_callback(self.background_tasks.discard)
@@ -80,8 +126,21 @@ class Heartbeat(commands.Cog):
 
     async def initialize(self) -> None:
         """Perform setup actions before loading cog."""
+        await self._migrate_config()
         self.enable_bg_loop()
 
+    async def _migrate_config(self) -> None:
+        """Perform some configuration migrations."""
+        schema_version = await self.config.schema_version()
+
+        if schema_version < 1:
+            # Support for multiple URLs
+            url = await self.config.url()
+            if url:
+                await self.config.urls.set([url])
+            await self.config.url.clear()
+            await self.config.schema_version.set(1)
+
     #
     # Background loop methods
     #
@@ -120,40 +179,144 @@ class Heartbeat(commands.Cog):
     async def bg_loop(self, *, skip_first: bool) -> None:
         """Background loop."""
         await self.bot.wait_until_ready()
-        url = await self.config.url()
-        if not url:
+        urls = await self.config.urls()
+        if not urls:
             return
         frequency = await self.config.frequency()
         frequency = max(frequency, MIN_HEARTBEAT_SECONDS)
-        if not skip_first:
-            self.current_error = await self.send_heartbeat(url)
+        payload_format = await self.config.payload_format()
+        # Heartbeats are scheduled at fixed intervals on the monotonic clock,
+        # so slow pings (or retries) don't push the following heartbeats back
+        next_tick = time.monotonic()
+        if skip_first:
+            next_tick += frequency
         while True:
+            delay = max(0.0, next_tick - time.monotonic())
             self.next_heartbeat = datetime.datetime.now(
                 datetime.UTC
-            ) + datetime.timedelta(0, frequency)
-            await asyncio.sleep(frequency)
-            self.current_error = await self.send_heartbeat(url)
+            ) + datetime.timedelta(seconds=delay)
+            await asyncio.sleep(delay)
+            lateness = time.monotonic() - next_tick
+            self.loop_lag = lateness
+            if lateness > LATE_HEARTBEAT_SECONDS:
+                self.late_heartbeats += 1
+            if lateness >= frequency:
+                # Whole heartbeats were missed (the host was suspended?), don't try to catch up on them
+                missed = int(lateness // frequency)
+                self.skipped_heartbeats += missed
+                next_tick += missed * frequency
+            self.start_heartbeat(urls, payload_format)
+            next_tick += frequency
+
+    def start_heartbeat(self, urls: list[str], payload_format: str = "none") -> None:
+        """Send a heartbeat ping to every URL in the background, unless too many are already in progress."""
+        if len(self.heartbeat_tasks) >= MAX_OVERLAPPING_HEARTBEATS:
+            self.skipped_heartbeats += 1
+            log.debug("Skipping heartbeat, previous heartbeats are still in progress")
+            return
+
+        health = self.get_health() if payload_format != "none" else None
 
-    async def send_heartbeat(self, url: str) -> str | None:
-        """Send a heartbeat ping.
+        async def heartbeat() -> None:
+            self.current_errors = await self.send_heartbeats(
+                urls, payload_format, health
+            )
+
+        def done_callback(fut: asyncio.Future) -> None:
+            self.heartbeat_tasks.discard(fut)
+            try:
+                fut.result()
+            except asyncio.CancelledError:
+                pass
+            except Exception as exc:
+                log.exception(
+                    "Unexpected exception occurred while sending a heartbeat: ",
+                    exc_info=exc,
+                )
+
+        task = asyncio.create_task(heartbeat())
+        self.heartbeat_tasks.add(task)
+        task.add_done_callback(done_callback)
+
+    def get_health(self) -> dict[str, int | float]:
+        """Get health metrics of the bot, to be sent along with heartbeat pings."""
+        health = {
+            "loop_lag_ms": round(max(self.loop_lag, 0.0) * 1000),
+            "tasks": len(asyncio.all_tasks()),
+            "rss_mb": round(self.process.memory_info().rss / 1024 / 1024, 1),
+        }
+        # Not known until connected to Discord
+        if math.isfinite(self.bot.latency):
+            health["gateway_latency_ms"] = round(self.bot.latency * 1000)
+        return health
+
+    async def send_heartbeats(
+        self,
+        urls: list[str],
+        payload_format: str = "none",
+        health: dict[str, int | float] | None = None,
+    ) -> dict[str, str]:
+        """Send a heartbeat ping to every URL at once.
+
+        Returns the error message of each URL that had an error.
+        """
+        results = await asyncio.gather(
+            *(self.send_heartbeat(url, payload_format, health) for url in urls)
+        )
+        return {
+            url: error_message
+            for url, error_message in zip(urls, results, strict=True)
+            if error_message
+        }
+
+    async def send_heartbeat(
+        self,
+        url: str,
+        payload_format: str = "none",
+        health: dict[str, int | float] | None = None,
+    ) -> str | None:
+        """Send a heartbeat ping, optionally with health metrics attached.
 
         Returns error message if error, None otherwise
         """
         if not url:
             return "No URL supplied"
+        method = "GET"
+        request_kwargs = {}
+        if health is not None and payload_format == "query":
+            request_kwargs["params"] = {
+                key: str(value) for key, value in health.items()
+            }
+        elif health is not None and payload_format == "json":
+            method = "POST"
+            request_kwargs["json"] = health
         last_exception = None
-        retries = 3
-        while retries > 0:
+        for attempt in range(HEARTBEAT_ATTEMPTS):
+            if attempt:
+                await asyncio.sleep(
+                    HEARTBEAT_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+                )
+            start = time.perf_counter()
             try:
-                await self.session.get(
+                # Reading the response in the context manager returns the connection to the pool
+                async with self.session.request(
+                    method,
                     url,
                     headers={"user-agent": user_agent},
-                )
-            except (TimeoutError, aiohttp.ClientConnectionError) as exc:
+                    timeout=aiohttp.ClientTimeout(total=HEARTBEAT_TIMEOUT_SECONDS),
+                    raise_for_status=True,
+                    **request_kwargs,
+                ) as resp:
+                    await resp.read()
+            except (TimeoutError, aiohttp.ClientError) as exc:
                 last_exception = exc
             else:
+                self.latencies.setdefault(url, deque(maxlen=LATENCY_SAMPLES)).append(
+                    time.perf_counter() - start
+                )
                 return None
-            retries -= 1
+        if isinstance(last_exception, TimeoutError):
+            return f"Timed out after {HEARTBEAT_TIMEOUT_SECONDS:g} seconds"
         return str(last_exception)
 
     #
@@ -168,13 +331,15 @@ class Heartbeat(commands.Cog):
     @heartbeat.command()
     async def settings(self, ctx: commands.Context) -> None:
         """Display current settings."""
+        urls = await self.config.urls()
         global_section = SettingDisplay("Global Settings")
         heartbeat_status = "Disabled (no URL set)"
         if self.bg_loop_task and not self.bg_loop_task.done():
             heartbeat_status = "Enabled"
-        elif await self.config.url():
+        elif urls:
             heartbeat_status = "Disabled (faulty URL)"
         global_section.add("Heartbeat", heartbeat_status)
+        global_section.add("URLs", len(urls))
         global_section.add(
             "Frequency", humanize_timedelta(seconds=await self.config.frequency())
         )
@@ -186,26 +351,39 @@ class Heartbeat(commands.Cog):
                 )
                 or "0 seconds",
             )
-        if self.current_error:
-            global_section.add("Current error", self.current_error)
-        await ctx.send(str(global_section))
+        global_section.add("Health payload", await self.config.payload_format())
+        if self.late_heartbeats:
+            global_section.add("Late heartbeats", self.late_heartbeats)
+        if self.skipped_heartbeats:
+            global_section.add("Skipped heartbeats", self.skipped_heartbeats)
+        url_sections = []
+        for number, url in enumerate(urls, start=1):
+            # Don't show the whole URL, it usually contains a secret token
+            url_section = SettingDisplay(f"URL {number} ({urlsplit(url).hostname})")
+            if url in self.current_errors:
+                url_section.add("Current error", self.current_errors[url])
+            samples = self.latencies.get(url, ())
+            for percent in (50, 95, 99):
+                latency = percentile(samples, percent)
+                if latency is not None:
+                    url_section.add(f"Latency p{percent}", f"{latency * 1000:.0f} ms")
+            url_section.add("Recent pings", len(samples))
+            url_sections.append(url_section)
+        await ctx.send(global_section.display(*url_sections))
 
     @heartbeat.command()
     async def url(self, ctx: commands.Context, url: str) -> None:
-        """Set the URL Heartbeat will send pings to."""
+        """Set the URL Heartbeat will send pings to, replacing any others."""
         await delete(ctx.message)
-        try:
-            error_message = await self.send_heartbeat(url)
-            if not error_message:
-                await self.config.url.set(url)
-                self.enable_bg_loop(skip_first=True)
-                await ctx.send(success("Heartbeat URL has been set and enabled."))
-                return
-        except Exception as ex:  # noqa: BLE001
-            error_message = str(ex)
+        error_message = await self._test_url(url)
+        if not error_message:
+            await self.config.urls.set([url])
+            self.enable_bg_loop(skip_first=True)
+            await ctx.send(success("Heartbeat URL has been set and enabled."))
+            return
         previous_url_text = (
-            "I will continue to use the previous URL instead."
-            if await self.config.url()
+            "I will continue to use the previous URLs instead."
+            if await self.config.urls()
             else ""
         )
         await ctx.send(
@@ -214,10 +392,61 @@ class Heartbeat(commands.Cog):
             )
         )
 
+    @heartbeat.command()
+    async def add(self, ctx: commands.Context, url: str) -> None:
+        """Add another URL that Heartbeat will send pings to."""
+        await delete(ctx.message)
+        urls = await self.config.urls()
+        if url in urls:
+            await ctx.send(error("Heartbeat is already sending pings to that URL."))
+            return
+        error_message = await self._test_url(url)
+        if error_message:
+            await ctx.send(
+                error(
+                    f"Something seems to be wrong with that URL, I am not able to connect to it:\n```{error_message}```"
+                )
+            )
+            return
+        urls.append(url)
+        await self.config.urls.set(urls)
+        self.enable_bg_loop(skip_first=True)
+        await ctx.send(
+            success(f"Heartbeat URL has been added (URL {len(urls)}) and enabled.")
+        )
+
+    @heartbeat.command()
+    async def remove(self, ctx: commands.Context, number: int) -> None:
+        """Stop sending pings to a URL.
+
+        The URL number can be found in `[p]heartbeat settings`.
+        """
+        urls = await self.config.urls()
+        if not 1 <= number <= len(urls):
+            await ctx.send(error(f"There is no URL {number}."))
+            return
+        url = urls.pop(number - 1)
+        await self.config.urls.set(urls)
+        self.current_errors.pop(url, None)
+        self.latencies.pop(url, None)
+        self.enable_bg_loop(skip_first=True)
+        await ctx.send(success(f"Heartbeat URL {number} has been removed."))
+
+    async def _test_url(self, url: str) -> str | None:
+        """Send a test ping to a URL, returning the error message if it failed."""
+        payload_format = await self.config.payload_format()
+        health = self.get_health() if payload_format != "none" else None
+        try:
+            return await self.send_heartbeat(url, payload_format, health)
+        except Exception as ex:  # noqa: BLE001
+            return str(ex)
+
     @heartbeat.command()
     async def disable(self, ctx: commands.Context) -> None:
-        """Remove the set URL and disable Heartbeat pings."""
-        await self.config.url.clear()
+        """Remove all set URLs and disable Heartbeat pings."""
+        await self.config.urls.clear()
+        self.current_errors = {}
+        self.latencies = {}
         self.enable_bg_loop()
         await ctx.send(success("Heartbeat has been disabled."))
 
@@ -239,3 +468,32 @@ class Heartbeat(commands.Cog):
             )
         )
         self.enable_bg_loop()
+
+    @heartbeat.command()
+    async def payload(self, ctx: commands.Context, payload_format: str) -> None:
+        """Set how health metrics are attached to heartbeat pings.
+
+        This lets your uptime monitor alert on a struggling bot before it stops completely.
+        The metrics are the event loop lag (`loop_lag_ms`), Discord gateway latency (`gateway_latency_ms`),
+        number of asyncio tasks (`tasks`) and memory usage (`rss_mb`).
+
+        Formats:
+        `none` - Plain GET request, no health metrics (default)
+        `query` - GET request with health metrics as query parameters
+        `json` - POST request with health metrics as a JSON body
+        """
+        payload_format = payload_format.lower()
+        if payload_format not in PAYLOAD_FORMATS:
+            await ctx.send(
+                error(
+                    f"Unknown format. Use one of: {', '.join(f'`{name}`' for name in PAYLOAD_FORMATS)}"
+                )
+            )
+            return
+        await self.config.payload_format.set(payload_format)
+        self.enable_bg_loop(skip_first=True)
+        await ctx.send(
+            success(
+                f"Heartbeat payload format has been set to `{payload_format}` ({PAYLOAD_FORMATS[payload_format]})."
+            )
+        )
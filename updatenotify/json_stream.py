@@ -0,0 +1,111 @@
+"""Incremental parsing of an array inside a (possibly huge) JSON object."""
+
+import codecs
+import json
+from collections.abc import AsyncIterable, AsyncIterator
+from typing import Any
+
+__author__ = "PhasecoreX"
+
+WHITESPACE = " \t\n\r"
+# Characters that can follow the part of a number parsed so far (like "1." or "1e")
+NUMBER_CONTINUATION = frozenset(".eE+-0123456789")
+# (state, structural character) -> next state, or None if parsing is done
+TRANSITIONS = {
+    ("start", "{"): "key",
+    ("comma", ","): "key",
+    ("comma", "}"): None,  # End of the object, the key wasn't found
+    ("array", "["): "item",
+    ("item_comma", ","): "item",
+    ("item_comma", "]"): None,
+}
+
+
+class JsonArrayStream:
+    """Incrementally parse the items of an array stored under a key of a top level JSON object.
+
+    Feed it the document a chunk at a time, and it returns each array item as soon as it has
+    been completely received. Other keys of the object are parsed and thrown away.
+    """
+
+    def __init__(self, key: str) -> None:
+        """Set up a parser for the array under the given key."""
+        self.key = key
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._state = "start"
+        self._current_key = None
+        self.done = False
+
+    def feed(self, chunk: bytes, *, final: bool = False) -> list[Any]:
+        """Add the next chunk of the document, returning any array items that are now complete."""
+        self._buffer += self._utf8.decode(chunk, final=final)
+        items = []
+        while not self.done:
+            self._buffer = self._buffer.lstrip(WHITESPACE)
+            if not self._buffer:
+                break
+            if (self._state, self._buffer[0]) in (("item", "]"), ("key", "}")):
+                # Empty array (or object)
+                self._buffer = self._buffer[1:]
+                self.done = True
+                break
+            if self._state in ("start", "colon", "comma", "array", "item_comma"):
+                self._expect_token(self._buffer[0])
+                self._buffer = self._buffer[1:]
+                continue
+            # "key", "value" or "item": need a whole JSON value
+            try:
+                value, end = self._decoder.raw_decode(self._buffer)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                break  # Wait for more data
+            if (
+                isinstance(value, int | float)
+                and not final
+                and (
+                    end == len(self._buffer) or self._buffer[end] in NUMBER_CONTINUATION
+                )
+            ):
+                break  # The number could continue in the next chunk
+            self._buffer = self._buffer[end:]
+            if self._state == "key":
+                self._current_key = value
+                self._state = "colon"
+            elif self._state == "value":
+                self._state = "comma"
+            else:
+                items.append(value)
+                self._state = "item_comma"
+        return items
+
+    def _expect_token(self, char: str) -> None:
+        """Handle a structural character in the current state."""
+        if self._state == "colon" and char == ":":
+            self._state = "array" if self._current_key == self.key else "value"
+            return
+        if (self._state, char) not in TRANSITIONS:
+            msg = f"Unexpected {char!r} while parsing JSON ({self._state})"
+            raise ValueError(msg)
+        next_state = TRANSITIONS[self._state, char]
+        if next_state is None:
+            self.done = True
+        else:
+            self._state = next_state
+
+
+async def iter_json_array(chunks: AsyncIterable[bytes], key: str) -> AsyncIterator[Any]:
+    """Yield each item of the array under a key of a top level JSON object, as it is received.
+
+    Stop iterating early to avoid reading (and parsing) the rest of the document.
+    """
+    stream = JsonArrayStream(key)
+    async for chunk in chunks:
+        for item in stream.feed(chunk):
+            yield item
+        if stream.done:
+            return
+    for item in stream.feed(b"", final=True):
+        yield item
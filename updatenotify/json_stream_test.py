@@ -0,0 +1,121 @@
+"""Unit tests for json_stream."""
+
+import asyncio
+import json
+import unittest
+from collections.abc import AsyncIterator
+
+import json_stream
+
+DOCUMENT = json.dumps(
+    {
+        "total_count": 12345,
+        "nested": {"workflow_runs": "not this one", "list": [1, {"a": "]}"}]},
+        "workflow_runs": [
+            {"id": 3, "name": "build \\u2764 ❤"},
+            {"id": 2, "name": "test"},
+            {"id": 1, "name": "build"},
+        ],
+        "after": True,
+    }
+).encode()
+
+
+def feed_in_chunks(stream: json_stream.JsonArrayStream, data: bytes, size: int) -> list:
+    """Feed a document to a stream a few bytes at a time, collecting the items returned."""
+    items = []
+    for index in range(0, len(data), size):
+        items += stream.feed(data[index : index + size])
+    items += stream.feed(b"", final=True)
+    return items
+
+
+class Parsing(unittest.TestCase):
+    def test_whole_document(self):
+        stream = json_stream.JsonArrayStream("workflow_runs")
+        items = feed_in_chunks(stream, DOCUMENT, len(DOCUMENT))
+        expected = [3, 2, 1]
+        assert expected == [item["id"] for item in items]
+        assert stream.done
+
+    def test_byte_at_a_time(self):
+        stream = json_stream.JsonArrayStream("workflow_runs")
+        items = feed_in_chunks(stream, DOCUMENT, 1)
+        expected = json.loads(DOCUMENT)["workflow_runs"]
+        assert expected == items
+
+    def test_items_returned_as_soon_as_complete(self):
+        stream = json_stream.JsonArrayStream("workflow_runs")
+        end_of_first_item = DOCUMENT.index(b"}, {") + 1
+        items = stream.feed(DOCUMENT[:end_of_first_item])
+        expected = [3]
+        assert expected == [item["id"] for item in items]
+        assert not stream.done
+
+    def test_number_split_across_chunks(self):
+        stream = json_stream.JsonArrayStream("values")
+        items = feed_in_chunks(stream, b'{"values": [12, 345]}', 3)
+        expected = [12, 345]
+        assert expected == items
+
+    def test_number_split_after_decimal_point(self):
+        stream = json_stream.JsonArrayStream("values")
+        items = stream.feed(b'{"other": 1.')
+        items += stream.feed(b'5, "values": [2.')
+        items += stream.feed(b"5, 3.")
+        items += stream.feed(b"25]}")
+        expected = [2.5, 3.25]
+        assert expected == items
+
+    def test_number_split_after_exponent(self):
+        stream = json_stream.JsonArrayStream("values")
+        items = stream.feed(b'{"values": [1e')
+        items += stream.feed(b"3, 4E-")
+        items += stream.feed(b"1]}")
+        expected = [1000.0, 0.4]
+        assert expected == items
+
+    def test_empty_array(self):
+        stream = json_stream.JsonArrayStream("values")
+        assert feed_in_chunks(stream, b'{"values": [ ], "other": 1}', 1) == []
+        assert stream.done
+
+    def test_missing_key(self):
+        stream = json_stream.JsonArrayStream("values")
+        assert feed_in_chunks(stream, b'{"other": [1, 2]}', 4) == []
+        assert stream.done
+
+    def test_invalid(self):
+        stream = json_stream.JsonArrayStream("values")
+        failed = False
+        try:
+            stream.feed(b'["values"]')
+        except ValueError:
+            failed = True
+        assert failed
+
+
+class AsyncIteration(unittest.TestCase):
+    def test_stops_early(self):
+        chunks_read = []
+
+        async def chunks() -> AsyncIterator[bytes]:
+            for index in range(0, len(DOCUMENT), 10):
+                chunks_read.append(index)
+                yield DOCUMENT[index : index + 10]
+
+        async def first_build() -> dict | None:
+            async for run in json_stream.iter_json_array(chunks(), "workflow_runs"):
+                if run["name"] == "test":
+                    return run
+            return None
+
+        run = asyncio.run(first_build())
+        expected = 2
+        assert expected == run["id"]
+        assert len(chunks_read) < len(DOCUMENT) / 10
+
+
+# Run unit tests from command line
+if __name__ == "__main__":
+    unittest.main()
@@ -5,19 +5,30 @@ import datetime
 import logging
 import os
 from contextlib import suppress
-from typing import ClassVar
+from http import HTTPStatus
+from typing import Any, ClassVar
 
 import aiohttp
 from redbot.core import Config, VersionInfo, checks, commands
+from redbot.core import __version__ as redbot_version_str
 from redbot.core import version_info as redbot_version
 from redbot.core.bot import Red
 from redbot.core.utils.chat_formatting import box, error, humanize_timedelta, success
 
+from .json_stream import iter_json_array
 from .pcx_lib import SettingDisplay
 
+user_agent = f"Red-DiscordBot/{redbot_version_str} UpdateNotify (https://github.com/PhasecoreX/PCXCogs)"
 log = logging.getLogger("red.pcxcogs.updatenotify")
 
 MIN_CHECK_SECONDS = 300.0
+REDBOT_PYPI_URL = "https://pypi.org/pypi/Red-DiscordBot/json"
+DOCKER_GITHUB_RUNS_URL = (
+    "https://api.github.com/repos/phasecorex/docker-red-discordbot/actions/runs"
+)
+# Only the most recent successful master builds are needed
+DOCKER_GITHUB_RUNS_PARAMS = {"branch": "master", "status": "success", "per_page": "20"}
+GITHUB_RUNS_CHUNK_SIZE = 8192
 
 
 class UpdateNotify(commands.Cog):
@@ -28,7 +39,7 @@ class UpdateNotify(commands.Cog):
     """
 
     __author__ = "PhasecoreX"
-    __version__ = "3.1.0"
+    __version__ = "3.3.0"
 
     default_global_settings: ClassVar[dict[str, int | bool]] = {
         "schema_version": 0,
@@ -56,6 +67,9 @@ class UpdateNotify(commands.Cog):
         self.next_check = datetime.datetime.now(datetime.UTC)
         self.bg_loop_task = None
         self.background_tasks = set()
+        self.session = aiohttp.ClientSession(headers={"user-agent": user_agent})
+        # URL -> ETag, Last-Modified and parsed result of the last response, for conditional requests
+        self.response_cache: dict[str, dict[str, Any]] = {}
 
     #
     # Red methods
@@ -65,6 +79,9 @@ class UpdateNotify(commands.Cog):
         """Clean up when cog shuts down."""
         if self.bg_loop_task:
             self.bg_loop_task.cancel()
+        task = asyncio.create_task(self.session.close())
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
 
     def format_help_for_context(self, ctx: commands.Context) -> str:
         """Show version in help."""
@@ -99,6 +116,12 @@ class UpdateNotify(commands.Cog):
             await self.config.clear_raw("version")
             await self.config.schema_version.set(1)
 
+        if schema_version < 2:  # noqa: PLR2004
+            # Remove the run ID cursor, which could skip builds that finished out of order
+            await self.config.clear_raw("docker_last_run_id")
+            await self.config.clear_raw("docker_latest_build")
+            await self.config.schema_version.set(2)
+
     #
     # Background loop methods
     #
@@ -311,51 +334,119 @@ class UpdateNotify(commands.Cog):
                     error("Could not connect to GitHub to check build information.")
                 )
 
-    @staticmethod
-    async def get_latest_redbot_version() -> VersionInfo | None:
+    def _conditional_headers(self, url: str) -> dict[str, str]:
+        """Get the headers needed to only download a response if it changed since last time."""
+        cached = self.response_cache.get(url, {})
+        headers = {}
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+        return headers
+
+    def _cache_response(
+        self, url: str, resp: aiohttp.ClientResponse, result: Any  # noqa: ANN401
+    ) -> None:
+        """Remember the validators and parsed result of a response, for conditional requests."""
+        self.response_cache[url] = {
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "result": result,
+        }
+
+    async def get_latest_redbot_version(self) -> VersionInfo | None:
         """Check PyPI for the latest update to Red-DiscordBot."""
-        url = "https://pypi.org/pypi/Red-DiscordBot/json"
-        async with aiohttp.ClientSession(raise_for_status=True) as session:
-            try:
-                async with session.get(url) as resp:
-                    data = await resp.json()
-                    return VersionInfo.from_str(data["info"]["version"])
-            except aiohttp.ServerConnectionError:
-                log.warning(
-                    "PyPI seems to be having some issues at the moment while checking for the latest Red-DiscordBot "
-                    "update. If this keeps happening, and PyPI is indeed up, consider opening a bug report for this."
-                )
+        url = REDBOT_PYPI_URL
+        try:
+            async with self.session.get(
+                url, headers=self._conditional_headers(url)
+            ) as resp:
+                if (
+                    resp.status == HTTPStatus.NOT_MODIFIED
+                    and url in self.response_cache
+                ):
+                    return self.response_cache[url]["result"]
+                resp.raise_for_status()
+                data = await resp.json()
+                version = VersionInfo.from_str(data["info"]["version"])
+                self._cache_response(url, resp, version)
+                return version
+        except aiohttp.ServerConnectionError:
+            log.warning(
+                "PyPI seems to be having some issues at the moment while checking for the latest Red-DiscordBot "
+                "update. If this keeps happening, and PyPI is indeed up, consider opening a bug report for this."
+            )
+        except aiohttp.ClientResponseError as exc:
+            log.warning(
+                "PyPI returned HTTP %d while checking for the latest Red-DiscordBot update.",
+                exc.status,
+            )
+        return None
 
-    @staticmethod
-    async def get_latest_github_actions_build() -> dict[str, str] | None:
+    async def get_latest_github_actions_build(self) -> dict[str, str] | None:
         """Check GitHub for the latest update to phasecorex/red-discordbot."""
-        url = (
-            "https://api.github.com/repos/phasecorex/docker-red-discordbot/actions/runs"
-        )
-        async with aiohttp.ClientSession(raise_for_status=True) as session:
-            try:
-                async with session.get(url) as resp:
-                    data = await resp.json()
-                    for run in data["workflow_runs"]:
-                        if (
-                            run["event"] in ("push", "repository_dispatch")
-                            and run["name"] == "build"
-                            and run["head_branch"] == "master"
-                            and run["conclusion"] == "success"
-                        ):
-                            build_id = str(run["id"])
-                            commit_sha = run["head_commit"]["id"]
-                            commit_message = run["head_commit"]["message"]
-                            return {
-                                "sha": commit_sha,
-                                "id": build_id,
-                                "message": commit_message,
-                            }
-            except aiohttp.ServerConnectionError:
-                log.warning(
-                    "GitHub seems to be having some issues at the moment while checking for the latest Docker commit. "
-                    "If this keeps happening, and GitHub is indeed up, consider opening a bug report for this."
-                )
+        url = DOCKER_GITHUB_RUNS_URL
+        try:
+            async with self.session.get(
+                url,
+                params=DOCKER_GITHUB_RUNS_PARAMS,
+                headers={
+                    "Accept": "application/vnd.github+json",
+                    **self._conditional_headers(url),
+                },
+            ) as resp:
+                # Unchanged responses don't count against GitHub's rate limit
+                if (
+                    resp.status == HTTPStatus.NOT_MODIFIED
+                    and url in self.response_cache
+                ):
+                    return self.response_cache[url]["result"]
+                resp.raise_for_status()
+                build = None
+                # Runs are newest first, so stop reading as soon as the latest build is found
+                async for run in iter_json_array(
+                    resp.content.iter_chunked(GITHUB_RUNS_CHUNK_SIZE), "workflow_runs"
+                ):
+                    if (
+                        run["event"] in ("push", "repository_dispatch")
+                        and run["name"] == "build"
+                        and run["head_branch"] == "master"
+                        and run["conclusion"] == "success"
+                    ):
+                        build = {
+                            "sha": run["head_commit"]["id"],
+                            "id": str(run["id"]),
+                            "message": run["head_commit"]["message"],
+                        }
+                        break
+                self._cache_response(url, resp, build)
+                return build
+        except aiohttp.ServerConnectionError:
+            log.warning(
+                "GitHub seems to be having some issues at the moment while checking for the latest Docker commit. "
+                "If this keeps happening, and GitHub is indeed up, consider opening a bug report for this."
+            )
+        except aiohttp.ClientResponseError as exc:
+            log.warning(
+                "GitHub returned HTTP %d while checking for the latest Docker commit (rate limited?).",
+                exc.status,
+            )
+        except ValueError as exc:
+            log.warning(
+                "GitHub returned invalid JSON while checking for the latest Docker commit: %s",
+                exc,
+            )
+        return None
+
+    async def _get_latest_redbot_version_if_enabled(self) -> VersionInfo | None:
+        if not await self.config.check_red_discordbot():
+            return None
+        return await self.get_latest_redbot_version()
+
+    async def _get_latest_docker_build_if_enabled(self) -> dict[str, str] | None:
+        if not self.docker_commit or not await self.config.check_pcx_docker():
+            return None
+        return await self.get_latest_github_actions_build()
 
     async def update_check(self, *, manual: bool = False) -> str:
         """Check for all updates."""
@@ -364,11 +455,13 @@ class UpdateNotify(commands.Cog):
             self.notified_docker_commit = self.docker_commit
             self.notified_docker_build = self.docker_build
 
-        latest_redbot_version = None
         if not self.notified_version:
             self.notified_version = redbot_version
-        if await self.config.check_red_discordbot():
-            latest_redbot_version = await self.get_latest_redbot_version()
+        # Check PyPI and GitHub at the same time
+        latest_redbot_version, latest_docker_build = await asyncio.gather(
+            self._get_latest_redbot_version_if_enabled(),
+            self._get_latest_docker_build_if_enabled(),
+        )
         update_redbot = (
             latest_redbot_version and self.notified_version < latest_redbot_version
         )
@@ -378,16 +471,13 @@ class UpdateNotify(commands.Cog):
 
         update_docker_commit = False
         update_docker_build = False
-        latest_docker_build = None
-        if self.docker_commit and await self.config.check_pcx_docker():
-            latest_docker_build = await self.get_latest_github_actions_build()
-            if latest_docker_build:
-                update_docker_commit = (
-                    self.notified_docker_commit != latest_docker_build["sha"]
-                )
-                update_docker_build = (
-                    self.notified_docker_build != latest_docker_build["id"]
-                )
+        if latest_docker_build:
+            update_docker_commit = (
+                self.notified_docker_commit != latest_docker_build["sha"]
+            )
+            update_docker_build = (
+                self.notified_docker_build != latest_docker_build["id"]
+            )
 
         message = ""
 
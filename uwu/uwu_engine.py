@@ -0,0 +1,214 @@
+"""The text conversion behind UwU, compiled for speed."""
+
+# ruff: noqa: S311
+import random
+import re
+from collections import defaultdict
+from functools import lru_cache
+from itertools import accumulate
+
+__author__ = "PhasecoreX"
+
+KAOMOJI_JOY = [
+    " (\\* ^ ω ^)",
+    " (o^▽^o)",
+    " (≧◡≦)",
+    ' ☆⌒ヽ(\\*"､^\\*)chu',
+    " ( ˘⌣˘)♡(˘⌣˘ )",
+    " xD",
+]
+KAOMOJI_EMBARRASSED = [
+    " (/ />/ ▽ /</ /)..",
+    " (\\*^.^\\*)..,",
+    "..,",
+    ",,,",
+    "... ",
+    ".. ",
+    " mmm..",
+    "O.o",
+]
+KAOMOJI_CONFUSE = [
+    " (o_O)?",
+    " (°ロ°) !?",
+    " (ーー;)?",
+    " owo?",
+]
+KAOMOJI_SPARKLES = [
+    " \\*:･ﾟ✧\\*:･ﾟ✧ ",
+    " ☆\\*:・ﾟ ",
+    "〜☆ ",
+    " uguu.., ",
+    "-.-",
+]
+
+# Final punctuation -> (chance of being replaced with a kaomoji, kaomoji to choose from)
+PUNCTUATION_KAOMOJI = {
+    ".": (1 / 4, KAOMOJI_JOY),
+    "?": (1 / 3, KAOMOJI_CONFUSE),
+    "!": (1 / 3, KAOMOJI_JOY),
+    ",": (1 / 4, KAOMOJI_EMBARRASSED),
+}
+# Chance of any final punctuation being replaced with sparkles (even if it was already a kaomoji)
+SPARKLES_CHANCE = 1 / 5
+STUTTER_CHANCE = 1 / 7
+STUTTER_MIN_LENGTH = 3
+
+WORD_EXCEPTIONS = {
+    "you're": "ur",
+    "youre": "ur",
+    "fuck": "fwickk",
+    "shit": "poopoo",
+    "bitch": "meanie",
+    "asshole": "b-butthole",
+    "dick": "peenie",
+    "penis": "peenie",
+    "cum": "cummies",
+    "semen": "cummies",
+    "ass": "b-butt",
+    "dad": "daddy",
+    "father": "daddy",
+}
+# Word endings that are protected from changes
+PROTECTED_ENDINGS = (("le", "ll", "er", "re"), ("les", "lls", "ers", "res"))
+# l -> w, r -> w, n<vowel> -> ny<vowel>, ove -> uv
+SOUNDS = {"l": "w", "r": "w", "n": "ny", "ove": "uv"}
+SOUNDS_RE = re.compile(r"[lr]|n(?=[aeiou])|ove")
+WORD_RE = re.compile(r"(\S+)")
+
+
+@lru_cache(maxsize=4096)
+def convert_word(word: str) -> tuple[str, str, str]:
+    """Do the parts of uwuizing a word that aren't random.
+
+    Returns the converted word, its extra punctuation, and its final punctuation.
+    """
+    word = word.lower()
+    uwu = word.rstrip(".?!,")
+    punctuations = word[len(uwu) :]
+    final_punctuation = punctuations[-1:]
+    extra_punctuation = punctuations[:-1]
+
+    if uwu in WORD_EXCEPTIONS:
+        uwu = WORD_EXCEPTIONS[uwu]
+    else:
+        protected = ""
+        for length, endings in enumerate(PROTECTED_ENDINGS, start=2):
+            if uwu.endswith(endings):
+                protected = uwu[-length:]
+                uwu = uwu[:-length]
+                break
+        uwu = SOUNDS_RE.sub(lambda match: SOUNDS[match[0]], uwu) + protected
+    return uwu, extra_punctuation, final_punctuation
+
+
+def _can_stutter(uwu: str) -> bool:
+    return len(uwu) >= STUTTER_MIN_LENGTH and uwu[0].isalpha() and "-" not in uwu
+
+
+def _punctuation_outcomes(punctuation: str) -> tuple[list[str], list[float]]:
+    """Get what a final punctuation can turn into, and the cumulative chance of each."""
+    kaomoji_chance, kaomoji = PUNCTUATION_KAOMOJI[punctuation]
+    kept_chance = 1 - SPARKLES_CHANCE
+    chances = [
+        kept_chance * (1 - kaomoji_chance),
+        *([kept_chance * kaomoji_chance / len(kaomoji)] * len(kaomoji)),
+        *([SPARKLES_CHANCE / len(KAOMOJI_SPARKLES)] * len(KAOMOJI_SPARKLES)),
+    ]
+    return [punctuation, *kaomoji, *KAOMOJI_SPARKLES], list(accumulate(chances))
+
+
+PUNCTUATION_OUTCOMES = {
+    punctuation: _punctuation_outcomes(punctuation)
+    for punctuation in PUNCTUATION_KAOMOJI
+}
+
+
+class UwUEngine:
+    """Uwuize text.
+
+    All random choices for a string are drawn in a few batches from `rng`,
+    which can be seeded for repeatable output.
+    """
+
+    def __init__(self, rng: random.Random | None = None) -> None:
+        """Set up the engine, optionally with a specific random number generator."""
+        self.rng = rng or random.Random()
+
+    def uwuize_string(self, string: str) -> str:
+        """Uwuize and return a string."""
+        tokens = self._tokenize(string)
+        converted = [convert_word(word) for word in tokens[1::2]]
+        self._randomize(converted)
+        tokens[1::2] = ["".join(parts) for parts in converted]
+        return "".join(tokens)
+
+    def uwuize_word(self, word: str) -> str:
+        """Uwuize and return a word.
+
+        Thank you to the following for inspiration:
+        https://github.com/senguyen1011/UwUinator
+        """
+        converted = [convert_word(word)]
+        self._randomize(converted)
+        return "".join(converted[0])
+
+    @staticmethod
+    def _tokenize(string: str) -> list[str]:
+        """Split a string into alternating separators and words.
+
+        The first and last tokens are (possibly empty) separators.
+        Words are split by whitespace and unprintable characters.
+        """
+        parts = WORD_RE.split(string)
+        tokens = [parts[0]]
+        for word, separator in zip(parts[1::2], parts[2::2], strict=True):
+            if word.isprintable():
+                tokens += (word, separator)
+                continue
+            # Rare, so it's fine to go through these one letter at a time
+            current_word = ""
+            for letter in word:
+                if letter.isprintable():
+                    current_word += letter
+                elif current_word:
+                    tokens += (current_word, letter)
+                    current_word = ""
+                else:
+                    tokens[-1] += letter
+            if current_word:
+                tokens += (current_word, separator)
+            else:
+                tokens[-1] += separator
+        return tokens
+
+    def _randomize(self, converted: list[tuple[str, str, str]]) -> None:
+        """Add random stutters and kaomoji to converted words, in place."""
+        stutterable = [
+            index for index, (uwu, _, _) in enumerate(converted) if _can_stutter(uwu)
+        ]
+        stutters = self.rng.choices(
+            (False, True),
+            cum_weights=(1 - STUTTER_CHANCE, 1),
+            k=len(stutterable),
+        )
+        for index, stutter in zip(stutterable, stutters, strict=True):
+            if stutter:
+                uwu, extra_punctuation, final_punctuation = converted[index]
+                converted[index] = (
+                    f"{uwu[0]}-{uwu}",
+                    extra_punctuation,
+                    final_punctuation,
+                )
+
+        by_punctuation = defaultdict(list)
+        for index, (_, _, final_punctuation) in enumerate(converted):
+            if final_punctuation in PUNCTUATION_OUTCOMES:
+                by_punctuation[final_punctuation].append(index)
+        for punctuation, indexes in by_punctuation.items():
+            outcomes, cum_weights = PUNCTUATION_OUTCOMES[punctuation]
+            choices = self.rng.choices(
+                outcomes, cum_weights=cum_weights, k=len(indexes)
+            )
+            for index, choice in zip(indexes, choices, strict=True):
+                uwu, extra_punctuation, _ = converted[index]
+                converted[index] = (uwu, extra_punctuation, choice)
@@ -0,0 +1,169 @@
+"""Unit tests for uwu_engine."""
+
+# ruff: noqa: S311
+import random
+import unittest
+
+import uwu_engine
+
+TEXT = (
+    "Hello there, my friend! Are you ready?? I LOVE the lovely novel...\n"
+    "  You're a REAL one, dad. Father knows... the onion pannier is Nice!?,\n"
+    "\tbottles, littles and cheaters. youre\x00joking\u200b\x07 -- ok?  "
+    "Ümlaut ñandú naïve 123 !!! ?.. ass, shit. (parenthesized words) end"
+)
+# How different the chance of something happening may be from the original implementation
+ODDS_TOLERANCE = 0.01
+
+
+class ReferenceUwU:
+    """The original UwU implementation, with a replaceable random number generator."""
+
+    def __init__(self, rng: random.Random) -> None:
+        """Use the given random number generator."""
+        self.rng = rng
+
+    def uwuize_string(self, string: str) -> str:
+        """Uwuize and return a string."""
+        converted = ""
+        current_word = ""
+        for letter in string:
+            if letter.isprintable() and not letter.isspace():
+                current_word += letter
+            elif current_word:
+                converted += self.uwuize_word(current_word) + letter
+                current_word = ""
+            else:
+                converted += letter
+        if current_word:
+            converted += self.uwuize_word(current_word)
+        return converted
+
+    def uwuize_word(self, word: str) -> str:
+        """Uwuize and return a word."""
+        word = word.lower()
+        uwu = word.rstrip(".?!,")
+        punctuations = word[len(uwu) :]
+        final_punctuation = punctuations[-1] if punctuations else ""
+        extra_punctuation = punctuations[:-1] if punctuations else ""
+
+        if final_punctuation == "." and not self.rng.randint(0, 3):
+            final_punctuation = self.rng.choice(uwu_engine.KAOMOJI_JOY)
+        if final_punctuation == "?" and not self.rng.randint(0, 2):
+            final_punctuation = self.rng.choice(uwu_engine.KAOMOJI_CONFUSE)
+        if final_punctuation == "!" and not self.rng.randint(0, 2):
+            final_punctuation = self.rng.choice(uwu_engine.KAOMOJI_JOY)
+        if final_punctuation == "," and not self.rng.randint(0, 3):
+            final_punctuation = self.rng.choice(uwu_engine.KAOMOJI_EMBARRASSED)
+        if final_punctuation and not self.rng.randint(0, 4):
+            final_punctuation = self.rng.choice(uwu_engine.KAOMOJI_SPARKLES)
+
+        if uwu in ("you're", "youre"):
+            uwu = "ur"
+        elif uwu == "fuck":
+            uwu = "fwickk"
+        elif uwu == "shit":
+            uwu = "poopoo"
+        elif uwu == "bitch":
+            uwu = "meanie"
+        elif uwu == "asshole":
+            uwu = "b-butthole"
+        elif uwu in ("dick", "penis"):
+            uwu = "peenie"
+        elif uwu in ("cum", "semen"):
+            uwu = "cummies"
+        elif uwu == "ass":
+            uwu = "b-butt"
+        elif uwu in ("dad", "father"):
+            uwu = "daddy"
+        else:
+            protected = ""
+            if uwu.endswith(("le", "ll", "er", "re")):
+                protected = uwu[-2:]
+                uwu = uwu[:-2]
+            elif uwu.endswith(("les", "lls", "ers", "res")):
+                protected = uwu[-3:]
+                uwu = uwu[:-3]
+            uwu = (
+                uwu.replace("l", "w")
+                .replace("r", "w")
+                .replace("na", "nya")
+                .replace("ne", "nye")
+                .replace("ni", "nyi")
+                .replace("no", "nyo")
+                .replace("nu", "nyu")
+                .replace("ove", "uv")
+                + protected
+            )
+
+        if (
+            len(uwu) > 2  # noqa: PLR2004
+            and uwu[0].isalpha()
+            and "-" not in uwu
+            and not self.rng.randint(0, 6)
+        ):
+            uwu = f"{uwu[0]}-{uwu}"
+
+        return uwu + extra_punctuation + final_punctuation
+
+
+class NeverRandom(random.Random):
+    def randint(self, _a: int, b: int) -> int:
+        return b
+
+    def choices(self, population: list, **kwargs: int) -> list:
+        return [population[0]] * kwargs["k"]
+
+
+class AlwaysRandom(random.Random):
+    def randint(self, a: int, _b: int) -> int:
+        return a
+
+    def choice(self, seq: list) -> str:
+        return seq[-1]
+
+    def choices(self, population: list, **kwargs: int) -> list:
+        return [population[-1]] * kwargs["k"]
+
+
+class SameAsReference(unittest.TestCase):
+    def test_without_randomness(self):
+        expected = ReferenceUwU(NeverRandom()).uwuize_string(TEXT)
+        assert expected == uwu_engine.UwUEngine(NeverRandom()).uwuize_string(TEXT)
+
+    def test_with_all_randomness(self):
+        expected = ReferenceUwU(AlwaysRandom()).uwuize_string(TEXT)
+        assert expected == uwu_engine.UwUEngine(AlwaysRandom()).uwuize_string(TEXT)
+
+    def test_word(self):
+        for word in ("Hello!", "lovely,", "you're...", "knee", "bottles"):
+            expected = ReferenceUwU(NeverRandom()).uwuize_word(word)
+            assert expected == uwu_engine.UwUEngine(NeverRandom()).uwuize_word(word)
+
+    def test_edge_cases(self):
+        for string in ("", " ", "\x00", "word", " \x00word\x00 ", "a\n\nb\x00\x00c"):
+            expected = ReferenceUwU(NeverRandom()).uwuize_string(string)
+            assert expected == uwu_engine.UwUEngine(NeverRandom()).uwuize_string(string)
+
+
+class Randomness(unittest.TestCase):
+    def test_seeded_output_repeats(self):
+        first = uwu_engine.UwUEngine(random.Random(1234)).uwuize_string(TEXT)
+        second = uwu_engine.UwUEngine(random.Random(1234)).uwuize_string(TEXT)
+        assert first == second
+
+    def test_same_odds_as_reference(self):
+        text = "hello. what? wow! well, " * 2000
+        engine = uwu_engine.UwUEngine(random.Random(1)).uwuize_string(text)
+        reference = ReferenceUwU(random.Random(1)).uwuize_string(text)
+        words = len(text.split())
+        for kaomoji in ("h-hello", "w-what", "w-wow", " owo?", " xD", "-.-", ",,,"):
+            expected = reference.count(kaomoji) / words
+            assert (
+                abs(expected - engine.count(kaomoji) / words) < ODDS_TOLERANCE
+            ), kaomoji
+
+
+# Run unit tests from command line
+if __name__ == "__main__":
+    unittest.main()
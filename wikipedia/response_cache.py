@@ -0,0 +1,124 @@
+"""A bounded, expiring cache of Wikipedia API responses that can be saved to disk."""
+
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+__author__ = "PhasecoreX"
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query, so that queries giving the same results share a cache entry."""
+    return " ".join(query.casefold().split())
+
+
+class ResponseCache:
+    """A bounded least-recently-used cache where every entry expires after `ttl` seconds.
+
+    Expiry times use the wall clock (by default), so that a saved cache can be loaded
+    again after a restart. Values must be JSON serializable to be saved.
+    """
+
+    def __init__(
+        self, max_size: int, ttl: float, *, clock: Callable[[], float] = time.time
+    ) -> None:
+        """Create an empty cache holding at most max_size entries."""
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Any:  # noqa: ANN401
+        """Get a value from the cache, or None if it is missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires, value = entry
+        if expires <= self._clock():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:  # noqa: ANN401
+        """Store a value in the cache, evicting the least recently used entries if full."""
+        if self.max_size <= 0:
+            return
+        self._entries[key] = (self._clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> int:
+        """Remove all entries from the cache. Returns the number of entries removed."""
+        count = len(self._entries)
+        self._entries.clear()
+        return count
+
+    def reset_stats(self) -> None:
+        """Reset all hit/miss counters."""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Get the fraction of lookups that were served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self) -> int:
+        """Count of how many entries are in the cache (some may have expired)."""
+        return len(self._entries)
+
+    #
+    # Persistence
+    #
+
+    def save(self, path: Path) -> int:
+        """Write all unexpired entries to a file. Returns the number of entries written."""
+        now = self._clock()
+        entries = [
+            [key, expires, value]
+            for key, (expires, value) in self._entries.items()
+            if expires > now
+        ]
+        temp_path = path.with_suffix(".tmp")
+        with temp_path.open("w", encoding="utf-8") as file:
+            json.dump(entries, file, separators=(",", ":"))
+        temp_path.replace(path)
+        return len(entries)
+
+    def load(self, path: Path) -> int:
+        """Add the unexpired entries saved in a file. Returns the number of entries added.
+
+        A missing or unreadable file is treated as an empty cache.
+        """
+        try:
+            with path.open(encoding="utf-8") as file:
+                entries = json.load(file)
+        except (OSError, ValueError):
+            return 0
+        now = self._clock()
+        loaded = 0
+        # Saved least recently used first, so the LRU order is kept
+        for key, expires, value in entries:
+            if expires > now and key not in self._entries:
+                self._entries[key] = (expires, value)
+                loaded += 1
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return loaded
@@ -0,0 +1,107 @@
+"""Unit tests for response_cache."""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import response_cache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        """Start the clock at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class NormalizeQuery(unittest.TestCase):
+    def test_case_and_whitespace(self):
+        expected = "red discordbot"
+        assert expected == response_cache.normalize_query("  Red \n DiscordBot ")
+
+
+class Caching(unittest.TestCase):
+    def test_hit_before_ttl(self):
+        clock = FakeClock()
+        cache = response_cache.ResponseCache(10, 30, clock=clock)
+        cache.set("key", {"pages": []})
+        clock.now = 29.9
+        expected = {"pages": []}
+        assert expected == cache.get("key")
+        assert cache.hits == 1
+        assert cache.misses == 0
+
+    def test_miss_after_ttl(self):
+        clock = FakeClock()
+        cache = response_cache.ResponseCache(10, 30, clock=clock)
+        cache.set("key", "value")
+        clock.now = 30
+        assert cache.get("key") is None
+        assert cache.misses == 1
+        assert cache.expirations == 1
+        assert len(cache) == 0
+
+    def test_least_recently_used_evicted(self):
+        cache = response_cache.ResponseCache(2, 30, clock=FakeClock())
+        cache.set("first", 1)
+        cache.set("second", 2)
+        cache.get("first")
+        cache.set("third", 3)
+        assert cache.get("second") is None
+        expected = 1
+        assert expected == cache.get("first")
+        assert cache.evictions == 1
+
+
+class Persistence(unittest.TestCase):
+    def setUp(self) -> None:
+        """Create a temporary folder to save caches in."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "cache.json"
+
+    def tearDown(self) -> None:
+        """Clean up the temporary folder."""
+        self.temp_dir.cleanup()
+
+    def test_round_trip(self):
+        clock = FakeClock()
+        cache = response_cache.ResponseCache(10, 30, clock=clock)
+        cache.set("expiring", 1)
+        clock.now = 20
+        cache.set("key", {"pages": [{"title": "Red"}]})
+        clock.now = 40
+        expected = 1
+        assert expected == cache.save(self.path)
+
+        loaded = response_cache.ResponseCache(10, 30, clock=clock)
+        assert expected == loaded.load(self.path)
+        expected = {"pages": [{"title": "Red"}]}
+        assert expected == loaded.get("key")
+        clock.now = 50
+        assert loaded.get("key") is None
+
+    def test_load_keeps_most_recently_used(self):
+        clock = FakeClock()
+        cache = response_cache.ResponseCache(10, 30, clock=clock)
+        for key in ("first", "second", "third"):
+            cache.set(key, key)
+        cache.get("first")
+        cache.save(self.path)
+
+        loaded = response_cache.ResponseCache(2, 30, clock=clock)
+        loaded.load(self.path)
+        assert loaded.get("second") is None
+        expected = "first"
+        assert expected == loaded.get("first")
+
+    def test_load_missing_file(self):
+        cache = response_cache.ResponseCache(10, 30, clock=FakeClock())
+        assert cache.load(self.path) == 0
+        assert len(cache) == 0
+
+
+# Run unit tests from command line
+if __name__ == "__main__":
+    unittest.main()
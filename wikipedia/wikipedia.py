@@ -1,34 +1,120 @@
 """Wikipedia cog for Red-DiscordBot ported by PhasecoreX."""
 
+import asyncio
+import functools
+import logging
 import re
-from contextlib import suppress
-from typing import Any
+from typing import Any, ClassVar
 
 import aiohttp
 import discord
 from dateutil.parser import isoparse
+from redbot.core import Config, checks, commands
 from redbot.core import __version__ as redbot_version
-from redbot.core import commands
-from redbot.core.utils.chat_formatting import error, warning
-from redbot.core.utils.menus import DEFAULT_CONTROLS, menu
+from redbot.core.data_manager import cog_data_path
+from redbot.core.utils.chat_formatting import error, success, warning
+from redbot.core.utils.menus import close_menu, menu
+
+from .pcx_lib import SettingDisplay
+from .response_cache import ResponseCache, normalize_query
+
+log = logging.getLogger("red.pcxcogs.wikipedia")
 
 MAX_DESCRIPTION_LENGTH = 1000
+WIKIPEDIA_API_URL = "https://en.wikipedia.org/w/api.php"
+RESPONSE_CACHE_MAX_SIZE = 200
+RESPONSE_CACHE_TTL_SECONDS = 3600
+RESPONSE_CACHE_FILENAME = "response_cache.json"
+# Results fetched per request; more are fetched as the user pages through them
+SEARCH_BATCH_SIZE = 5
+PAGE_RECORD_KEYS = ("title", "extract", "fullurl", "original", "revisions")
+
+
+class SearchResults:
+    """The pages found on Wikipedia for a query, fetching more of them as they are needed.
+
+    Embeds are only generated for the results that are actually shown.
+    """
+
+    def __init__(self, cog: "Wikipedia", query: str) -> None:
+        """Set up an empty list of results for a query."""
+        self.cog = cog
+        self.query = query
+        self.pages: list[dict[str, Any]] = []
+        self.embeds: list[discord.Embed] = []
+        # None once every result has been fetched
+        self.continue_params: dict[str, str] | None = {}
+
+    @property
+    def exhausted(self) -> bool:
+        """Check if every result has been fetched."""
+        return self.continue_params is None
+
+    async def get(self, index: int) -> dict[str, Any] | None:
+        """Get the page record of a result, or None if there aren't that many results."""
+        while index >= len(self.pages) and self.continue_params is not None:
+            pages, self.continue_params = await self.cog.perform_search(
+                self.query, self.continue_params
+            )
+            self.pages += pages
+        return self.pages[index] if index < len(self.pages) else None
+
+    async def get_embed(self, index: int) -> discord.Embed | None:
+        """Get the embed of a result, or None if there aren't that many results."""
+        while len(self.embeds) <= index:
+            page = await self.get(len(self.embeds))
+            if page is None:
+                return None
+            self.embeds.append(self.cog.generate_embed(page))
+        embed = self.embeds[index]
+        total = f" of {len(self.pages)}" if self.exhausted else ""
+        embed.set_author(name=f"Result {index + 1}{total}")
+        return embed
 
 
 class Wikipedia(commands.Cog):
     """Look up stuff on Wikipedia."""
 
     __author__ = "PhasecoreX"
-    __version__ = "3.1.0"
+    __version__ = "3.3.0"
 
     DISAMBIGUATION_CAT = "Category:All disambiguation pages"
     WHITESPACE = re.compile(r"[\n\s]{4,}")
     NEWLINES = re.compile(r"\n+")
 
+    default_global_settings: ClassVar[dict[str, bool]] = {
+        "persist_cache": False,
+    }
+
+    def __init__(self) -> None:
+        """Set up the cog."""
+        super().__init__()
+        self.config = Config.get_conf(
+            self, identifier=1224364860, force_registration=True
+        )
+        self.config.register_global(**self.default_global_settings)
+        self.session = aiohttp.ClientSession(
+            headers={"user-agent": "Red-DiscordBot/" + redbot_version}
+        )
+        # Normalized query -> API response, as popular lookups repeat constantly
+        self.response_cache = ResponseCache(
+            RESPONSE_CACHE_MAX_SIZE, RESPONSE_CACHE_TTL_SECONDS
+        )
+        self.persist_cache = False
+        self.background_tasks = set()
+
     #
     # Red methods
     #
 
+    def cog_unload(self) -> None:
+        """Clean up when cog shuts down."""
+        if self.persist_cache:
+            self._save_response_cache()
+        task = asyncio.create_task(self.session.close())
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+
     def format_help_for_context(self, ctx: commands.Context) -> str:
         """Show version in help."""
         pre_processed = super().format_help_for_context(ctx)
@@ -38,6 +124,86 @@ class Wikipedia(commands.Cog):
         """Nothing to delete."""
         return
 
+    #
+    # Initialization methods
+    #
+
+    async def initialize(self) -> None:
+        """Perform setup actions before loading cog."""
+        self.persist_cache = await self.config.persist_cache()
+        if self.persist_cache:
+            loaded = await asyncio.to_thread(
+                self.response_cache.load,
+                cog_data_path(self) / RESPONSE_CACHE_FILENAME,
+            )
+            log.debug("Loaded %d cached Wikipedia responses from disk", loaded)
+
+    def _save_response_cache(self) -> None:
+        """Save the response cache to disk, so that it survives restarts."""
+        try:
+            self.response_cache.save(cog_data_path(self) / RESPONSE_CACHE_FILENAME)
+        except OSError:
+            log.exception("Could not save the Wikipedia response cache to disk")
+
+    #
+    # Command methods: wikipediaset
+    #
+
+    @commands.group()
+    @checks.is_owner()
+    async def wikipediaset(self, ctx: commands.Context) -> None:
+        """Manage Wikipedia settings."""
+
+    @wikipediaset.group(name="cache")
+    async def wikipediaset_cache(self, ctx: commands.Context) -> None:
+        """Manage the Wikipedia response cache."""
+
+    @wikipediaset_cache.command(name="stats")
+    async def wikipediaset_cache_stats(self, ctx: commands.Context) -> None:
+        """Display response cache statistics."""
+        cache_section = SettingDisplay("Response Cache")
+        cache_section.add(
+            "Entries", f"{len(self.response_cache)}/{self.response_cache.max_size}"
+        )
+        cache_section.add("Hits", self.response_cache.hits)
+        cache_section.add("Misses", self.response_cache.misses)
+        cache_section.add("Hit rate", f"{self.response_cache.hit_rate:.1%}")
+        cache_section.add("Expired", self.response_cache.expirations)
+        cache_section.add("Evicted", self.response_cache.evictions)
+        cache_section.add("Cache duration", f"{self.response_cache.ttl} seconds")
+        cache_section.add(
+            "Saved to disk", "Enabled" if self.persist_cache else "Disabled"
+        )
+        await ctx.send(str(cache_section))
+
+    @wikipediaset_cache.command(name="clear")
+    async def wikipediaset_cache_clear(self, ctx: commands.Context) -> None:
+        """Clear all cached responses and reset statistics."""
+        count = self.response_cache.clear()
+        self.response_cache.reset_stats()
+        if self.persist_cache:
+            await asyncio.to_thread(self._save_response_cache)
+        await ctx.send(
+            success(
+                f"Cleared {count} cached {'response' if count == 1 else 'responses'}."
+            )
+        )
+
+    @wikipediaset_cache.command(name="persist")
+    async def wikipediaset_cache_persist(self, ctx: commands.Context) -> None:
+        """Toggle saving the response cache to disk, so that it survives restarts."""
+        self.persist_cache = not self.persist_cache
+        await self.config.persist_cache.set(self.persist_cache)
+        if self.persist_cache:
+            await asyncio.to_thread(self._save_response_cache)
+        else:
+            (cog_data_path(self) / RESPONSE_CACHE_FILENAME).unlink(missing_ok=True)
+        await ctx.send(
+            success(
+                f"Saving the response cache to disk is now {'enabled' if self.persist_cache else 'disabled'}."
+            )
+        )
+
     #
     # Command methods
     #
@@ -56,47 +222,89 @@ class Wikipedia(commands.Cog):
             can_not_read_history = not ctx.channel.permissions_for(
                 ctx.me
             ).read_message_history
-        only_first_result = (
-            can_not_embed_links or can_not_add_reactions or can_not_read_history
-        )
+        results = SearchResults(self, query)
         async with ctx.typing():
-            embeds, url = await self.perform_search(
-                query, only_first_result=only_first_result
-            )
+            first_result = await results.get(0)
 
-        if not embeds:
+        if first_result is None:
             await ctx.send(
                 error(f"I'm sorry, I couldn't find \"{query}\" on Wikipedia")
             )
         elif can_not_embed_links:
             await ctx.send(
                 warning(
-                    f"I'm not allowed to do embeds here, so here's the first result:\n{url}"
+                    f"I'm not allowed to do embeds here, so here's the first result:\n{first_result['fullurl']}"
                 )
             )
         elif can_not_add_reactions:
-            embeds[0].set_author(
+            embed = self.generate_embed(first_result)
+            embed.set_author(
                 name="Result 1 (I need add reactions permission to show more)"
             )
-            await ctx.send(embed=embeds[0])
+            await ctx.send(embed=embed)
         elif can_not_read_history:
-            embeds[0].set_author(
+            embed = self.generate_embed(first_result)
+            embed.set_author(
                 name="Result 1 (I need read message history permission to show more)"
             )
-            await ctx.send(embed=embeds[0])
-        elif len(embeds) == 1:
-            embeds[0].set_author(name="Result 1 of 1")
-            await ctx.send(embed=embeds[0])
+            await ctx.send(embed=embed)
+        elif await results.get(1) is None:
+            await ctx.send(embed=await results.get_embed(0))
         else:
-            for count, embed in enumerate(embeds):
-                embed.set_author(name=f"Result {count + 1} of {len(embeds)}")
-            await menu(ctx, embeds, DEFAULT_CONTROLS, timeout=60.0)
+            await menu(
+                ctx,
+                [await results.get_embed(0)],
+                {
+                    "\N{LEFTWARDS BLACK ARROW}\N{VARIATION SELECTOR-16}": functools.partial(
+                        self._turn_menu_page, results, -1
+                    ),
+                    "\N{CROSS MARK}": close_menu,
+                    "\N{BLACK RIGHTWARDS ARROW}\N{VARIATION SELECTOR-16}": functools.partial(
+                        self._turn_menu_page, results, 1
+                    ),
+                },
+                timeout=60.0,
+            )
+
+    async def _turn_menu_page(
+        self,
+        results: SearchResults,
+        step: int,
+        ctx: commands.Context,
+        _pages: list[discord.Embed],
+        controls: dict,
+        message: discord.Message,
+        page: int,
+        timeout: float,  # noqa: ASYNC109 (menu control signature)
+        _emoji: str,
+        *,
+        user: discord.User | None = None,
+    ) -> None:
+        """Show the previous or next result, generating its embed (and fetching it) if needed."""
+        page += step
+        if page < 0:
+            # Loop around to the last result, but only if it is known
+            page = len(results.pages) - 1 if results.exhausted else 0
+        if await results.get_embed(page) is None:
+            page = 0  # Loop around to the first result
+            await results.get_embed(page)
+        await menu(
+            ctx,
+            list(results.embeds),
+            controls,
+            message=message,
+            page=page,
+            timeout=timeout,
+            user=user,
+        )
 
     #
     # Public methods
     #
 
-    def generate_payload(self, query: str) -> dict[str, str]:
+    def generate_payload(
+        self, query: str, continue_params: dict[str, str] | None = None
+    ) -> dict[str, str]:
         """Generate the payload for Wikipedia based on a query string."""
         query_tokens = query.split()
         return {
@@ -111,6 +319,7 @@ class Wikipedia(commands.Cog):
             "prop": "extracts|info|pageimages|revisions|categories",  # Which properties to get
             # action:query/generator:search options
             "gsrsearch": f"intitle:{' intitle:'.join(query_tokens)}",  # Search for page titles
+            "gsrlimit": str(SEARCH_BATCH_SIZE),  # How many results to return
             # action:query/prop:extracts options
             "exintro": "1",  # Return only content before the first section
             "explaintext": "1",  # Return extracts as plain text
@@ -122,38 +331,54 @@ class Wikipedia(commands.Cog):
             "rvprop": "timestamp",  # Return timestamp of last revision
             # action:query/prop:revisions options
             "clcategories": self.DISAMBIGUATION_CAT,  # Only list this category
+            # Where the previous request left off, if this is continuing a search
+            **(continue_params or {}),
         }
 
     async def perform_search(
-        self, query: str, *, only_first_result: bool = False
-    ) -> tuple[list[discord.Embed], str | None]:
-        """Query Wikipedia."""
-        payload = self.generate_payload(query)
-        async with aiohttp.ClientSession() as session, session.get(
-            "https://en.wikipedia.org/w/api.php",
-            params=payload,
-            headers={"user-agent": "Red-DiscordBot/" + redbot_version},
-        ) as res:
-            result = await res.json()
-
-        embeds = []
+        self, query: str, continue_params: dict[str, str] | None = None
+    ) -> tuple[list[dict[str, Any]], dict[str, str] | None]:
+        """Query Wikipedia for the next batch of results.
+
+        Returns the page records found, and the parameters to continue the search with
+        (or None if there are no more results).
+        """
+        cache_key = "\n".join(
+            [
+                normalize_query(query),
+                *(
+                    f"{key}={value}"
+                    for key, value in sorted((continue_params or {}).items())
+                ),
+            ]
+        )
+        result = self.response_cache.get(cache_key)
+        if result is None:
+            async with self.session.get(
+                WIKIPEDIA_API_URL, params=self.generate_payload(query, continue_params)
+            ) as res:
+                result = await res.json()
+            if "error" not in result:
+                self.response_cache.set(cache_key, result)
+
+        pages = []
         if "query" in result and "pages" in result["query"]:
-            result["query"]["pages"].sort(
-                key=lambda unsorted_page: unsorted_page["index"]
-            )
-            for page in result["query"]["pages"]:
-                with suppress(KeyError):
-                    if (
-                        "categories" in page
-                        and page["categories"]
-                        and "title" in page["categories"][0]
-                        and page["categories"][0]["title"] == self.DISAMBIGUATION_CAT
-                    ):
-                        continue  # Skip disambiguation pages
-                    embeds.append(self.generate_embed(page))
-                    if only_first_result:
-                        return embeds, page["fullurl"]
-        return embeds, None
+            for page in sorted(
+                result["query"]["pages"],
+                key=lambda unsorted_page: unsorted_page["index"],
+            ):
+                if (
+                    page.get("categories")
+                    and page["categories"][0].get("title") == self.DISAMBIGUATION_CAT
+                ):
+                    continue  # Skip disambiguation pages
+                if not all(key in page for key in ("title", "extract", "fullurl")):
+                    continue
+                # Only keep what is needed to generate the embed later
+                pages.append(
+                    {key: page[key] for key in PAGE_RECORD_KEYS if key in page}
+                )
+        return pages, result.get("continue")
 
     def generate_embed(self, page_json: dict[str, Any]) -> discord.Embed:
         """Generate the embed for the json page."""